@@ -20,3 +20,42 @@ def build_model_v2(num_classes: int, frames_per_sequence: int = 30, feature_dim:
         tf.keras.layers.Dropout(0.4),
         tf.keras.layers.Dense(num_classes, activation='softmax'),
     ])
+
+
+def build_streaming_model_v2(num_classes: int, feature_dim: int = 452, units=(128, 64), dense_units: int = 128):
+    """Variante forward-only (stateful en inferencia) para streaming de bajo costo.
+
+    Misma pila que `build_model_v2` pero con GRU unidireccionales y salida por
+    paso de tiempo: (B, T, feature_dim) → (B, T, num_classes). Se entrena con la
+    etiqueta de la seña en cada paso (o destilando las probabilidades del BiGRU
+    sobre la ventana) y en inferencia corre frame a frame llevando el estado
+    oculto de cada sesión (ver `v2_stateful_gru.py`).
+    """
+    l2 = tf.keras.regularizers.l2(1e-4)
+    layers = [
+        tf.keras.layers.Input(shape=(None, feature_dim)),
+        tf.keras.layers.GaussianNoise(0.015),
+    ]
+    for n_units in units:
+        layers += [
+            tf.keras.layers.GRU(n_units, return_sequences=True, dropout=0.3, kernel_regularizer=l2),
+            tf.keras.layers.Dropout(0.4),
+        ]
+    layers += [
+        tf.keras.layers.Dense(dense_units, activation='relu', kernel_regularizer=l2),
+        tf.keras.layers.Dropout(0.4),
+        tf.keras.layers.Dense(num_classes, activation='softmax'),
+    ]
+    return tf.keras.Sequential(layers)
+
+
+def export_streaming_weights(model, path: str):
+    """Guarda los pesos de `build_streaming_model_v2` como `streaming_weights.npz`
+    (arr_0, arr_1, … en el orden de `model.get_weights()`), sin depender de TF al cargar.
+
+    Entrenar con las mismas ventanas de `frames_per_sequence` frames que el
+    BiGRU, cada una desde estado cero y supervisando el último paso:
+    `StatefulV2StreamingPredictor` reinicia el estado dentro de ese
+    horizonte, así que en inferencia la GRU nunca ve más contexto que ese."""
+    import numpy as np
+    np.savez(path, *model.get_weights())
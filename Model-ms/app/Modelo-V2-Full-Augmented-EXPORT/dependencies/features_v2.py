@@ -103,26 +103,100 @@ def normalize_frame(coords: np.ndarray) -> np.ndarray:
     return combine_coords(pose, right_hand, left_hand)
 
 
-def mirror_frame(coords: np.ndarray) -> np.ndarray:
-    """Aplica mirror real: niega x, intercambia pares izq↔der de pose, intercambia manos."""
-    pose, right_hand, left_hand = split_coords(coords)
-    pose = pose.copy()
-    right_hand = right_hand.copy()
-    left_hand = left_hand.copy()
+def _normalize_hands_(hands: np.ndarray):
+    """Versión in-place de `_normalize_hand` para un view (..., 21, 3)."""
+    present = np.any(hands != 0, axis=(-2, -1))
+    wrist = hands[..., HAND_WRIST, :].copy()
+    scale = np.linalg.norm(hands[..., HAND_MIDDLE_MCP, :] - wrist, axis=-1)
+    scale = np.where(scale > 1e-6, scale, 1.0).astype(hands.dtype)
+    normalized = (hands - wrist[..., np.newaxis, :]) / scale[..., np.newaxis, np.newaxis]
+    np.copyto(hands, normalized, where=present[..., np.newaxis, np.newaxis])
+
+
+def normalize_sequence(coords: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Versión vectorizada de `normalize_frame` para (226,), (T, 226) o (B, T, 226).
+
+    Mismos valores que aplicar `normalize_frame` frame a frame (bit a bit en
+    float32, el dtype del pipeline; en float64 puede diferir en 1 ulp), pero
+    con unas pocas operaciones broadcast sobre toda la secuencia. `out` puede
+    ser el mismo `coords` (in-place).
+    """
+    coords = np.asarray(coords)
+    if coords.shape[-1] != TOTAL_SIZE:
+        raise ValueError(f"Se esperaba dim {TOTAL_SIZE}, se recibió {coords.shape[-1]}")
+    if out is None:
+        out = coords.copy()
+    elif out is not coords:
+        out[...] = coords
+
+    lead = out.shape[:-1]
+    pose = out[..., :POSE_SIZE].reshape(*lead, POSE_COUNT, POSE_DIMS)
+    right_hand = out[..., POSE_SIZE:POSE_SIZE + HAND_SIZE].reshape(*lead, HAND_COUNT, HAND_DIMS)
+    left_hand = out[..., POSE_SIZE + HAND_SIZE:].reshape(*lead, HAND_COUNT, HAND_DIMS)
+
+    # Pose (solo x,y,z; visibility intacto): mid-shoulders + ancho de hombros
+    present = np.any(out[..., :POSE_SIZE] != 0, axis=-1)
+    left_sh = pose[..., LEFT_SHOULDER, :3]
+    right_sh = pose[..., RIGHT_SHOULDER, :3]
+    center = (left_sh + right_sh) / 2.0
+    scale = np.linalg.norm(left_sh - right_sh, axis=-1)
+    scale = np.where(scale > 1e-6, scale, 1.0).astype(out.dtype)
+    xyz = (pose[..., :3] - center[..., np.newaxis, :]) / scale[..., np.newaxis, np.newaxis]
+    np.copyto(pose[..., :3], xyz, where=present[..., np.newaxis, np.newaxis])
+
+    _normalize_hands_(right_hand)
+    _normalize_hands_(left_hand)
+    return out
+
+
+class MirrorKernel:
+    """Mirror precomputado como un único gather: out = coords[..., index] * sign + offset.
+
+    El índice (226,) ya incluye el intercambio de pares izq↔der de pose y el
+    intercambio de manos; `sign`/`offset` reflejan el eje x. Con `x_offset=0`
+    el x se niega (coords normalizadas, V2); con `x_offset=1` se refleja como
+    `1 - x` (coords de imagen en [0, 1], V1).
+
+    Acepta un frame (226,) o un batch (..., 226) y, si se pasa `out`, no asigna memoria.
+    """
 
-    # Negar x
-    pose[:, 0] *= -1
-    right_hand[:, 0] *= -1
-    left_hand[:, 0] *= -1
+    def __init__(self, x_offset: float = 0.0):
+        index = np.arange(TOTAL_SIZE)
+        for left_idx, right_idx in POSE_MIRROR_PAIRS:
+            left = slice(left_idx * POSE_DIMS, (left_idx + 1) * POSE_DIMS)
+            right = slice(right_idx * POSE_DIMS, (right_idx + 1) * POSE_DIMS)
+            index[left], index[right] = index[right].copy(), index[left].copy()
+        right_hand = slice(POSE_SIZE, POSE_SIZE + HAND_SIZE)
+        left_hand = slice(POSE_SIZE + HAND_SIZE, TOTAL_SIZE)
+        index[right_hand], index[left_hand] = index[left_hand].copy(), index[right_hand].copy()
 
-    # Intercambiar pares de pose izq↔der
-    for left_idx, right_idx in POSE_MIRROR_PAIRS:
-        pose[[left_idx, right_idx]] = pose[[right_idx, left_idx]]
+        x_mask = np.zeros(TOTAL_SIZE, dtype=bool)
+        x_mask[0:POSE_SIZE:POSE_DIMS] = True
+        x_mask[POSE_SIZE::HAND_DIMS] = True
 
-    # Intercambiar manos completas (la que era derecha ahora es izquierda y viceversa)
-    right_hand, left_hand = left_hand, right_hand
+        self.index = index
+        self.sign = np.where(x_mask, -1.0, 1.0).astype(np.float32)
+        self.offset = np.where(x_mask, x_offset, 0.0).astype(np.float32)
+
+    def __call__(self, coords: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        if coords.shape[-1] != TOTAL_SIZE:
+            raise ValueError(f"Se esperaba dim {TOTAL_SIZE}, se recibió {coords.shape[-1]}")
+        # mode="clip" evita el buffer intermedio de np.take (el índice siempre es válido)
+        out = np.take(coords, self.index, axis=-1, out=out, mode="clip")
+        out *= self.sign
+        out += self.offset
+        return out
 
-    return combine_coords(pose, right_hand, left_hand)
+
+_MIRROR = MirrorKernel(x_offset=0.0)
+
+
+def mirror_frame(coords: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Aplica mirror real: niega x, intercambia pares izq↔der de pose, intercambia manos.
+
+    Acepta (226,), una secuencia (T, 226) o un batch de secuencias (B, T, 226).
+    """
+    return _MIRROR(coords, out=out)
 
 
 def has_hand(coords: np.ndarray, threshold: float = 1e-3) -> bool:
@@ -135,6 +209,13 @@ def has_hand(coords: np.ndarray, threshold: float = 1e-3) -> bool:
     )
 
 
+def hand_presence_mask(coords: np.ndarray, threshold: float = 1e-3) -> np.ndarray:
+    """Versión vectorizada de `has_hand`: (..., 226) → máscara booleana (...)."""
+    right_hand = np.abs(coords[..., POSE_SIZE:POSE_SIZE + HAND_SIZE]).sum(axis=-1)
+    left_hand = np.abs(coords[..., POSE_SIZE + HAND_SIZE:]).sum(axis=-1)
+    return (right_hand > threshold) | (left_hand > threshold)
+
+
 def add_velocity_features(sequence: np.ndarray) -> np.ndarray:
     """Dada una secuencia (T, 226), retorna (T, 452) agregando velocidades.
 
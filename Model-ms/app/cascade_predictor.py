@@ -0,0 +1,149 @@
+"""
+Modo cascada para streaming: V1 (denso, por frame) decide cuándo correr V2.
+
+V1 (`LSCStreamingPredictor`) es barato y corre en cada frame. V2 (BiGRU
+sobre la ventana de 30 frames) es mucho más caro pero más preciso en señas
+dinámicas. Aquí V2 solo acumula frames (normalización incremental, sin
+inferencia) y se "escala" a V2 únicamente cuando:
+
+- V1 está inseguro (confianza < `uncertainty_threshold`),
+- hay movimiento (velocidad de muñeca de V1 > `motion_threshold`), o
+- cambia la presencia de manos respecto al frame anterior.
+
+Ambos modelos son los singletons compartidos por el proceso; cada sesión
+solo tiene sus buffers. `get_stats()` reporta la fracción de frames escalados.
+"""
+import os
+import sys
+from collections import Counter
+from typing import Dict, Optional
+
+import numpy as np
+
+_MODEL_V2_DEPS = os.path.join(os.path.dirname(__file__), "Modelo-V2-Full-Augmented-EXPORT", "dependencies")
+if _MODEL_V2_DEPS not in sys.path:
+    sys.path.insert(0, _MODEL_V2_DEPS)
+
+from features_v2 import hand_presence_mask
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+# Umbrales de escalado V1 → V2
+CASCADE_UNCERTAINTY = float(os.getenv("CASCADE_UNCERTAINTY", "0.6"))
+CASCADE_MOTION = float(os.getenv("CASCADE_MOTION", "0.02"))
+# Confianza mínima de V2 para reemplazar la respuesta de V1
+CASCADE_V2_MIN_CONFIDENCE = float(os.getenv("CASCADE_V2_MIN_CONFIDENCE", "0.5"))
+
+# `distance_alert` de V1 con el que nunca se escala a V2
+_NO_USER_ALERTS = ("NO_USER", "TOO_FAR")
+
+
+class CascadeStreamingPredictor:
+    """
+    Predictor de sesión con la misma API que `LSCStreamingPredictor` (V1).
+
+    - `v1`: `LSCStreamingPredictor` de la sesión (modelo V1 compartido).
+    - `v2`: `V2StreamingPredictor` de la sesión (modelo V2 compartido).
+    """
+
+    def __init__(self, v1, v2, uncertainty_threshold: float = CASCADE_UNCERTAINTY,
+                 motion_threshold: float = CASCADE_MOTION,
+                 v2_min_confidence: float = CASCADE_V2_MIN_CONFIDENCE):
+        self.v1 = v1
+        self.v2 = v2
+        self.uncertainty_threshold = uncertainty_threshold
+        self.motion_threshold = motion_threshold
+        self.v2_min_confidence = v2_min_confidence
+
+        self._prev_hand = None
+        self.frames = 0
+        self.escalations = 0
+        self.escalation_reasons = Counter()
+
+    @property
+    def context_aware_enabled(self) -> bool:
+        return self.v1.context_aware_enabled
+
+    @property
+    def frames_per_sequence(self) -> int:
+        return self.v2.frames_per_sequence
+
+    def orientation_batch(self, landmarks: np.ndarray) -> np.ndarray:
+        """Delegado a V1 (micro-batching de V1 entre sesiones)."""
+        return self.v1.orientation_batch(landmarks)
+
+    def _escalation_reason(self, v1_result: Dict, hand: bool) -> Optional[str]:
+        # Sin usuario / demasiado lejos V1 responde 'waiting' con confianza 0 tras
+        # limpiar su buffer: no es incertidumbre, y V2 no debe emitir palabras ahí
+        if v1_result.get("status") == "waiting" or v1_result.get("distance_alert") in _NO_USER_ALERTS:
+            return None
+        if self._prev_hand is not None and hand != self._prev_hand:
+            return "hands_changed"
+        if v1_result.get("status") == "error" or float(v1_result.get("confidence", 0.0)) < self.uncertainty_threshold:
+            return "uncertain"
+        if self.v1.motion_velocity > self.motion_threshold:
+            return "motion"
+        return None
+
+    def add_landmarks(self, landmarks: np.ndarray, probabilities: Optional[np.ndarray] = None) -> Optional[Dict]:
+        """
+        V1 sobre el frame (con `probabilities` (2, clases) si vienen del
+        scheduler) y, si corresponde, V2 sobre la ventana acumulada.
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        result = self.v1.add_landmarks(landmarks, probabilities=probabilities)
+        if result is None:
+            return None
+
+        self.frames += 1
+        self.v2.add_frame(landmarks)
+        hand = bool(hand_presence_mask(landmarks))
+        reason = self._escalation_reason(result, hand)
+        self._prev_hand = hand
+
+        result = dict(result, source="v1", escalated=False)
+        if reason is None or not self.v2.is_buffer_ready():
+            return result
+
+        self.escalations += 1
+        self.escalation_reasons[reason] += 1
+        v2_result = self.v2.predict_window()
+        result["escalated"] = True
+        if v2_result["confidence"] >= self.v2_min_confidence:
+            result.update(word=v2_result["word"], confidence=v2_result["confidence"],
+                          status="predicting", source="v2")
+        return result
+
+    def add_landmarks_batch(self, frames: np.ndarray, probabilities: Optional[np.ndarray] = None) -> list:
+        """K frames consecutivos; `probabilities` (2K, clases) como en V1."""
+        frames = np.asarray(frames, dtype=np.float32)
+        k = frames.shape[0]
+        return [
+            self.add_landmarks(frame, probabilities[[i, k + i]] if probabilities is not None else None)
+            for i, frame in enumerate(frames)
+        ]
+
+    def reset_buffer(self):
+        self.v1.reset_buffer()
+        self.v2.clear_buffer()
+        self._prev_hand = None
+
+    def set_accepted_word(self, word: str):
+        self.v1.set_accepted_word(word)
+
+    def set_context(self, context, manual: bool = True):
+        self.v1.set_context(context, manual)
+
+    def get_stats(self) -> Dict:
+        return {
+            "frames": self.frames,
+            "escalations": self.escalations,
+            "escalation_fraction": (self.escalations / self.frames) if self.frames else 0.0,
+            "reasons": dict(self.escalation_reasons),
+        }
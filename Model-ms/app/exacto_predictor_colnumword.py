@@ -10,6 +10,9 @@ import sys
 import numpy as np
 import tensorflow as tf
 
+from minmax_normalizer import normalize_landmarks_batch
+from video_landmarks import extract_coords, extract_video_landmarks, video_debug_info
+
 # Logging configuration
 LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
 
@@ -68,45 +71,8 @@ class ExactoPredictorCOLNUMWORD:
         Coincide con la lógica de LandmarkInfo.get_fixed_landmark del export.
         """
         try:
-            # 1. Descomponer (Pose=100, RH=63, LH=63)
-            pose = coords[:100].reshape(25, 4).copy()
-            rh = coords[100:163].reshape(21, 3).copy()
-            lh = coords[163:226].reshape(21, 3).copy()
-            
-            def min_max_norm(parts_coords):
-                # Extraer solo x, y, z
-                pts = parts_coords[:, :3]
-                
-                # Si todo el componente es cero, no hacer nada
-                if np.all(pts == 0):
-                    return parts_coords
-                
-                # IMPORTANTE: Para coincidir 100% con LandmarkInfo.get_fixed_landmark:
-                # El min-max se calcula sobre TODOS los puntos del componente,
-                # incluyendo los ceros (siempre que el componente no sea todo ceros).
-                # Esto es clave para que la escala sea idéntica a la del entrenamiento.
-                xmin, xmax = pts[:, 0].min(), pts[:, 0].max()
-                ymin, ymax = pts[:, 1].min(), pts[:, 1].max()
-                zmin, zmax = pts[:, 2].min(), pts[:, 2].max()
-                
-                # Evitar división por cero
-                rx = (xmax - xmin) if (xmax - xmin) > 1e-6 else 1.0
-                ry = (ymax - ymin) if (ymax - ymin) > 1e-6 else 1.0
-                rz = (zmax - zmin) if (zmax - zmin) > 1e-6 else 1.0
-                
-                # Aplicar normalización a todos los puntos (X, Y, Z)
-                parts_coords[:, 0] = (parts_coords[:, 0] - xmin) / rx
-                parts_coords[:, 1] = (parts_coords[:, 1] - ymin) / ry
-                parts_coords[:, 2] = (parts_coords[:, 2] - zmin) / rz
-                
-                return parts_coords
-
-            # Normalizar cada componente por separado
-            pose = min_max_norm(pose)
-            rh = min_max_norm(rh)
-            lh = min_max_norm(lh)
-            
-            return np.concatenate([pose.flatten(), rh.flatten(), lh.flatten()])
+            # Mismo kernel vectorizado que los batches (N, 226); aquí N = 1
+            return normalize_landmarks_batch(coords)
             
         except Exception as e:
             log(f"[ERROR] Normalización Min-Max falló: {e}")
@@ -124,7 +90,8 @@ class ExactoPredictorCOLNUMWORD:
                     "status": "error_shape"
                 }
             
-            coords = np.array(coords_list, dtype=np.float32)
+            # Acepta lista o np.ndarray (sin copiar si ya es float32)
+            coords = np.asarray(coords_list, dtype=np.float32)
             
             # Usar la normalización exacta
             norm_coords = self.normalize_landmarks_exacto(coords)
@@ -132,27 +99,7 @@ class ExactoPredictorCOLNUMWORD:
             # Predecir con el modelo
             coords_reshaped = np.expand_dims(norm_coords, axis=0)
             predictions = self.model.predict(coords_reshaped, verbose=0)
-            predicted_idx = np.argmax(predictions[0])
-            confidence = predictions[0][predicted_idx]
-            
-            # Obtener etiqueta
-            class_idx = str(predicted_idx)
-            if class_idx in self.config["classes"]:
-                label = self.config["classes"][class_idx]
-            else:
-                label = f"Clase_{predicted_idx}"
-            
-            result = {
-                "word": label,
-                "confidence": float(confidence),
-                "class_idx": int(predicted_idx),
-                "status": "ok"
-            }
-
-            if include_probabilities:
-                result["probabilities"] = predictions[0].tolist()
-            
-            return result
+            return self.result_from_probabilities(predictions[0], include_probabilities)
             
         except Exception as e:
             log(f"[ERROR] Predicción desde coords falló: {e}")
@@ -162,74 +109,143 @@ class ExactoPredictorCOLNUMWORD:
                 "status": "error"
             }
     
-    def predict_landmarks(self, coords_list: list) -> dict:
+    def result_from_probabilities(self, probabilities: np.ndarray, include_probabilities: bool = False) -> dict:
         """
-        Alias de predict_from_coords para compatibilidad con código antiguo
+        Arma el dict de resultado (word, confidence, class_idx) a partir de un
+        vector de probabilidades ya calculado por el modelo.
         """
-        return self.predict_from_coords(coords_list)
+        predicted_idx = np.argmax(probabilities)
+        confidence = probabilities[predicted_idx]
+        
+        # Obtener etiqueta
+        class_idx = str(predicted_idx)
+        if class_idx in self.config["classes"]:
+            label = self.config["classes"][class_idx]
+        else:
+            label = f"Clase_{predicted_idx}"
+        
+        result = {
+            "word": label,
+            "confidence": float(confidence),
+            "class_idx": int(predicted_idx),
+            "status": "ok"
+        }
+
+        if include_probabilities:
+            result["probabilities"] = probabilities.tolist()
+        
+        return result
     
-    def predict_video(self, video_path: str) -> str:
+    def predict_proba_batch(self, coords_batch: np.ndarray) -> np.ndarray:
         """
-        Predice desde video usando normalización exacta
+        Predice un batch (N, 226) de coords crudas en UNA sola llamada al modelo.
+        Normaliza cada fila igual que predict_from_coords y devuelve (N, clases).
+        """
+        coords_batch = np.asarray(coords_batch, dtype=np.float32)
+        if coords_batch.ndim != 2 or coords_batch.shape[1] != 226:
+            raise ValueError(f"Se esperaba (N, 226), se recibió {coords_batch.shape}")
+        # Todas las filas se normalizan juntas en un solo paso vectorizado
+        norm_batch = normalize_landmarks_batch(coords_batch)
+        return self.model.predict(norm_batch, verbose=0)
+    
+    def predict_batch(self, coords_batch: np.ndarray, top_k: int = 3, min_confidence: float = 0.3) -> dict:
+        """
+        Clasifica un clip ya extraído (N, 226) con una sola normalización
+        vectorizada y un solo forward pass.
+
+        Retorna el top-k por frame y un voto agregado (misma regla que
+        predict_video: mayoría entre los frames con confianza > min_confidence).
         """
-        import cv2
-        import mediapipe as mp
         from collections import Counter
         
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            log(f"[ERROR] No se pudo abrir el video: {video_path}")
-            return None
-
-        predictions = []
+        probabilities = self.predict_proba_batch(coords_batch)
+        top_k = max(1, min(int(top_k), probabilities.shape[1]))
+        top_idx = np.argsort(-probabilities, axis=1)[:, :top_k]
+        classes = self.config["classes"]
+        
+        frames = []
+        votes = Counter()
+        for probs, indices in zip(probabilities, top_idx):
+            candidates = [
+                {
+                    "word": classes.get(str(int(i)), f"Clase_{int(i)}"),
+                    "confidence": float(probs[i]),
+                    "class_idx": int(i),
+                }
+                for i in indices
+            ]
+            frames.append({"top_k": candidates})
+            if candidates[0]["confidence"] > min_confidence:
+                votes[candidates[0]["word"]] += 1
         
-        # Inicializar MediaPipe
-        mp_holistic = mp.solutions.holistic
-        holistic = mp_holistic.Holistic(
-            static_image_mode=False,
-            model_complexity=1,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        vote = None
+        if votes:
+            word, count = votes.most_common(1)[0]
+            vote = {"word": word, "votes": count, "frames_voted": sum(votes.values())}
         
+        return {
+            "status": "ok" if vote else "no_confident_frames",
+            "frames_total": len(frames),
+            "vote": vote,
+            "frames": frames,
+        }
+    
+    def predict_dual_from_coords(self, coords: np.ndarray, coords_mirror: np.ndarray, include_probabilities: bool = False) -> tuple:
+        """
+        Predice la orientación original y la espejada en UNA sola llamada al
+        modelo: apila ambas en (2, 226), las normaliza juntas y hace un único
+        forward pass. Retorna (resultado_original, resultado_espejado).
+        """
         try:
-            frames_processed = 0
-            frames_with_hands = 0
-            mirror_triggers = 0
-            
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                    
-                frames_processed += 1
-                
-                # Procesar frame
-                image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = holistic.process(image_rgb)
-                
-                # Lógica de Espejo: Si detecta mano derecha pero no izquierda, invertir frame
-                if results.right_hand_landmarks and not results.left_hand_landmarks:
-                    frame = cv2.flip(frame, 1)
-                    image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    results = holistic.process(image_rgb)
-                    mirror_triggers += 1
-                
-                if results.pose_landmarks or results.right_hand_landmarks or results.left_hand_landmarks:
-                    frames_with_hands += 1
-                    # Extraer coordenadas
-                    coords = self._extract_coords(results)
-                    
-                    # Predecir directamente (predict_from_coords ya normaliza)
-                    result = self.predict_from_coords(coords.tolist())
-                    
-                    if result['status'] == 'ok' and result['confidence'] > 0.3:
-                        predictions.append(result['word'])
+            predictions = self.predict_proba_batch(np.stack([coords, coords_mirror]))
+            return (
+                self.result_from_probabilities(predictions[0], include_probabilities),
+                self.result_from_probabilities(predictions[1], include_probabilities),
+            )
+        except Exception as e:
+            log(f"[ERROR] Predicción dual falló: {e}")
+            error = {"word": None, "confidence": 0.0, "status": "error"}
+            return error, dict(error)
+    
+    def predict_landmarks(self, coords_list: list) -> dict:
+        """
+        Alias de predict_from_coords para compatibilidad con código antiguo
+        """
+        return self.predict_from_coords(coords_list)
+    
+    def predict_video(self, video_path: str, on_progress=None, debug: dict = None,
+                      content_hash: str = None) -> str:
+        """
+        Predice desde video usando normalización exacta.
+        `on_progress(frames_decoded, frames_total)` reporta el avance de MediaPipe;
+        si se pasa `debug`, se completa con las estadísticas de extracción.
+        `content_hash` (SHA-256 del video) habilita el store de landmarks.
+        """
+        from collections import Counter
+
+        # MediaPipe con una instancia Holistic del pool compartido (sin armar el grafo por request)
+        extracted = extract_video_landmarks(video_path, on_progress=on_progress,
+                                            content_hash=content_hash)
+        if extracted is None:
+            return None
+        if debug is not None:
+            debug.update(video_debug_info(extracted))
+        frame_coords = extracted["frames"]
+        frames_processed = extracted["frames_processed"]
+        frames_with_hands = extracted["frames_with_hands"]
+        mirror_triggers = extracted["mirror_triggers"]
         
-        finally:
-            cap.release()
+        # Normalización + forward pass de toda la secuencia en un solo batch
+        predictions = []
+        if len(frame_coords):
+            probabilities = self.predict_proba_batch(frame_coords)
+            for probs in probabilities:
+                result = self.result_from_probabilities(probs)
+                if result['confidence'] > 0.3:
+                    predictions.append(result['word'])
             
-        log(f"[DEBUG_PREDICTOR] Video processed: {frames_processed} frames")
+        log(f"[DEBUG_PREDICTOR] Video processed: {frames_processed} frames "
+            f"(decimation {extracted['decimation_ratio']:.2f}, ~{extracted['estimated_speedup']:.1f}x)")
         log(f"[DEBUG_PREDICTOR] Hands detected in: {frames_with_hands} frames")
         log(f"[DEBUG_PREDICTOR] Mirror Logic triggered: {mirror_triggers} times")
         
@@ -244,25 +260,7 @@ class ExactoPredictorCOLNUMWORD:
     
     def _extract_coords(self, results) -> np.ndarray:
         """Extrae coordenadas en el formato exacto del modelo (226 valores)"""
-        # 1. Pose (25 landmarks * 4: x, y, z, vis) -> 100 valores
-        if results.pose_landmarks:
-            pose = np.array([[lm.x, lm.y, lm.z, lm.visibility] for lm in results.pose_landmarks.landmark[:25]]).flatten()
-        else:
-            pose = np.zeros(100)
-            
-        # 2. Mano Derecha (21 * 3: x, y, z) -> 63 valores
-        if results.right_hand_landmarks:
-            rh = np.array([[lm.x, lm.y, lm.z] for lm in results.right_hand_landmarks.landmark]).flatten()
-        else:
-            rh = np.zeros(63)
-            
-        # 3. Mano Izquierda (21 * 3: x, y, z) -> 63 valores
-        if results.left_hand_landmarks:
-            lh = np.array([[lm.x, lm.y, lm.z] for lm in results.left_hand_landmarks.landmark]).flatten()
-        else:
-            lh = np.zeros(63)
-            
-        return np.concatenate([pose, rh, lh])
+        return extract_coords(results)
 
 # Para compatibilidad con el backend actual
 def create_exact_predictor():
@@ -0,0 +1,202 @@
+"""
+Pool de instancias MediaPipe Holistic de larga vida para predicción de video.
+
+Cada `predict_video` construía su propio `mp.solutions.holistic.Holistic`:
+armar el grafo y cargar los modelos cuesta cientos de ms antes del primer
+frame, que en clips cortos es la mayor parte del tiempo. Aquí se mantienen
+`HOLISTIC_POOL_SIZE` instancias precalentadas al inicio; cada video toma
+una en exclusiva (`checkout`) y al devolverla se resetea su estado de
+tracking para que el siguiente video empiece limpio.
+
+Uso:
+    with get_holistic_pool().checkout() as holistic:
+        results = holistic.process(image_rgb)
+"""
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+HOLISTIC_POOL_SIZE = int(os.getenv("HOLISTIC_POOL_SIZE", "2"))
+HOLISTIC_MODEL_COMPLEXITY = int(os.getenv("HOLISTIC_MODEL_COMPLEXITY", "1"))
+# Espera máxima por una instancia libre (un video la retiene de principio a fin)
+HOLISTIC_CHECKOUT_TIMEOUT_S = float(os.getenv("HOLISTIC_CHECKOUT_TIMEOUT_S", "120"))
+
+# Cada cuánto un checkout en espera revisa si puede crear una instancia
+# (un lugar se libera sin pasar por la cola cuando falla una creación)
+_WAIT_POLL_S = 0.5
+
+
+def _default_factory():
+    import mediapipe as mp
+    return mp.solutions.holistic.Holistic(
+        static_image_mode=False,
+        model_complexity=HOLISTIC_MODEL_COMPLEXITY,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+    )
+
+
+class HolisticPoolTimeout(RuntimeError):
+    """No se liberó ninguna instancia Holistic dentro del timeout de `checkout`."""
+
+
+class HolisticPool:
+    """
+    Pool acotado de instancias Holistic, una por video en curso.
+
+    - Las instancias se crean bajo demanda hasta `size`; `warm_up()` las crea
+      todas de antemano y corre un frame vacío para cargar los modelos.
+    - `checkout()` bloquea si todas están ocupadas, hasta `timeout` segundos
+      (luego `HolisticPoolTimeout`).
+    - Al devolverla se llama a `reset()` (nuevo stream de timestamps y sin
+      tracking previo); si falla, la instancia se descarta y se recrea.
+    - `_created` cuenta solo instancias que existen: si crear una falla, su
+      lugar vuelve a quedar libre y el error se propaga.
+    """
+
+    def __init__(self, size: int = HOLISTIC_POOL_SIZE, factory=None):
+        self.size = max(1, size)
+        self._factory = factory or _default_factory
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+        self.checkouts = 0
+        self.recreated = 0
+        self.total_wait_s = 0.0
+
+    def _create(self):
+        started = time.perf_counter()
+        holistic = self._factory()
+        log(f"[HolisticPool] Instancia creada en {(time.perf_counter() - started) * 1000:.0f} ms")
+        return holistic
+
+    def _reserve(self) -> bool:
+        """Reserva el lugar de una instancia nueva si todavía no hay `size`."""
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _release_slot(self):
+        with self._lock:
+            self._created -= 1
+
+    def warm_up(self, frame_size=(64, 64)):
+        """Crea todas las instancias y procesa un frame negro en cada una."""
+        dummy = np.zeros((*frame_size, 3), dtype=np.uint8)
+        while self._reserve():
+            holistic = None
+            try:
+                holistic = self._create()
+                holistic.process(dummy)
+                holistic.reset()
+            except Exception:
+                self._release_slot()
+                if holistic is not None:
+                    _close_quietly(holistic)
+                raise
+            self._idle.put(holistic)
+        log(f"✅ [HolisticPool] {self.size} instancias listas")
+
+    @contextmanager
+    def checkout(self, timeout: float = HOLISTIC_CHECKOUT_TIMEOUT_S):
+        """Presta una instancia en exclusiva durante el bloque `with`."""
+        started = time.perf_counter()
+        holistic = self._acquire(started, timeout)
+        self.checkouts += 1
+        self.total_wait_s += time.perf_counter() - started
+
+        try:
+            yield holistic
+        finally:
+            holistic = self._reset(holistic)
+            if holistic is not None:
+                self._idle.put(holistic)
+
+    def _acquire(self, started: float, timeout: float):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._reserve():
+                try:
+                    return self._create()
+                except Exception:
+                    self._release_slot()
+                    raise
+            remaining = None if timeout is None else timeout - (time.perf_counter() - started)
+            if remaining is not None and remaining <= 0:
+                raise HolisticPoolTimeout(f"Sin instancias Holistic libres tras {timeout:.0f} s")
+            try:
+                return self._idle.get(timeout=_WAIT_POLL_S if remaining is None else min(remaining, _WAIT_POLL_S))
+            except queue.Empty:
+                continue
+
+    def _reset(self, holistic):
+        """Instancia lista para el próximo video, o None si no se pudo recrear."""
+        try:
+            holistic.reset()
+            return holistic
+        except Exception as e:
+            log(f"⚠️ [HolisticPool] reset() falló ({e}); recreando instancia")
+            _close_quietly(holistic)
+            self.recreated += 1
+            try:
+                return self._create()
+            except Exception as e:
+                log(f"⚠️ [HolisticPool] No se pudo recrear la instancia: {e}")
+                self._release_slot()
+                return None
+
+    def get_stats(self) -> dict:
+        return {
+            "size": self.size,
+            "created": self._created,
+            "idle": self._idle.qsize(),
+            "checkouts": self.checkouts,
+            "recreated": self.recreated,
+            "avg_wait_ms": (self.total_wait_s / self.checkouts * 1000.0) if self.checkouts else 0.0,
+        }
+
+
+def _close_quietly(holistic):
+    try:
+        holistic.close()
+    except Exception:
+        pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_holistic_pool(size: int) -> HolisticPool:
+    """Reemplaza el pool compartido (p. ej. 1 instancia por proceso worker de video)."""
+    global _pool
+    with _pool_lock:
+        _pool = HolisticPool(size)
+        return _pool
+
+
+def get_holistic_pool() -> HolisticPool:
+    """Pool compartido por el proceso (se crea la primera vez que se pide)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HolisticPool(HOLISTIC_POOL_SIZE)
+        return _pool
@@ -0,0 +1,119 @@
+"""
+Executor de inferencia fuera del event loop de asyncio.
+
+`predictor.add_landmarks` corre Keras y, cada tanto, un forward pass de
+GPT-2. Ejecutado dentro de la corrutina del handler de Socket.IO, un frame
+lento congelaba a todas las sesiones y a los endpoints HTTP del mismo loop.
+
+Aquí el trabajo pesado se despacha a un pool acotado de hilos
+(`INFERENCE_WORKERS`, por defecto 1 = un único hilo de inferencia con cola)
+y el handler solo hace `await`.
+
+- Orden por sesión: `run(session_id, fn)` toma un `asyncio.Lock` por sesión
+  (FIFO), así los frames de un mismo sid se procesan en orden de llegada
+  aunque el pool tenga varios hilos.
+- Métricas: espera en cola y tiempo de ejecución (promedio y percentiles
+  sobre una ventana reciente).
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+import numpy as np
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+class InferenceExecutor:
+    """Pool acotado de hilos para inferencia con orden garantizado por sesión."""
+
+    def __init__(self, max_workers: int = 1, name: str = "inference", metrics_window: int = 2048):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+
+        # Métricas (solo se tocan desde el event loop)
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.in_flight = 0
+        self._queue_wait_ms = deque(maxlen=metrics_window)
+        self._run_ms = deque(maxlen=metrics_window)
+
+    def session_lock(self, session_id: str) -> asyncio.Lock:
+        """Lock FIFO de la sesión; úsalo para encadenar varios pasos en orden."""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks[session_id] = asyncio.Lock()
+        return lock
+
+    def release_session(self, session_id: str):
+        """Olvida el lock de una sesión desconectada."""
+        self._session_locks.pop(session_id, None)
+
+    async def submit(self, fn: Callable, *args, **kwargs):
+        """Ejecuta `fn` en el pool (sin orden por sesión) y registra tiempos."""
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+
+        def timed_call():
+            started = time.perf_counter()
+            result = fn(*args, **kwargs)
+            return result, started, time.perf_counter()
+
+        self.in_flight += 1
+        try:
+            result, started, finished = await loop.run_in_executor(self.pool, timed_call)
+        except Exception:
+            self.jobs_failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        self.jobs_done += 1
+        self._queue_wait_ms.append((started - submitted) * 1000.0)
+        self._run_ms.append((finished - started) * 1000.0)
+        return result
+
+    async def run(self, session_id: str, fn: Callable, *args, **kwargs):
+        """Ejecuta `fn` en el pool respetando el orden de llegada de la sesión."""
+        async with self.session_lock(session_id):
+            return await self.submit(fn, *args, **kwargs)
+
+    @staticmethod
+    def _summary(samples) -> dict:
+        if not samples:
+            return {"avg": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        values = np.fromiter(samples, dtype=np.float64)
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            "avg": float(values.mean()),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(values.max()),
+        }
+
+    def get_stats(self) -> dict:
+        """Métricas de la ventana reciente (milisegundos)."""
+        return {
+            "name": self.name,
+            "workers": self.max_workers,
+            "sessions": len(self._session_locks),
+            "in_flight": self.in_flight,
+            "jobs_done": self.jobs_done,
+            "jobs_failed": self.jobs_failed,
+            "queue_wait_ms": self._summary(self._queue_wait_ms),
+            "run_ms": self._summary(self._run_ms),
+        }
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
@@ -0,0 +1,159 @@
+"""
+Scheduler de micro-batching entre sesiones para la inferencia en streaming.
+
+Cada evento `landmarks` de Socket.IO hacía su propio forward pass de batch 1.
+Con decenas de sesiones conectadas eso desperdicia CPU: el scheduler acumula
+las filas pendientes de TODAS las sesiones y las resuelve con una sola
+llamada al modelo.
+
+Uso (desde una corrutina):
+    scheduler = MicroBatchScheduler(predictor.predict_proba_batch, max_batch_size=32, max_wait_ms=4)
+    probs = await scheduler.submit(rows)   # rows: (k, ...) → probs: (k, clases)
+
+El lote se despacha cuando se alcanza `max_batch_size` filas o cuando vence
+`max_wait_ms` desde la primera fila pendiente, lo que ocurra primero. Si se
+pasa un `executor` (p. ej. el pool de `InferenceExecutor`), el forward pass
+corre allí y no bloquea el event loop.
+"""
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import Executor
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+class MicroBatchScheduler:
+    """
+    Agrupa peticiones `(k, ...)` de varias sesiones en un único batch.
+
+    - `predict_fn`: recibe un array (N, ...) y devuelve (N, ...) en el mismo orden.
+    - Cada `submit` recibe su propio slice del resultado (se respeta el orden
+      de llegada dentro del lote).
+    - Debe usarse desde un único event loop.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = 32, max_wait_ms: float = 4.0, name: str = "v1",
+                 executor: Optional[Executor] = None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size debe ser >= 1")
+        self.predict_fn = predict_fn
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._pending_rows = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # Métricas
+        self.batches_run = 0
+        self.rows_run = 0
+        self.requests_run = 0
+        self.total_inference_s = 0.0
+
+    async def submit(self, rows: np.ndarray) -> np.ndarray:
+        """Encola `rows` (k, ...) y espera su slice de resultados (k, ...)."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((rows, future))
+        self._pending_rows += rows.shape[0]
+
+        if self._pending_rows >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _take_pending(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending = self._pending
+        self._pending = []
+        self._pending_rows = 0
+        return pending
+
+    def _flush(self):
+        pending = self._take_pending()
+        if not pending:
+            return
+
+        if self.executor is None:
+            try:
+                outcome = self._run_batch(pending)
+            except Exception as e:
+                self._fail(pending, e)
+                return
+            self._complete(pending, outcome)
+            return
+
+        # Forward pass en el pool; los futures se resuelven de vuelta en el loop
+        task = asyncio.get_running_loop().run_in_executor(self.executor, self._run_batch, pending)
+        task.add_done_callback(functools.partial(self._on_batch_done, pending))
+
+    def _on_batch_done(self, pending, task: asyncio.Future):
+        if task.cancelled():
+            self._fail(pending, asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._fail(pending, task.exception())
+        else:
+            self._complete(pending, task.result())
+
+    def _run_batch(self, pending):
+        started = time.perf_counter()
+        batch = np.concatenate([rows for rows, _ in pending], axis=0)
+        outputs = self.predict_fn(batch)
+        return outputs, time.perf_counter() - started
+
+    def _fail(self, pending, error: Exception):
+        rows = sum(rows.shape[0] for rows, _ in pending)
+        log(f"❌ [Scheduler {self.name}] Falló el batch de {rows} filas: {error}")
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    def _complete(self, pending, outcome):
+        outputs, elapsed = outcome
+        sizes = [rows.shape[0] for rows, _ in pending]
+        self._record(len(pending), sum(sizes), elapsed)
+        self._resolve(pending, sizes, outputs)
+
+    def _record(self, requests: int, rows: int, elapsed: float):
+        self.batches_run += 1
+        self.requests_run += requests
+        self.rows_run += rows
+        self.total_inference_s += elapsed
+
+    @staticmethod
+    def _resolve(pending, sizes, outputs):
+        offset = 0
+        for (_, future), size in zip(pending, sizes):
+            if not future.done():
+                future.set_result(outputs[offset:offset + size])
+            offset += size
+
+    def get_stats(self) -> dict:
+        """Métricas acumuladas del scheduler."""
+        return {
+            "name": self.name,
+            "batches": self.batches_run,
+            "requests": self.requests_run,
+            "rows": self.rows_run,
+            "avg_rows_per_batch": (self.rows_run / self.batches_run) if self.batches_run else 0.0,
+            "avg_inference_ms": (self.total_inference_s / self.batches_run * 1000.0) if self.batches_run else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
@@ -0,0 +1,141 @@
+"""
+Estado de los jobs de video asíncronos (`POST /jobs/predict` → `GET /jobs/{id}`).
+
+El cliente sube el video, recibe un `job_id` al instante y consulta el
+estado/avance/resultado después, en vez de mantener abierta la conexión
+HTTP durante todo el decode + inferencia.
+
+- Estados: `queued` → `running` → `done` | `failed`.
+- Avance: frames procesados / frames totales del video.
+- Acotado: como máximo `JOB_STORE_MAX` jobs en memoria. Los terminados
+  expiran `JOB_TTL_S` segundos después de terminar; si el store se llena se
+  descarta el terminado más viejo, y si todos siguen en curso se rechaza
+  el job nuevo (`JobStoreFull`).
+"""
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+JOB_STORE_MAX = int(os.getenv("JOB_STORE_MAX", "256"))
+JOB_TTL_S = float(os.getenv("JOB_TTL_S", "600"))
+
+FINISHED_STATES = ("done", "failed")
+
+
+class JobStoreFull(Exception):
+    """El store está lleno de jobs en curso."""
+
+
+class JobStore:
+    def __init__(self, max_jobs: int = JOB_STORE_MAX, ttl_s: float = JOB_TTL_S, clock=time.time):
+        self.max_jobs = max(1, max_jobs)
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._jobs = OrderedDict()  # job_id -> job (orden de creación)
+
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _purge_expired(self):
+        now = self._clock()
+        stale = [job_id for job_id, job in self._jobs.items()
+                 if job["status"] in FINISHED_STATES and now - job["finished_at"] >= self.ttl_s]
+        for job_id in stale:
+            del self._jobs[job_id]
+        self.expired += len(stale)
+
+    def create(self, kind: str, owner: Optional[str] = None) -> dict:
+        """Registra un job `queued`. Lanza `JobStoreFull` si no hay lugar."""
+        self._purge_expired()
+        if len(self._jobs) >= self.max_jobs:
+            finished = next((job_id for job_id, job in self._jobs.items()
+                             if job["status"] in FINISHED_STATES), None)
+            if finished is None:
+                raise JobStoreFull(f"{len(self._jobs)} jobs en curso")
+            del self._jobs[finished]
+            self.evicted += 1
+
+        now = self._clock()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "owner": owner,
+            "status": "queued",
+            "frames_processed": 0,
+            "frames_total": 0,
+            "result": None,
+            "error": None,
+            "status_code": None,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+        }
+        self._jobs[job["job_id"]] = job
+        self.created += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    def set_progress(self, job_id: str, frames_processed: int, frames_total: int) -> bool:
+        """Actualiza el avance; retorna True si cambió (para emitir el evento solo entonces)."""
+        job = self._jobs.get(job_id)
+        if job is None or job["status"] in FINISHED_STATES:
+            return False
+        if (job["frames_processed"], job["frames_total"]) == (frames_processed, frames_total) \
+                and job["status"] == "running":
+            return False
+        job.update(status="running", frames_processed=frames_processed,
+                   frames_total=frames_total, updated_at=self._clock())
+        return True
+
+    def finish(self, job_id: str, result):
+        self._close(job_id, "done", result=result)
+
+    def fail(self, job_id: str, error: str, status_code: int = 500):
+        self._close(job_id, "failed", error=error, status_code=status_code)
+
+    def _close(self, job_id: str, status: str, **fields):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        now = self._clock()
+        job.update(status=status, updated_at=now, finished_at=now, **fields)
+
+    @staticmethod
+    def public_view(job: dict) -> dict:
+        """Respuesta de `GET /jobs/{id}` (y payload del evento `job_progress`)."""
+        total = job["frames_total"]
+        return {
+            "job_id": job["job_id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "progress": {
+                "frames_processed": job["frames_processed"],
+                "frames_total": total,
+                "fraction": (job["frames_processed"] / total) if total else 0.0,
+            },
+            "result": job["result"],
+            "error": job["error"],
+            "status_code": job["status_code"],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+        }
+
+    def get_stats(self) -> dict:
+        self._purge_expired()
+        by_status = {}
+        for job in self._jobs.values():
+            by_status[job["status"]] = by_status.get(job["status"], 0) + 1
+        return {
+            "jobs": len(self._jobs),
+            "max_jobs": self.max_jobs,
+            "by_status": by_status,
+            "created": self.created,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
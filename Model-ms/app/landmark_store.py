@@ -0,0 +1,232 @@
+"""
+Store persistente de landmarks (T, 226) ya extraídos de videos completos.
+
+MediaPipe es por lejos el costo dominante de un video, pero sus vectores
+se descartaban: cambiar `USE_V2_ENGINE` o reprocesar con un modelo nuevo
+volvía a correrlo. Aquí cada extracción se guarda bajo el SHA-256 del
+video más los parámetros de extracción (fps objetivo, lado máximo, modo de
+espejo, complejidad de Holistic), que son lo único que cambia los vectores
+(el modelo no):
+
+- `<clave>.npy`: frames (T, 226) float32; se abren con `mmap_mode="r"`, sin
+  copiar a memoria.
+- `<clave>.json`: metadatos (fps, timestamps, frames espejados, máscara de
+  manos presentes y estadísticas de la extracción original). Se escribe
+  al final: si existe, la entrada está completa.
+
+El hash siempre lo calcula el servidor (un hash enviado por el cliente
+podría envenenar la entrada de otro video). Si todavía no se conoce, como
+en un upload por FIFO, se guarda bajo una clave provisoria y se renombra
+(`rename`) al terminar de recibir el upload.
+
+`LANDMARK_STORE_DIR` vacío desactiva el store. Si el directorio supera
+`LANDMARK_STORE_MAX_MB` se borran las entradas menos usadas (mtime; cada
+hit la renueva).
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+_MODEL_V2_DEPS = os.path.join(os.path.dirname(__file__), "Modelo-V2-Full-Augmented-EXPORT", "dependencies")
+if _MODEL_V2_DEPS not in sys.path:
+    sys.path.insert(0, _MODEL_V2_DEPS)
+
+from features_v2 import hand_presence_mask
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+LANDMARK_STORE_DIR = os.getenv(
+    "LANDMARK_STORE_DIR", os.path.join(tempfile.gettempdir(), "lsc-landmark-store")
+)
+LANDMARK_STORE_MAX_MB = float(os.getenv("LANDMARK_STORE_MAX_MB", "512"))
+
+# Arrays por frame que viajan en el JSON de metadatos
+_PER_FRAME_META = ("timestamps", "mirrored", "hand_mask")
+
+
+def landmark_key(content_hash: str, **params) -> str:
+    """Clave de una extracción: hash del video + parámetros que cambian los vectores."""
+    canonical = json.dumps(params, sort_keys=True)
+    return hashlib.sha256(f"{content_hash}:{canonical}".encode()).hexdigest()
+
+
+class LandmarkStore:
+    def __init__(self, root: str = LANDMARK_STORE_DIR, max_bytes: int = 0):
+        self.root = root or None
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        if self.root:
+            os.makedirs(self.root, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def _paths(self, key: str):
+        base = os.path.join(self.root, key)
+        return f"{base}.npy", f"{base}.json"
+
+    def contains(self, key: str) -> bool:
+        """Hay una entrada completa para `key` (sin abrirla ni contar hit/miss)."""
+        return self.enabled and os.path.exists(self._paths(key)[1])
+
+    def load(self, key: str) -> Optional[dict]:
+        """
+        Extracción guardada con el mismo formato que `extract_video_landmarks`
+        (frames como memmap de solo lectura) o None.
+        """
+        if not self.enabled:
+            return None
+        frames_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            frames = np.load(frames_path, mmap_mode="r")
+            now = time.time()
+            os.utime(meta_path, (now, now))  # LRU por mtime
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        extracted = dict(meta["stats"])
+        extracted["frames"] = frames
+        extracted["timestamps"] = np.asarray(meta["timestamps"], dtype=np.float64)
+        extracted["mirrored"] = np.asarray(meta["mirrored"], dtype=bool)
+        extracted["hand_mask"] = np.asarray(meta["hand_mask"], dtype=bool)
+        return extracted
+
+    def save(self, key: str, extracted: dict):
+        """Guarda una extracción (frames `.npy` + metadatos `.json`, ambos atómicos)."""
+        if not self.enabled:
+            return
+        frames = np.ascontiguousarray(extracted["frames"], dtype=np.float32).reshape(-1, 226)
+        meta = {
+            "timestamps": np.asarray(extracted["timestamps"], dtype=np.float64).tolist(),
+            "mirrored": np.asarray(extracted["mirrored"], dtype=bool).tolist(),
+            "hand_mask": hand_presence_mask(frames).tolist(),
+            "stats": {k: v for k, v in extracted.items()
+                      if k not in _PER_FRAME_META and not isinstance(v, np.ndarray)},
+        }
+        frames_path, meta_path = self._paths(key)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(frames_path + suffix, "wb") as f:
+                np.save(f, frames)
+            os.replace(frames_path + suffix, frames_path)
+            with open(meta_path + suffix, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(meta_path + suffix, meta_path)
+        except (OSError, TypeError, ValueError) as e:
+            log(f"⚠️ [LandmarkStore] No se pudo guardar {key[:12]}: {e}")
+            for path in (frames_path + suffix, meta_path + suffix):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            return
+        with self._lock:
+            self.writes += 1
+        if self.max_bytes > 0:
+            self._evict()
+
+    def rename(self, old_key: str, new_key: str) -> bool:
+        """
+        Mueve una entrada completa a `new_key` (p. ej. de una clave provisoria
+        al hash del upload calculado por el servidor). False si no había entrada.
+        """
+        if not self.enabled:
+            return False
+        old_frames, old_meta = self._paths(old_key)
+        new_frames, new_meta = self._paths(new_key)
+        if not os.path.exists(old_meta):
+            self.discard(old_key)
+            return False
+        try:
+            os.replace(old_frames, new_frames)
+            os.replace(old_meta, new_meta)  # el .json al final: la entrada nueva aparece completa
+        except OSError as e:
+            log(f"⚠️ [LandmarkStore] No se pudo renombrar {old_key[:12]}: {e}")
+            self.discard(old_key)
+            return False
+        return True
+
+    def discard(self, key: str):
+        if not self.enabled:
+            return
+        for path in reversed(self._paths(key)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _entries(self):
+        """[(mtime, clave, bytes)] de las entradas completas en disco."""
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            key = name[:-5]
+            frames_path, meta_path = self._paths(key)
+            try:
+                size = os.path.getsize(frames_path) + os.path.getsize(meta_path)
+                entries.append((os.path.getmtime(meta_path), key, size))
+            except OSError:
+                continue
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        excess = sum(size for _, _, size in entries) - self.max_bytes
+        for _, key, size in sorted(entries):
+            if excess <= 0:
+                break
+            self.discard(key)  # primero el .json: sin él la entrada ya no se considera válida
+            excess -= size
+            with self._lock:
+                self.evictions += 1
+
+    def get_stats(self) -> dict:
+        entries = self._entries() if self.enabled else []
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(entries),
+                "bytes": sum(size for _, _, size in entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+
+_store = None
+
+
+def get_landmark_store() -> LandmarkStore:
+    """Store del proceso configurado por variables de entorno."""
+    global _store
+    if _store is None:
+        _store = LandmarkStore(LANDMARK_STORE_DIR, max_bytes=int(LANDMARK_STORE_MAX_MB * 1024 * 1024))
+    return _store
@@ -0,0 +1,74 @@
+"""
+Parseo y validación del cuerpo de `POST /predict/landmarks/batch`.
+
+Separado de `main.py` para poder probarlo sin cargar modelos ni FastAPI:
+los errores salen como `BatchRequestError` con el código HTTP que debe
+devolver el endpoint.
+
+Formatos aceptados:
+  - JSON: {"data": [[226 floats], ...], "top_k": 3} o directamente la lista de frames
+  - application/octet-stream: float32 little-endian crudo, N * 226 valores
+"""
+import json
+from typing import Tuple
+
+import numpy as np
+
+TOTAL_SIZE = 226
+FRAME_BYTES = TOTAL_SIZE * 4
+TOP_K_MAX = 50
+
+
+class BatchRequestError(ValueError):
+    """Petición batch inválida; `status_code` es el código HTTP a devolver."""
+
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def parse_top_k(value) -> int:
+    """`top_k` como entero en [1, TOP_K_MAX]."""
+    if isinstance(value, bool):
+        raise BatchRequestError("'top_k' debe ser un entero")
+    try:
+        top_k = int(value)
+    except (TypeError, ValueError):
+        raise BatchRequestError("'top_k' debe ser un entero")
+    if isinstance(value, float) and value != top_k:
+        raise BatchRequestError("'top_k' debe ser un entero")
+    if not 1 <= top_k <= TOP_K_MAX:
+        raise BatchRequestError(f"'top_k' debe estar entre 1 y {TOP_K_MAX}")
+    return top_k
+
+
+def parse_landmarks_batch(body: bytes, content_type: str, top_k=3,
+                          max_frames: int = 3000) -> Tuple[np.ndarray, int]:
+    """Retorna `(coords (N, 226) float32, top_k)` o lanza `BatchRequestError`."""
+    if content_type.startswith("application/octet-stream"):
+        if not body or len(body) % FRAME_BYTES != 0:
+            raise BatchRequestError(
+                f"El cuerpo binario debe ser múltiplo de {FRAME_BYTES} bytes (N x 226 float32)"
+            )
+        coords = np.frombuffer(body, dtype="<f4").reshape(-1, TOTAL_SIZE)
+    else:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise BatchRequestError("JSON inválido")
+        if isinstance(payload, dict):
+            if payload.get("top_k") is not None:  # null = el del query
+                top_k = payload["top_k"]
+            payload = payload.get("data")
+        try:
+            coords = np.asarray(payload, dtype=np.float32)
+        except (TypeError, ValueError):
+            raise BatchRequestError("'data' debe ser una lista de frames de 226 floats")
+        if coords.ndim != 2 or coords.shape[1] != TOTAL_SIZE or coords.shape[0] == 0:
+            raise BatchRequestError(f"Se esperaba (N, 226), se recibió {coords.shape}")
+
+    top_k = parse_top_k(top_k)
+    if coords.shape[0] > max_frames:
+        raise BatchRequestError(f"Máximo {max_frames} frames por petición", status_code=413)
+    return coords, top_k
@@ -12,6 +12,10 @@ WEIGHTS_NPZ = os.path.join(MODEL_DIR, "weights.npz")
 CONFIG_PATH = os.path.join(MODEL_DIR, "model_config.json")
 LABELS_PATH = os.path.join(MODEL_DIR, "model_config.json")  # Las etiquetas están en el config
 
+# Backend de inferencia V1: "keras" (default) o "numpy" (forward pass en NumPy puro,
+# sin overhead de despacho de TF por frame). Solo aplica si existe weights.npz.
+V1_BACKEND = os.getenv("V1_BACKEND", "keras").lower()
+
 # Logging configuration
 LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
 
@@ -54,28 +58,10 @@ class LSCEngine:
                     if deps_path not in sys.path:
                         sys.path.insert(0, deps_path)
                     
-                    from coordenates_models import get_model_coord_dense_5
-                    
-                    # Forzar CPU
-                    os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
-                    tf.config.set_visible_devices([], 'GPU')
-                    
-                    # Construir modelo
-                    cls._model = get_model_coord_dense_5(
-                        (config["model_info"]["input_shape"][0],), 
-                        config["model_info"]["num_classes"]
-                    )
-                    
-                    # Cargar pesos: preferir weights.npz (agnóstico a la versión de
-                    # Keras/TF; el modelo se entrenó en Keras 3 y aquí corre Keras 2),
-                    # con fallback a weights.hdf5 para modelos legacy.
-                    if os.path.exists(WEIGHTS_NPZ):
-                        data = np.load(WEIGHTS_NPZ, allow_pickle=True)
-                        arrays = [data[k] for k in sorted(data.files, key=lambda s: int(s.split("_")[1]))]
-                        cls._model.set_weights(arrays)
-                        log(f"✅ Pesos cargados desde weights.npz ({len(arrays)} tensores, version-safe)")
+                    if V1_BACKEND == "numpy" and os.path.exists(WEIGHTS_NPZ):
+                        cls._model = cls._build_numpy_model(config)
                     else:
-                        cls._model.load_weights(MODEL_PATH)
+                        cls._model = cls._build_keras_model(config)
                     
                     # Crear predictor exacto COMPARTIENDO el modelo ya cargado
                     from exacto_predictor_colnumword import ExactoPredictorCOLNUMWORD
@@ -97,6 +83,48 @@ class LSCEngine:
                     log(f"   MODEL_PATH exists ({m_exists}): {MODEL_PATH}")
                     log(f"   CONFIG_PATH exists ({c_exists}): {CONFIG_PATH}")
 
+    @classmethod
+    def _build_keras_model(cls, config):
+        """Construye get_model_coord_dense_5 en Keras y carga sus pesos."""
+        from coordenates_models import get_model_coord_dense_5
+        
+        # Forzar CPU
+        os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
+        tf.config.set_visible_devices([], 'GPU')
+        
+        # Construir modelo
+        model = get_model_coord_dense_5(
+            (config["model_info"]["input_shape"][0],), 
+            config["model_info"]["num_classes"]
+        )
+        
+        # Cargar pesos: preferir weights.npz (agnóstico a la versión de
+        # Keras/TF; el modelo se entrenó en Keras 3 y aquí corre Keras 2),
+        # con fallback a weights.hdf5 para modelos legacy.
+        if os.path.exists(WEIGHTS_NPZ):
+            data = np.load(WEIGHTS_NPZ, allow_pickle=True)
+            arrays = [data[k] for k in sorted(data.files, key=lambda s: int(s.split("_")[1]))]
+            model.set_weights(arrays)
+            log(f"✅ Pesos cargados desde weights.npz ({len(arrays)} tensores, version-safe)")
+        else:
+            model.load_weights(MODEL_PATH)
+        return model
+
+    @classmethod
+    def _build_numpy_model(cls, config):
+        """Carga weights.npz en el motor NumPy (mismo top-1 que Keras, sin TF por frame)."""
+        from numpy_dense_engine import NumpyDenseModel
+        
+        model = NumpyDenseModel.from_npz(WEIGHTS_NPZ)
+        info = config["model_info"]
+        if model.input_dim != info["input_shape"][0] or model.num_classes != info["num_classes"]:
+            raise ValueError(
+                f"weights.npz ({model.input_dim}→{model.num_classes}) no coincide con "
+                f"model_config.json ({info['input_shape'][0]}→{info['num_classes']})"
+            )
+        log(f"✅ LSCEngine: backend V1 = numpy")
+        return model
+
     @classmethod
     def _load_llm_resources(cls):
         """Carga el modelo GPT-2 y el tokenizador si no están en memoria."""
@@ -25,6 +25,16 @@ MODEL_V2_DIR = os.path.join(os.path.dirname(__file__), "Modelo-V2-Full-Augmented
 MODEL_V2_PATH = os.path.join(MODEL_V2_DIR, "weights.hdf5")
 CONFIG_V2_PATH = os.path.join(MODEL_V2_DIR, "model_config.json")
 
+# Variante forward-only para streaming stateful (opcional, ver build_streaming_model_v2)
+STREAMING_WEIGHTS_V2_PATH = os.path.join(MODEL_V2_DIR, "streaming_weights.npz")
+
+# Modo de streaming V2: "bigru" (ventana completa por predicción) o "stateful"
+# (GRU forward-only, O(1) por frame; requiere streaming_weights.npz)
+V2_STREAMING_MODE = os.getenv("V2_STREAMING_MODE", "bigru").lower()
+
+# Stride por defecto del streaming V2: correr el BiGRU cada k frames (1 = cada frame)
+V2_PREDICTION_HOP = int(os.getenv("V2_PREDICTION_HOP", "1"))
+
 
 class LSCEngineV2:
     """
@@ -38,6 +48,7 @@ class LSCEngineV2:
     """
     _model = None
     _config = None
+    _streaming_model = None
 
     @classmethod
     def _load_resources(cls):
@@ -91,6 +102,31 @@ class LSCEngineV2:
         cls._load_resources()
         return cls._config
 
+    @classmethod
+    def get_streaming_model(cls):
+        """Modelo forward-only stateful (NumPy) o None si no hay `streaming_weights.npz`."""
+        cls._load_resources()
+        if cls._streaming_model is not None or cls._config is None:
+            return cls._streaming_model
+        if not os.path.exists(STREAMING_WEIGHTS_V2_PATH):
+            log(f"⚠️ [LSCEngineV2] No existe {STREAMING_WEIGHTS_V2_PATH}; modo stateful no disponible")
+            return None
+        try:
+            from v2_stateful_gru import NumpyStatefulGRUModel
+            model = NumpyStatefulGRUModel.from_npz(STREAMING_WEIGHTS_V2_PATH)
+            info = cls._config["model_info"]
+            if model.input_dim != info["feature_dim_per_frame"] or model.num_classes != info["num_classes"]:
+                raise ValueError(
+                    f"streaming_weights.npz ({model.input_dim}→{model.num_classes}) no coincide con "
+                    f"model_config.json ({info['feature_dim_per_frame']}→{info['num_classes']})"
+                )
+            cls._streaming_model = model
+        except Exception as e:
+            log(f"❌ [LSCEngineV2 Error] Modelo stateful: {e}")
+            if LOGS_ENABLED:
+                traceback.print_exc()
+        return cls._streaming_model
+
     @classmethod
     def get_labels(cls):
         """Alias compatible con la API de LSCEngine (V1)."""
@@ -98,16 +134,34 @@ class LSCEngineV2:
         return cls._config["classes"] if cls._config else None
 
     @classmethod
-    def create_predictor(cls):
+    def predict_proba_batch(cls, windows: np.ndarray) -> np.ndarray:
+        """Un forward pass (B, 30, 452) → (B, clases) para ventanas de varias sesiones."""
+        cls._load_resources()
+        return cls._model.predict(np.asarray(windows, dtype=np.float32), verbose=0)
+
+    @classmethod
+    def create_predictor(cls, hop_size: int = None, stateful: bool = None):
         """
         Crea una nueva instancia de V2StreamingPredictor.
         Cada sesión/WebSocket debe llamar esto para tener su propio buffer.
+        `hop_size` (por defecto `V2_PREDICTION_HOP`) fija cada cuántos frames se infiere.
+        Con `stateful=True` (por defecto: `V2_STREAMING_MODE=stateful`) y pesos disponibles
+        retorna el predictor O(1) por frame; los videos completos usan `stateful=False`.
         """
         cls._load_resources()
         if cls._model is None:
             return None
-        from v2_streaming_predictor import V2StreamingPredictor
-        return V2StreamingPredictor(cls._model, cls._config)
+        from v2_streaming_predictor import V2StreamingPredictor, StatefulV2StreamingPredictor
+        if stateful is None:
+            stateful = V2_STREAMING_MODE == "stateful"
+        if stateful:
+            streaming_model = cls.get_streaming_model()
+            if streaming_model is not None:
+                return StatefulV2StreamingPredictor(streaming_model, cls._config)
+            log("⚠️ [LSCEngineV2] Fallback a BiGRU por ventana")
+        if hop_size is None:
+            hop_size = V2_PREDICTION_HOP
+        return V2StreamingPredictor(cls._model, cls._config, hop_size=hop_size)
 
 
 # Instancia global (paralela a `engine` del V1)
@@ -22,6 +22,16 @@ def log(*args, **kwargs):
 # Importar predictor exacto
 from exacto_predictor_colnumword import ExactoPredictorCOLNUMWORD
 
+# Kernel de mirror compartido con V2 (vive en las dependencias del export V2)
+_MODEL_V2_DEPS = os.path.join(os.path.dirname(__file__), "Modelo-V2-Full-Augmented-EXPORT", "dependencies")
+if _MODEL_V2_DEPS not in sys.path:
+    sys.path.insert(0, _MODEL_V2_DEPS)
+
+from features_v2 import MirrorKernel
+
+# Coords crudas de imagen en [0, 1]: el flip horizontal es x → 1 - x
+_MIRROR_V1 = MirrorKernel(x_offset=1.0)
+
 # NLP (GPT-2 for intelligent context) - Se cargarán bajo demanda
 # from transformers import GPT2Tokenizer, GPT2LMHeadModel
 # import torch
@@ -223,9 +233,36 @@ class LSCStreamingExactoPredictor:
 
         return boosted_probs
 
-    def add_landmarks(self, landmarks: np.ndarray) -> Optional[Dict]:
+    def mirror_landmarks(self, landmarks: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Devuelve la versión espejada de un frame (226,): flip X (1 - x), swap de
+        pares izquierda/derecha de la pose y swap de manos (100-162 es Derecha,
+        163-225 es Izquierda). Un solo gather precomputado, sin loops.
+        """
+        return _MIRROR_V1(landmarks, out=out)
+
+    def orientation_batch(self, landmarks: np.ndarray) -> np.ndarray:
+        """
+        Apila originales y espejados en un array listo para el modelo.
+
+        - Un frame (226,) → (2, 226): [original, espejado].
+        - K frames (K, 226) → (2K, 226): [originales…, espejados…]; el frame i
+          queda en las filas i y K + i.
+        """
+        frames = landmarks.reshape(-1, landmarks.shape[-1])
+        k = frames.shape[0]
+        batch = np.empty((2 * k, frames.shape[1]), dtype=np.float32)
+        batch[:k] = frames
+        self.mirror_landmarks(batch[:k], out=batch[k:])
+        return batch
+
+    def add_landmarks(self, landmarks: np.ndarray, probabilities: Optional[np.ndarray] = None) -> Optional[Dict]:
         """
         Añade landmarks al buffer usando predictor exacto.
+
+        Si se pasa `probabilities` (2, clases) — calculado externamente sobre
+        `orientation_batch(landmarks)`, p. ej. por el scheduler de micro-batching —
+        no se vuelve a llamar al modelo.
         """
         # Log de entrada SIEMPRE
         print(f"[ADD_LANDMARKS-START] Llamada recibida. Shape: {landmarks.shape if hasattr(landmarks, 'shape') else 'NO SHAPE'}")
@@ -240,26 +277,16 @@ class LSCStreamingExactoPredictor:
         
         try:
             # --- ESTRATEGIA DE DOBLE PREDICCIÓN (Robustez ante espejado / mobile) ---
-            # 1. Copiar y Flip X
-            landmarks_mirror = landmarks.copy()
-            landmarks_mirror[0:100:4] = 1.0 - landmarks_mirror[0:100:4] # Pose X
-            landmarks_mirror[100:226:3] = 1.0 - landmarks_mirror[100:226:3] # Hands X
-            
-            # 2. SWAP Pose Left/Right (Pares: 1-4, 2-5, 3-6, 7-8, 9-10, 11-12, 13-14, 15-16, 17-18, 19-20, 21-22, 23-24)
-            for p1, p2 in [(1,4), (2,5), (3,6), (7,8), (9,10), (11,12), (13,14), (15,16), (17,18), (19,20), (21,22), (23,24)]:
-                idx1, idx2 = p1*4, p2*4
-                temp = landmarks_mirror[idx1:idx1+4].copy()
-                landmarks_mirror[idx1:idx1+4] = landmarks_mirror[idx2:idx2+4]
-                landmarks_mirror[idx2:idx2+4] = temp
-                
-            # 3. SWAP Hands (Modelo-ms: 100-162 es Derecha, 163-225 es Izquierda)
-            rh_part = landmarks_mirror[100:163].copy()
-            landmarks_mirror[100:163] = landmarks_mirror[163:226]
-            landmarks_mirror[163:226] = rh_part
-            
             # Predecir en ambas orientaciones y elegir la mejor
-            res_orig = self.exacto_predictor.predict_from_coords(landmarks.tolist(), include_probabilities=True)
-            res_mirr = self.exacto_predictor.predict_from_coords(landmarks_mirror.tolist(), include_probabilities=True)
+            if probabilities is not None:
+                res_orig = self.exacto_predictor.result_from_probabilities(probabilities[0], include_probabilities=True)
+                res_mirr = self.exacto_predictor.result_from_probabilities(probabilities[1], include_probabilities=True)
+            else:
+                # Ambas orientaciones en un solo batch (2, 226) → un forward pass
+                orientations = self.orientation_batch(landmarks)
+                res_orig, res_mirr = self.exacto_predictor.predict_dual_from_coords(
+                    orientations[0], orientations[1], include_probabilities=True
+                )
             
             conf_orig = res_orig.get('confidence', 0)
             conf_mirr = res_mirr.get('confidence', 0)
@@ -385,6 +412,36 @@ class LSCStreamingExactoPredictor:
             traceback.print_exc()
             return {'status': 'error', 'word': None, 'confidence': 0, 'distance_alert': None}
 
+    def add_landmarks_batch(self, frames: np.ndarray, probabilities: Optional[np.ndarray] = None) -> list:
+        """
+        Procesa K frames consecutivos (K, 226) de la misma sesión.
+
+        Ambas orientaciones de los K frames van en UN solo forward pass
+        (2K, 226); luego cada frame pasa en orden por el suavizado de
+        add_landmarks. Si se pasa `probabilities` (2K, clases), calculado sobre
+        `orientation_batch(frames)`, no se llama al modelo.
+        Retorna la lista de resultados por frame (el último es la decisión vigente).
+        """
+        frames = np.asarray(frames, dtype=np.float32)
+        if frames.ndim != 2 or frames.shape[1] != 226 or frames.shape[0] == 0:
+            return [{
+                'status': 'error', 'word': None, 'confidence': 0,
+                'message': f'Invalid landmarks batch shape: {frames.shape}'
+            }]
+
+        k = frames.shape[0]
+        if probabilities is None:
+            try:
+                probabilities = self.exacto_predictor.predict_proba_batch(self.orientation_batch(frames))
+            except Exception as e:
+                log(f"💥 [ADD_LANDMARKS_BATCH-ERROR] {e}")
+                return [{'status': 'error', 'word': None, 'confidence': 0, 'distance_alert': None}]
+
+        return [
+            self.add_landmarks(frames[i], probabilities=probabilities[[i, k + i]])
+            for i in range(k)
+        ]
+
     def _check_distance(self, landmarks: np.ndarray) -> Optional[str]:
         """
         Verifica si el usuario está muy cerca o muy lejos basándose en los hombros.
@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 
 load_dotenv() # Load env vars from .env file
 import json
+import uuid
 import tempfile
 import requests
 import traceback
@@ -13,13 +14,47 @@ import cloudinary.uploader
 from fastapi import FastAPI, HTTPException, UploadFile, File, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from lsc_engine import LSCEngine, MODEL_PATH, CONFIG_PATH
+from lsc_engine import LSCEngine, MODEL_PATH, CONFIG_PATH, WEIGHTS_NPZ
 from lsc_streaming_exacto import LSCStreamingPredictor
-from lsc_engine_v2 import LSCEngineV2
+from lsc_engine_v2 import LSCEngineV2, MODEL_V2_PATH, CONFIG_V2_PATH
+from v2_streaming_predictor import V2StreamingPredictor
+from cascade_predictor import CascadeStreamingPredictor
+from inference_scheduler import MicroBatchScheduler
+from inference_executor import InferenceExecutor
+from session_ingest import FrameIngestSlot
+from holistic_pool import get_holistic_pool
+from video_workers import VideoJobPool, VideoPoolSaturated, VideoWorkerCrashed, predict_video_job, segment_video_job
+from job_store import JobStore, JobStoreFull
+from video_stream import ingest_upload, ingest_verified, spool_upload, upload_chunks
+from video_landmarks import (VIDEO_TARGET_FPS, VIDEO_MAX_EDGE, VIDEO_MIRROR_MODE,
+                             LANDMARK_EXTRACTION_VERSION, landmark_store_key)
+from result_cache import get_result_cache, fingerprint, make_key, sha256_bytes, sha256_file
+from landmark_store import get_landmark_store
+from landmarks_batch import BatchRequestError, parse_landmarks_batch
 
 # Flag para usar V2 (BiGRU sobre secuencias). Default = V1 (comportamiento original).
 # Activar con:  USE_V2_ENGINE=true python main.py
 USE_V2_ENGINE = os.getenv("USE_V2_ENGINE", "false").lower() == "true"
+
+# Modo cascada para streaming: V1 en cada frame y V2 solo cuando V1 duda, hay
+# movimiento o cambian las manos. Requiere ambos modelos. Activar con USE_CASCADE_ENGINE=true
+USE_CASCADE_ENGINE = os.getenv("USE_CASCADE_ENGINE", "false").lower() == "true"
+
+# Micro-batching entre sesiones: los frames (V1) o ventanas (V2) de todas las sesiones Socket.IO se
+# agrupan en un solo forward pass (flush por tamaño máximo o por tiempo máximo).
+INFERENCE_BATCHING_ENABLED = os.getenv("INFERENCE_BATCHING_ENABLED", "false").lower() == "true"
+INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", "32"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "4"))
+
+# Hilos dedicados a inferencia (fuera del event loop). 1 = un único hilo con cola.
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+# Hilos para inferencia pedida por HTTP (/predict/landmarks[/batch]), aparte de los streams en vivo
+HTTP_INFERENCE_WORKERS = int(os.getenv("HTTP_INFERENCE_WORKERS", "1"))
+
+# Backpressure por sesión: frames pendientes máximos mientras otro está en inferencia.
+# V1 = 1 (solo el más reciente); V2 conserva unos pocos por continuidad temporal.
+INGEST_WINDOW_V1 = int(os.getenv("INGEST_WINDOW_V1", "1"))
+INGEST_WINDOW_V2 = int(os.getenv("INGEST_WINDOW_V2", "4"))
 from gtts import gTTS # Fixed capitalization
 import numpy as np
 from transcription_agent import VoskAgent, get_model, transcribe_audio_file
@@ -29,13 +64,42 @@ app = FastAPI()
 # Store active agents to prevent garbage collection and allow stopping
 active_agents = {} # room_name -> VoskAgent
 
+# Schedulers de micro-batching V1 / V2 (None si está desactivado o el modelo no cargó)
+v1_scheduler = None
+v2_scheduler = None
+
+# Pool de inferencia: Keras/GPT-2 nunca corren dentro del event loop
+inference_executor = InferenceExecutor(max_workers=INFERENCE_WORKERS, name="inference")
+# Un clip batch de miles de frames no debe frenar los frames en vivo de Socket.IO
+http_inference_executor = InferenceExecutor(max_workers=HTTP_INFERENCE_WORKERS, name="http-inference")
+
+# Pool de procesos para videos completos (VIDEO_WORKERS / VIDEO_QUEUE_LIMIT)
+video_pool = VideoJobPool(use_v2=USE_V2_ENGINE)
+
+# Cache de resultados por SHA-256 del contenido. La versión cambia con los pesos del
+# motor activo y con el preprocesamiento de video, así un cambio no sirve resultados viejos.
+result_cache = get_result_cache()
+VIDEO_MODEL_VERSION = fingerprint(
+    [MODEL_V2_PATH, CONFIG_V2_PATH] if USE_V2_ENGINE else [MODEL_PATH, WEIGHTS_NPZ, CONFIG_PATH],
+    "v2" if USE_V2_ENGINE else "v1", VIDEO_TARGET_FPS, VIDEO_MAX_EDGE, VIDEO_MIRROR_MODE,
+    LANDMARK_EXTRACTION_VERSION,
+)
+TTS_CACHE_VERSION = "gtts-es"
+
 # Configuration
 LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    video_pool.shutdown()
+    inference_executor.shutdown()
+    http_inference_executor.shutdown()
+
 @app.on_event("startup")
 async def startup_event():
     print("🚀 [Startup] Iniciando microservicio Model-ms...")
     print(f"[Startup] USE_V2_ENGINE = {USE_V2_ENGINE}")
+    print(f"[Startup] USE_CASCADE_ENGINE = {USE_CASCADE_ENGINE}")
     try:
         print("[Startup] Pre-cargando modelo ModeloV3001 (V1)...")
         # Forzar carga del singleton V1
@@ -43,18 +107,49 @@ async def startup_event():
         if model is not None:
             print(f"✅ [Startup] V1 precargado. Clases: {len(labels)}")
 
-        # Pre-cargar V2 si el flag está activo
-        if USE_V2_ENGINE:
-            print("[Startup] USE_V2_ENGINE=true → Pre-cargando V2 (BiGRU)...")
+        # Pre-cargar V2 si el flag está activo (o si la cascada lo necesita)
+        if USE_V2_ENGINE or USE_CASCADE_ENGINE:
+            print("[Startup] Pre-cargando V2 (BiGRU)...")
             v2_model = LSCEngineV2.get_model()
             v2_config = LSCEngineV2.get_config()
             if v2_model is not None and v2_config is not None:
                 info = v2_config["model_info"]
                 print(f"✅ [Startup V2] {info['name']} cargado. "
                       f"Accuracy: {info['val_accuracy']:.2%} | Clases: {info['num_classes']}")
+
+                if INFERENCE_BATCHING_ENABLED and USE_V2_ENGINE:
+                    # Ventanas (30, 452) listas de todas las sesiones → un solo (B, 30, 452)
+                    global v2_scheduler
+                    v2_scheduler = MicroBatchScheduler(
+                        LSCEngineV2.predict_proba_batch,
+                        max_batch_size=INFERENCE_MAX_BATCH,
+                        max_wait_ms=INFERENCE_MAX_WAIT_MS,
+                        name="v2",
+                        executor=inference_executor.pool,
+                    )
+                    print(f"📦 [Startup V2] Micro-batching V2 activo "
+                          f"(max_batch={INFERENCE_MAX_BATCH}, max_wait={INFERENCE_MAX_WAIT_MS}ms)")
             else:
                 print("⚠️ [Startup V2] V2 no pudo cargarse. Servicio fallback a V1.")
 
+        if model is not None and INFERENCE_BATCHING_ENABLED and not USE_V2_ENGINE:
+            global v1_scheduler
+            v1_scheduler = MicroBatchScheduler(
+                LSCEngine.get_predictor().predict_proba_batch,
+                max_batch_size=INFERENCE_MAX_BATCH,
+                max_wait_ms=INFERENCE_MAX_WAIT_MS,
+                name="v1",
+                executor=inference_executor.pool,
+            )
+            print(f"📦 [Startup] Micro-batching V1 activo "
+                  f"(max_batch={INFERENCE_MAX_BATCH}, max_wait={INFERENCE_MAX_WAIT_MS}ms)")
+
+        # Workers de video (cada uno precarga modelo + Holistic); sin workers, el pool
+        # de Holistic del proceso principal atiende los videos y se precalienta aquí
+        video_pool.start()
+        if video_pool.workers == 0:
+            asyncio.create_task(asyncio.to_thread(_warm_up_holistic_pool))
+
         if model is not None:
             
             # Pre-cargar GPT-2 en segundo plano para no bloquear el inicio
@@ -70,6 +165,12 @@ async def startup_event():
         print(f"❌ [Startup Error] Fallo crítico cargando modelo: {e}")
         traceback.print_exc()
 
+def _warm_up_holistic_pool():
+    try:
+        get_holistic_pool().warm_up()
+    except Exception as e:
+        print(f"⚠️ [Startup] No se pudo precalentar el pool de Holistic: {e}")
+
 cloudinary.config(
     cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
     api_key=os.getenv("CLOUDINARY_API_KEY"),
@@ -81,52 +182,177 @@ def log(*args, **kwargs):
     if LOGS_ENABLED:
         print(*args, **kwargs)
 
-async def _process_video_file(file: UploadFile) -> str:
+def _saturated_response(error: VideoPoolSaturated) -> HTTPException:
+    if isinstance(error, VideoWorkerCrashed):
+        detail = "Falló el procesamiento del video por un reinicio interno, intenta de nuevo"
+    else:
+        detail = "Servidor ocupado procesando videos, intenta de nuevo"
+    return HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+async def _upload_sha256(file: UploadFile) -> str:
+    """SHA-256 del upload multipart (Starlette ya lo tiene completo en su archivo spooled)."""
+    return await asyncio.to_thread(sha256_file, file.file)
+
+def _promote_landmarks(pending_hash: str, content_hash: str = None):
+    """Mueve los landmarks guardados bajo una clave provisoria al hash calculado del upload."""
+    store = get_landmark_store()
+    if content_hash:
+        store.rename(landmark_store_key(pending_hash), landmark_store_key(content_hash))
+    else:
+        store.discard(landmark_store_key(pending_hash))  # upload incompleto: no se guarda
+
+def _cache_upload_result(result: dict, ingest: dict):
+    """Guarda el resultado de un upload procesado bajo el hash calculado al recibirlo."""
+    log(f"[DEBUG] Processed upload: {ingest['bytes']} bytes via {ingest['ingest']} ({ingest['container']})")
+    result["debug"]["ingest"] = ingest
+    if ingest.get("sha256"):
+        result_cache.put(make_key("predict", ingest["sha256"], VIDEO_MODEL_VERSION), result)
+    result["debug"]["cache"] = "miss"
+
+async def _process_claimed_upload(chunks, claimed_hash: str, cached: dict = None) -> dict:
     """
-    Helper function to process uploaded video and return predicted text.
+    Upload con `X-Content-SHA256` conocido (cache de resultados o store de
+    landmarks): se recibe a disco y se hashea en el servidor.
+      - `cached` (resultado de la cache) se responde solo si el hash coincide.
+      - Si no, el video se procesa con el hash calculado: si ya está en el
+        store de landmarks (p. ej. tras cambiar de modelo o de motor), el
+        worker no vuelve a correr MediaPipe.
     """
-    video_path = None
-    try:
-        # Create temp file
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
-        tmp.close()
-        video_path = tmp.name
-
-        # Save uploaded content
-        content = await file.read()
-        log(f"[DEBUG] Processing file size: {len(content)} bytes")
-        
-        with open(video_path, "wb") as f:
-            f.write(content)
+    async def verify_or_run(path, digest, matches):
+        if cached is not None and matches:
+            return None
+        async with video_pool.admit():
+            return await video_pool.run(predict_video_job, path, USE_V2_ENGINE, None, None, digest)
+
+    result, ingest = await ingest_verified(chunks, claimed_hash, verify_or_run)
+    if result is None:
+        log(f"[DEBUG] Result cache hit verificado ({claimed_hash[:12]})")
+        cached["debug"]["cache"] = "hit"
+        return cached
+    if ingest["sha256"] != claimed_hash:
+        log(f"[DEBUG] X-Content-SHA256 no coincide con el upload ({claimed_hash[:12]} != {ingest['sha256'][:12]})")
+    _cache_upload_result(result, ingest)
+    return result
+
+async def _process_video_file(file: UploadFile, content_hash: str = None) -> dict:
+    """
+    Helper function to process uploaded video.
+    Returns {"text": predicted text, "debug": extraction stats (fps, decimation, speedup, ingest)}.
+    """
+    if content_hash is None:
+        content_hash = await _upload_sha256(file)
+    return await _process_video_stream(upload_chunks(file), content_hash)
 
-        # Predict - V2 si flag activo, sino V1
-        if USE_V2_ENGINE:
-            predictor = LSCEngineV2.create_predictor()
+async def _process_video_stream(chunks, content_hash: str = None, claimed_hash: str = None) -> dict:
+    """
+    Igual que `_process_video_file` pero a partir de chunks de bytes: el
+    upload va por FIFO al worker (decodifica mientras llega) o, si el
+    contenedor necesita seek, a un archivo temporal (ver `video_stream.py`).
+
+    Cache de resultados:
+      - `content_hash` lo calculó el servidor: un hit se responde directo.
+      - `claimed_hash` (header `X-Content-SHA256` del cliente) es solo una
+        pista: si hay hit, el upload igual se recibe completo y se hashea, y
+        se responde desde la cache solo si el hash coincide. Sin el video
+        no se obtiene ningún resultado. Lo mismo si solo el store de
+        landmarks lo conoce (cambio de modelo): tras verificar, el worker
+        recibe el hash calculado y reutiliza los landmarks.
+    El resultado (incluso "sin seña") se guarda bajo el SHA-256 que el
+    servidor calculó del upload.
+    """
+    try:
+        result = result_cache.get(make_key("predict", content_hash, VIDEO_MODEL_VERSION)) if content_hash else None
+        claimed = None
+        if result is None and claimed_hash:
+            claimed = result_cache.get(make_key("predict", claimed_hash, VIDEO_MODEL_VERSION))
+
+        if result is not None:
+            log(f"[DEBUG] Result cache hit ({content_hash[:12]})")
+            result["debug"]["cache"] = "hit"
+        elif claimed is not None or (
+            claimed_hash and get_landmark_store().contains(landmark_store_key(claimed_hash))
+        ):
+            result = await _process_claimed_upload(chunks, claimed_hash, claimed)
         else:
-            predictor = LSCEngine.get_predictor()
-        if predictor is None:
-            raise HTTPException(status_code=500, detail="Modelo no cargado")
-
-        result = predictor.predict_video(video_path)
-
-        if not result:
+            # Sin hash del servidor todavía: el worker guarda los landmarks bajo una
+            # clave provisoria que se renombra al hash real cuando termina el upload
+            store_hash = content_hash or f"pending-{uuid.uuid4().hex}"
+            ingest = {}
+            try:
+                # Reservar lugar en el pool antes de consumir los chunks. En /predict/stream
+                # el cuerpo todavía no se leyó: saturado = 503 sin recibir el video. En las
+                # rutas multipart (/predict, /predict/audio) FastAPI ya recibió y hasheó el
+                # upload completo; ahí el 503 solo evita la copia al worker y la decodificación.
+                async with video_pool.admit():
+                    # Predict (V2 si flag activo, sino V1) en un proceso worker, fuera del event loop
+                    result, ingest = await ingest_upload(
+                        chunks, lambda path: video_pool.run(predict_video_job, path, USE_V2_ENGINE,
+                                                            None, None, store_hash)
+                    )
+            finally:
+                if content_hash is None:
+                    _promote_landmarks(store_hash, ingest.get("sha256"))
+            _cache_upload_result(result, ingest)
+
+        if not result["text"]:
             raise HTTPException(status_code=422, detail="No se pudo reconocer ninguna seña")
 
         # Return the label as-is (COL-NUM-WORD model includes letters, numbers, colors, words)
         return result
 
+    except VideoPoolSaturated as e:
+        raise _saturated_response(e)
     except HTTPException:
         raise
     except Exception as e:
         if LOGS_ENABLED:
             traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
-    finally:
-        if video_path and os.path.exists(video_path):
-            try:
-                os.remove(video_path)
-            except:
-                pass
+
+@app.get("/stats/inference")
+async def inference_stats():
+    return {
+        "active_sessions": len(active_predictors),
+        "v1_scheduler": v1_scheduler.get_stats() if v1_scheduler else None,
+        "v2_scheduler": v2_scheduler.get_stats() if v2_scheduler else None,
+        "cascade": _cascade_stats(),
+        "holistic_pool": get_holistic_pool().get_stats(),
+        "video_pool": video_pool.get_stats(),
+        "video_jobs": video_jobs.get_stats(),
+        "result_cache": result_cache.get_stats(),
+        # hits/misses son del proceso actual; los de los workers de video se ven en el "debug" de cada respuesta
+        "landmark_store": get_landmark_store().get_stats(),
+        "executor": inference_executor.get_stats(),
+        "http_executor": http_inference_executor.get_stats(),
+        "ingest": {
+            "pending": sum(len(slot.pending) for slot in session_ingest.values()),
+            "received": sum(slot.received for slot in session_ingest.values()),
+            "dropped": sum(slot.dropped for slot in session_ingest.values()),
+        },
+    }
+
+def _cascade_stats():
+    """Fracción de frames que escalaron a V2 entre las sesiones cascada activas."""
+    sessions = [p.get_stats() for p in active_predictors.values() if isinstance(p, CascadeStreamingPredictor)]
+    if not sessions:
+        return None
+    frames = sum(s["frames"] for s in sessions)
+    escalations = sum(s["escalations"] for s in sessions)
+    reasons = {}
+    for s in sessions:
+        for reason, count in s["reasons"].items():
+            reasons[reason] = reasons.get(reason, 0) + count
+    return {
+        "sessions": len(sessions),
+        "frames": frames,
+        "escalations": escalations,
+        "escalation_fraction": (escalations / frames) if frames else 0.0,
+        "reasons": reasons,
+    }
 
 class LandmarksRequest(BaseModel):
     data: list
@@ -134,13 +360,194 @@ class LandmarksRequest(BaseModel):
 @app.post("/predict")
 async def predict_video(request: Request, file: UploadFile = File(...)):
     log("\n[DEBUG] --- /predict Request ---")
-    text = await _process_video_file(file)
-    log(f"[DEBUG] Result: {text}")
+    result = await _process_video_file(file)
+    log(f"[DEBUG] Result: {result['text']}")
     return {
         "success": True,
-        "text": text
+        "text": result["text"],
+        "debug": result["debug"],
     }
 
+@app.post("/predict/stream")
+async def predict_video_stream(request: Request):
+    """
+    Como /predict, pero el cuerpo del request ES el video (sin multipart,
+    p.ej. `Content-Type: video/webm`). La decodificación arranca mientras
+    el upload sigue llegando.
+    """
+    log("\n[DEBUG] --- /predict/stream Request ---")
+    # Hash opcional enviado por el cliente: solo una pista para la cache, se verifica contra el cuerpo
+    claimed_hash = request.headers.get("x-content-sha256", "").lower()
+    if len(claimed_hash) != 64:
+        claimed_hash = None
+    result = await _process_video_stream(request.stream(), claimed_hash=claimed_hash)
+    log(f"[DEBUG] Result: {result['text']}")
+    return {
+        "success": True,
+        "text": result["text"],
+        "debug": result["debug"],
+    }
+
+# Paso (en frames) entre ventanas consecutivas en la segmentación multi-seña V2
+V2_SEGMENT_STRIDE = int(os.getenv("V2_SEGMENT_STRIDE", "5"))
+
+@app.post("/predict/segments")
+async def predict_video_segments(file: UploadFile = File(...), stride: int = V2_SEGMENT_STRIDE,
+                                 min_confidence: float = 0.5, min_windows: int = 1):
+    """
+    Reconoce VARIAS señas en un video largo con el modelo V2 (ventanas
+    deslizantes de 30 frames cada `stride` frames, clasificadas en batch).
+
+    Retorna {"success", "text", "signs": [{word, confidence, start_s, end_s, ...}], ...}
+    """
+    log("\n[DEBUG] --- /predict/segments Request ---")
+    try:
+        content_hash = await _upload_sha256(file)
+        async with video_pool.admit():
+            result, ingest = await ingest_upload(
+                upload_chunks(file),
+                lambda path: video_pool.run(segment_video_job, path, stride, min_confidence, min_windows,
+                                            content_hash),
+            )
+        if result is None:
+            raise HTTPException(status_code=422, detail="No se pudo leer el video")
+        result["debug"]["ingest"] = ingest
+        if not result["signs"]:
+            raise HTTPException(status_code=422, detail="No se pudo reconocer ninguna seña")
+
+        return {
+            "success": True,
+            "text": " ".join(sign["word"] for sign in result["signs"]),
+            **result,
+        }
+    except VideoPoolSaturated as e:
+        raise _saturated_response(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        if LOGS_ENABLED:
+            traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+# ============================================================
+# Jobs de video asíncronos: POST devuelve un job_id, GET consulta avance/resultado
+# ============================================================
+
+# Cada cuánto se lee el avance de un job en curso (y se emite `job_progress` si cambió)
+JOB_PROGRESS_INTERVAL_S = float(os.getenv("JOB_PROGRESS_INTERVAL_S", "0.5"))
+
+video_jobs = JobStore()
+video_job_tasks = set()  # referencias fuertes a los jobs en curso
+
+async def _emit_job_progress(job):
+    if job["owner"]:
+        await sio.emit('job_progress', JobStore.public_view(job), to=job["owner"])
+
+async def _watch_job_progress(job, progress):
+    """Copia el avance publicado por el worker al store mientras el job corre."""
+    while True:
+        await asyncio.sleep(JOB_PROGRESS_INTERVAL_S)
+        try:
+            # Con workers, `progress` es un proxy de Manager: cada get es IPC bloqueante
+            reported = await asyncio.to_thread(progress.get, job["job_id"])
+        except Exception:
+            return  # Manager reconstruido tras la caída de un worker
+        if reported is not None and video_jobs.set_progress(job["job_id"], *reported):
+            await _emit_job_progress(job)
+
+def _finish_video_job(job, result: dict):
+    if result["text"]:
+        video_jobs.finish(job["job_id"], {"success": True, "text": result["text"], "debug": result["debug"]})
+    else:
+        video_jobs.fail(job["job_id"], "No se pudo reconocer ninguna seña", status_code=422)
+
+async def _run_video_job(job, video_path: str, content_hash: str):
+    """Corre el job en el pool de video; el lugar ya fue reservado con `acquire()`."""
+    job_id = job["job_id"]
+    progress = video_pool.progress_board()
+    watcher = asyncio.create_task(_watch_job_progress(job, progress))
+    result, error, status_code = None, None, 500
+    try:
+        result = await video_pool.run(predict_video_job, video_path, USE_V2_ENGINE, progress, job_id,
+                                      content_hash)
+    except VideoWorkerCrashed as e:
+        error, status_code = str(e), 503
+    except Exception as e:
+        if LOGS_ENABLED:
+            traceback.print_exc()
+        error = f"Error interno: {str(e)}"
+    finally:
+        watcher.cancel()
+        video_pool.release()
+        try:
+            os.remove(video_path)
+        except OSError:
+            pass
+
+    try:
+        reported = await asyncio.to_thread(progress.pop, job_id, None)
+    except Exception:
+        reported = None
+    if reported is not None:
+        video_jobs.set_progress(job_id, *reported)
+    if error:
+        video_jobs.fail(job_id, error, status_code=status_code)
+    else:
+        result_cache.put(make_key("predict", content_hash, VIDEO_MODEL_VERSION), result)
+        result["debug"]["cache"] = "miss"
+        _finish_video_job(job, result)
+    log(f"[DEBUG] Job {job_id}: {job['status']}")
+    await _emit_job_progress(job)
+
+@app.post("/jobs/predict", status_code=202)
+async def create_predict_job(file: UploadFile = File(...), sid: str = None):
+    """
+    Igual que /predict pero asíncrono: guarda el video, encola el job y
+    retorna `{"job_id", "status"}` de inmediato. `sid` (opcional) es la
+    sesión Socket.IO que recibirá eventos `job_progress`.
+    """
+    log("\n[DEBUG] --- /jobs/predict Request ---")
+    try:
+        video_pool.acquire()
+    except VideoPoolSaturated as e:
+        raise _saturated_response(e)
+
+    video_path = None
+    try:
+        # El job corre después de responder: el upload se copia a disco por chunks.
+        # El job se crea recién con el upload completo: uno cortado no deja un job "queued" huérfano.
+        video_path, content_hash = await spool_upload(upload_chunks(file))
+        job = video_jobs.create("predict", owner=sid)
+    except Exception as e:
+        video_pool.release()
+        if video_path and os.path.exists(video_path):
+            os.remove(video_path)
+        if isinstance(e, JobStoreFull):
+            raise HTTPException(status_code=503, detail="Demasiados jobs en curso, intenta de nuevo",
+                                headers={"Retry-After": str(video_pool.retry_after_s)})
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+    cached = result_cache.get(make_key("predict", content_hash, VIDEO_MODEL_VERSION))
+    if cached is not None:
+        video_pool.release()
+        os.remove(video_path)
+        cached["debug"]["cache"] = "hit"
+        _finish_video_job(job, cached)
+        await _emit_job_progress(job)
+        return {"job_id": job["job_id"], "status": job["status"]}
+
+    task = asyncio.create_task(_run_video_job(job, video_path, content_hash))
+    video_job_tasks.add(task)
+    task.add_done_callback(video_job_tasks.discard)
+    return {"job_id": job["job_id"], "status": job["status"]}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = video_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado o expirado")
+    return JobStore.public_view(job)
+
 @app.post("/predict/landmarks")
 async def predict_landmarks(body: LandmarksRequest):
     # body.data should be the list of 226 floats
@@ -151,13 +558,44 @@ async def predict_landmarks(body: LandmarksRequest):
         
         # Aplicar la misma normalización que usa el evaluador
         coords = np.array(body.data, dtype=np.float32)
-        result = predictor.predict_from_coords(coords.tolist())
+        result = await http_inference_executor.submit(predictor.predict_from_coords, coords)
         return result
     except Exception as e:
         if LOGS_ENABLED:
             traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+# Límite de frames por petición batch (≈ 100 s de video a 30 fps)
+LANDMARKS_BATCH_MAX_FRAMES = int(os.getenv("LANDMARKS_BATCH_MAX_FRAMES", "3000"))
+
+@app.post("/predict/landmarks/batch")
+async def predict_landmarks_batch(request: Request, top_k: int = 3):
+    """
+    Clasifica un clip completo de landmarks (N, 226) en una sola petición.
+
+    Acepta:
+      - JSON: {"data": [[226 floats], ...], "top_k": 3}  (o directamente la lista de frames)
+      - application/octet-stream: float32 little-endian crudo, N * 226 valores
+    """
+    try:
+        coords, top_k = parse_landmarks_batch(
+            await request.body(), request.headers.get("content-type", ""), top_k,
+            max_frames=LANDMARKS_BATCH_MAX_FRAMES,
+        )
+    except BatchRequestError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    predictor = LSCEngine.get_predictor()
+    if not predictor:
+        raise HTTPException(status_code=500, detail="Modelo no cargado")
+
+    try:
+        return await http_inference_executor.submit(predictor.predict_batch, coords, top_k)
+    except Exception as e:
+        if LOGS_ENABLED:
+            traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/predict/audio")
 async def predict_audio(request: Request, file: UploadFile = File(...)):
     log("\n[DEBUG] --- /predict/audio Request ---")
@@ -174,8 +612,17 @@ async def predict_audio(request: Request, file: UploadFile = File(...)):
                    "Por favor, configure CLOUDINARY_CLOUD_NAME, CLOUDINARY_API_KEY y CLOUDINARY_API_SECRET en el archivo .env del backend."
         )
 
-    # 2. Get Text
-    text = await _process_video_file(file)
+    # 2. Get Text (y audio ya subido si este mismo clip se procesó antes)
+    content_hash = await _upload_sha256(file)
+    audio_key = make_key("audio", content_hash, VIDEO_MODEL_VERSION)
+    cached = result_cache.get(audio_key)
+    if cached is not None:
+        log(f"[DEBUG] Audio cache hit ({content_hash[:12]}): {cached['audioUrl']}")
+        return {"success": True, "audioUrl": cached["audioUrl"], "debug": {**cached["debug"], "cache": "hit"}}
+
+    prediction = await _process_video_file(file, content_hash)
+    text = prediction["text"]
+    audio_path = None
     try:
         fd, audio_path = tempfile.mkstemp(suffix=".mp3")
         os.close(fd)
@@ -194,10 +641,12 @@ async def predict_audio(request: Request, file: UploadFile = File(...)):
         
         audio_url = upload_result.get("secure_url")
         log(f"[DEBUG] Upload successful: {audio_url}")
+        result_cache.put(audio_key, {"text": text, "audioUrl": audio_url, "debug": prediction["debug"]})
 
         return {
             "success": True,
-            "audioUrl": audio_url
+            "audioUrl": audio_url,
+            "debug": prediction["debug"],
         }
 
     except Exception as e:
@@ -234,6 +683,12 @@ async def text_to_speech(request: TTSRequest):
             detail="Error: Cloudinary credentials missing in Model-ms"
         )
 
+    tts_key = make_key("tts", sha256_bytes(text.encode("utf-8")), TTS_CACHE_VERSION)
+    cached = result_cache.get(tts_key)
+    if cached is not None:
+        log(f"[DEBUG] TTS cache hit: {cached['audioUrl']}")
+        return {"success": True, "audioUrl": cached["audioUrl"]}
+
     audio_path = None
     try:
         # 2. Generate Audio
@@ -254,6 +709,7 @@ async def text_to_speech(request: TTSRequest):
         
         audio_url = upload_result.get("secure_url")
         log(f"[DEBUG] Upload successful: {audio_url}")
+        result_cache.put(tts_key, {"audioUrl": audio_url})
 
         return {
             "success": True,
@@ -361,6 +817,9 @@ socket_app = socketio.ASGIApp(sio, app)
 # Diccionario para gestionar predictores por SID
 active_predictors = {}
 
+# Slots de ingesta (latest-frame-wins) por SID
+session_ingest = {}
+
 @sio.event
 async def connect(sid, environ):
     print(f"🔌 [Socket.IO] Intento de conexión: {sid}")  # Always print, not log()
@@ -402,6 +861,15 @@ async def connect(sid, environ):
         )
         print(f"[DEBUG-CONNECT] Predictor de streaming creado exitosamente para {sid}")
 
+        # Rama cascada: V1 por frame + V2 (modelo compartido) solo cuando V1 lo pide
+        if USE_CASCADE_ENGINE:
+            v2_predictor = LSCEngineV2.create_predictor(stateful=False)
+            if v2_predictor is None:
+                print(f"⚠️ [Socket.IO Cascada] V2 no disponible; {sid} usa solo V1")
+            else:
+                predictor = CascadeStreamingPredictor(predictor, v2_predictor)
+                print(f"[DEBUG-CONNECT] Cascada V1→V2 activa para {sid}")
+
         active_predictors[sid] = predictor
         print(f"[DEBUG-CONNECT] Predictor guardado en active_predictors. Total activos: {len(active_predictors)}")
 
@@ -417,6 +885,59 @@ async def disconnect(sid):
     log(f"[Socket.IO] Cliente desconectado: {sid}")
     if sid in active_predictors:
         del active_predictors[sid]
+    inference_executor.release_session(sid)
+    session_ingest.pop(sid, None)
+
+# Frame binario: 226 float32 little-endian (opcionalmente dentro de {'data': bytes, 'seq': n})
+LANDMARKS_FRAME_BYTES = 226 * 4
+
+def _decode_landmarks_payload(data):
+    """
+    Convierte el payload del evento `landmarks` en un array (226,) float32.
+
+    Formatos aceptados (coexisten):
+      - JSON: [226 floats] o {'data': [226 floats], 'seq': n}
+      - Binario: bytes (904) o {'data': bytes, 'seq': n}. Se envuelve con
+        np.frombuffer sin copiar (el array resultante es de solo lectura).
+
+    Retorna (landmarks | None, seq | None).
+    """
+    seq = None
+    if isinstance(data, dict):
+        seq = data.get('seq')
+        data = data.get('data')
+
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        if len(data) != LANDMARKS_FRAME_BYTES:
+            return None, seq
+        return np.frombuffer(data, dtype='<f4'), seq
+
+    if not data or len(data) != 226:
+        return None, seq
+    return np.asarray(data, dtype=np.float32), seq
+
+def _prediction_payload(result: dict, seq=None) -> dict:
+    """Payload del evento `prediction` (común a V1 y V2)."""
+    payload = {
+        "word": result['word'],
+        "confidence": float(result['confidence']),
+        "buffer_fill": float(result.get('buffer_fill', 0.0)),
+        "status": result['status'],
+        "context": result.get('current_context'),
+        "last_accepted_word": result.get('last_accepted_word'),
+        "context_changed": result.get('context_changed', False),
+        "distance_alert": result.get('distance_alert')
+    }
+    if result.get('source'):
+        # Modo cascada: qué modelo produjo la palabra ("v1" | "v2")
+        payload["source"] = result['source']
+        payload["escalated"] = bool(result.get('escalated', False))
+    if result.get('result_age') is not None:
+        # V2 con stride: frames transcurridos desde la inferencia que produjo este resultado
+        payload["result_age"] = int(result['result_age'])
+    if seq is not None:
+        payload["seq"] = seq
+    return payload
 
 @sio.on('landmarks')
 async def handle_landmarks(sid, data):
@@ -433,44 +954,73 @@ async def handle_landmarks(sid, data):
 
         # Inspección detallada de datos recibidos
         print(f"[LANDMARKS-DATA] Tipo de data recibida: {type(data)}")
-        print(f"[LANDMARKS-DATA] Contenido (primeros 200 chars): {str(data)[:200]}")
              
-        # Extraer datos de landmarks
-        landmarks_data = data.get('data') if isinstance(data, dict) else data
-        
-        print(f"[LANDMARKS-EXTRACT] Tipo extraído: {type(landmarks_data)}")
-        print(f"[LANDMARKS-EXTRACT] Longitud: {len(landmarks_data) if landmarks_data else 'None'}")
-        
-        if isinstance(landmarks_data, list) and len(landmarks_data) > 0:
-            print(f"[LANDMARKS-SAMPLE] Primeros 5 valores: {landmarks_data[:5]}")
-            print(f"[LANDMARKS-SAMPLE] Últimos 5 valores: {landmarks_data[-5:]}")
+        # Extraer datos de landmarks (JSON: lista de 226 floats | binario: 904 bytes float32 LE)
+        landmarks, seq = _decode_landmarks_payload(data)
 
-        if not landmarks_data or len(landmarks_data) != 226:
-            print(f"❌ [ERROR-VALIDATION] Landmarks inválidos. Len: {len(landmarks_data) if landmarks_data else 'None'}, Esperado: 226")
+        if landmarks is None:
+            print(f"❌ [ERROR-VALIDATION] Landmarks inválidos. Tipo: {type(data)}, Esperado: 226 floats o {LANDMARKS_FRAME_BYTES} bytes")
             return
 
-        print(f"[LANDMARKS-OK] Convirtiendo a numpy array...")
-        landmarks = np.array(landmarks_data, dtype=np.float32)
-        print(f"[LANDMARKS-OK] Array creado. Shape: {landmarks.shape}, dtype: {landmarks.dtype}")
-        
+        print(f"[LANDMARKS-OK] Array listo. Shape: {landmarks.shape}, dtype: {landmarks.dtype}, seq: {seq}")
+
+        # Latest-frame-wins: si la sesión ya tiene un frame en inferencia, este
+        # espera en una ventana acotada (se descarta el más viejo si está llena)
+        slot = _get_ingest_slot(sid, predictor)
+        if slot.offer((landmarks, seq)):
+            print(f"⏭️ [LANDMARKS-DROP] Frame viejo descartado para {sid} (total: {slot.dropped})")
+        notice = slot.lag_notice()
+        if notice:
+            await sio.emit('server_lagging', notice, to=sid)
+
+        if slot.busy:
+            return  # el drenador activo de la sesión tomará el frame
+
+        slot.busy = True
+        try:
+            while True:
+                item = slot.take()
+                if item is None:
+                    break
+                await _predict_and_emit(sid, predictor, *item)
+        finally:
+            slot.busy = False
+
+    except Exception as e:
+        print(f"💥 [EXCEPTION-LANDMARKS] Error procesando: {e}")
+        traceback.print_exc()
+
+def _get_ingest_slot(sid, predictor) -> FrameIngestSlot:
+    slot = session_ingest.get(sid)
+    if slot is None:
+        window = INGEST_WINDOW_V1 if isinstance(predictor, LSCStreamingPredictor) else INGEST_WINDOW_V2
+        slot = session_ingest[sid] = FrameIngestSlot(window=window)
+    return slot
+
+async def _predict_and_emit(sid, predictor, landmarks, seq):
+    """Inferencia de un frame (en el pool dedicado) y emisión de `prediction`."""
+    try:
         # Predecir usando buffer de streaming (226 features - shoulder-centered normalization)
         print(f"[LANDMARKS-PREDICT] Llamando a predictor.add_landmarks()...")
-        result = predictor.add_landmarks(landmarks)
+        # Inferencia en el pool dedicado; el lock de sesión mantiene el orden de los frames
+        async with inference_executor.session_lock(sid):
+            if v1_scheduler is not None and isinstance(predictor, (LSCStreamingPredictor, CascadeStreamingPredictor)):
+                # Forward pass compartido con el resto de sesiones pendientes
+                probabilities = await v1_scheduler.submit(predictor.orientation_batch(landmarks))
+                result = await inference_executor.submit(predictor.add_landmarks, landmarks, probabilities=probabilities)
+            elif v2_scheduler is not None and isinstance(predictor, V2StreamingPredictor):
+                # Solo las ventanas que toca inferir entran al batch compartido
+                window = await inference_executor.submit(predictor.prepare_landmarks, landmarks)
+                probabilities = await v2_scheduler.submit(window) if window is not None else None
+                result = predictor.complete_landmarks(probabilities)
+            else:
+                result = await inference_executor.submit(predictor.add_landmarks, landmarks)
         print(f"[LANDMARKS-PREDICT] Resultado recibido: {result is not None}")
 
         if result:
             print(f"[LANDMARKS-RESULT] word={result.get('word')}, conf={result.get('confidence'):.3f}, status={result.get('status')}")
 
-            await sio.emit('prediction', {
-                "word": result['word'],
-                "confidence": float(result['confidence']),
-                "buffer_fill": float(result['buffer_fill']),
-                "status": result['status'],
-                "context": result.get('current_context'),
-                "last_accepted_word": result.get('last_accepted_word'),
-                "context_changed": result.get('context_changed', False),
-                "distance_alert": result.get('distance_alert')
-            }, to=sid)
+            await sio.emit('prediction', _prediction_payload(result, seq), to=sid)
             print(f"[LANDMARKS-EMIT] Predicción enviada al cliente {sid}")
             
             # Log de predicciones exitosas
@@ -483,10 +1033,83 @@ async def handle_landmarks(sid, data):
         print(f"💥 [EXCEPTION-LANDMARKS] Error procesando: {e}")
         traceback.print_exc()
 
+# Máximo de frames por mensaje `landmarks_batch` (≈ 1 s a 30 fps)
+LANDMARKS_BATCH_MAX_K = int(os.getenv("LANDMARKS_BATCH_MAX_K", "30"))
+
+def _decode_landmarks_batch_payload(data):
+    """
+    Convierte el payload de `landmarks_batch` en un array (K, 226) float32.
+
+    Formatos: {'data': [[226 floats], ...] | bytes (K * 904), 'seq': n, 'details': bool}.
+    `seq` es el número de secuencia del PRIMER frame del lote.
+    Retorna (frames | None, seq | None, details).
+    """
+    if not isinstance(data, dict):
+        data = {'data': data}
+    seq = data.get('seq')
+    details = bool(data.get('details', False))
+    raw = data.get('data')
+
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        if not raw or len(raw) % LANDMARKS_FRAME_BYTES != 0:
+            return None, seq, details
+        frames = np.frombuffer(raw, dtype='<f4').reshape(-1, 226)
+    else:
+        try:
+            frames = np.asarray(raw, dtype=np.float32)
+        except (TypeError, ValueError):
+            return None, seq, details
+        if frames.ndim != 2 or frames.shape[1] != 226 or frames.shape[0] == 0:
+            return None, seq, details
+
+    if frames.shape[0] > LANDMARKS_BATCH_MAX_K:
+        return None, seq, details
+    return frames, seq, details
+
+@sio.on('landmarks_batch')
+async def handle_landmarks_batch(sid, data):
+    """
+    K frames consecutivos de una sesión en un solo mensaje. Se procesan en un
+    paso vectorizado y se emite UN `prediction` con la última decisión
+    (y, si `details` es true, el detalle por frame).
+    """
+    try:
+        predictor = active_predictors.get(sid)
+        if not predictor:
+            log(f"⚠️ [landmarks_batch] No hay predictor para {sid}")
+            return
+
+        frames, seq, details = _decode_landmarks_batch_payload(data)
+        if frames is None:
+            log(f"❌ [landmarks_batch] Payload inválido de {sid} (máx {LANDMARKS_BATCH_MAX_K} frames de 226)")
+            return
+
+        async with inference_executor.session_lock(sid):
+            if v1_scheduler is not None and isinstance(predictor, (LSCStreamingPredictor, CascadeStreamingPredictor)):
+                probabilities = await v1_scheduler.submit(predictor.orientation_batch(frames))
+                results = await inference_executor.submit(predictor.add_landmarks_batch, frames, probabilities=probabilities)
+            else:
+                results = await inference_executor.submit(predictor.add_landmarks_batch, frames)
+
+        last_seq = seq + frames.shape[0] - 1 if isinstance(seq, int) else None
+        payload = _prediction_payload(results[-1], last_seq)
+        payload["frames_in_batch"] = int(frames.shape[0])
+        if details:
+            payload["frames"] = [
+                {"word": r.get('word'), "confidence": float(r.get('confidence', 0.0)), "status": r.get('status')}
+                for r in results
+            ]
+        await sio.emit('prediction', payload, to=sid)
+
+    except Exception as e:
+        print(f"💥 [EXCEPTION-LANDMARKS-BATCH] Error procesando: {e}")
+        traceback.print_exc()
+
 @sio.on('reset')
 async def handle_reset(sid):
     if sid in active_predictors:
-        active_predictors[sid].reset_buffer()
+        # Por el executor: el reset queda ordenado respecto a los frames en vuelo
+        await inference_executor.run(sid, active_predictors[sid].reset_buffer)
         await sio.emit('reset_ack', {'message': 'Buffer cleared'}, to=sid)
         # log(f"[Socket.IO] Buffer reset for {sid}")
 
@@ -507,7 +1130,7 @@ async def handle_word_accepted(sid, data):
             
         if sid in active_predictors:
             log(f"✅ [Socket.IO] Palabra aceptada recibida de {sid}: '{word}'")
-            active_predictors[sid].set_accepted_word(word)
+            await inference_executor.run(sid, active_predictors[sid].set_accepted_word, word)
         else:
             log(f"❌ [Socket.IO] Warning: 'word_accepted' from unknown sid {sid}")
             
@@ -522,7 +1145,7 @@ async def handle_set_context(sid, data):
             return
             
         context = data.get('context') if isinstance(data, dict) else data
-        predictor.set_context(context)
+        await inference_executor.run(sid, predictor.set_context, context)
         
         await sio.emit('context_ack', {'status': 'ok', 'current_context': context}, to=sid)
         log(f"[Socket.IO] Context set to {context} for {sid}")
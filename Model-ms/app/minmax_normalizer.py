@@ -0,0 +1,64 @@
+"""
+Normalización Min-Max vectorizada para batches (N, 226) de landmarks V1.
+
+Misma lógica que `ExactoPredictorCOLNUMWORD.normalize_landmarks_exacto`
+(y que `LandmarkInfo.get_fixed_landmark` del export), pero sin iterar por
+frame: los N frames se procesan juntos con operaciones broadcast, pero cada
+frame se normaliza por separado. Para cada frame y cada parte (Pose, Mano
+Derecha, Mano Izquierda) se calculan min y max de x, y, z sobre los puntos
+de esa parte en ese frame.
+
+- El min-max incluye los puntos en cero (siempre que la parte no sea toda cero).
+- Una parte completamente en cero se deja intacta.
+- Rangos <= 1e-6 se reemplazan por 1.0 (evita división por cero).
+- El canal de visibility de la pose no se toca.
+"""
+import numpy as np
+
+# (inicio, landmarks, dims) de cada parte dentro del vector de 226
+_PARTS = (
+    (0, 25, 4),     # Pose (x, y, z, visibility)
+    (100, 21, 3),   # Mano Derecha
+    (163, 21, 3),   # Mano Izquierda
+)
+TOTAL_SIZE = 226
+RANGE_EPS = 1e-6
+
+
+def normalize_landmarks_batch(coords: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Normaliza (226,) o (N, 226) en float32.
+
+    Si `out` es None se devuelve una copia; si `out is coords` la
+    normalización se hace in-place. `out` debe ser float32 C-contiguo con la
+    misma forma que `coords`.
+    """
+    coords = np.asarray(coords, dtype=np.float32)
+    if coords.shape[-1] != TOTAL_SIZE:
+        raise ValueError(f"Se esperaba dim {TOTAL_SIZE}, se recibió {coords.shape[-1]}")
+
+    if out is None:
+        out = coords.copy()
+    elif out is not coords:
+        np.copyto(out, coords)
+
+    batch = out.reshape(-1, TOTAL_SIZE)
+    n = batch.shape[0]
+
+    for start, count, dims in _PARTS:
+        part = batch[:, start:start + count * dims].reshape(n, count, dims)
+        pts = part[:, :, :3]
+
+        mins = pts.min(axis=1)              # (N, 3)
+        ranges = pts.max(axis=1) - mins     # (N, 3)
+        ranges[~(ranges > RANGE_EPS)] = 1.0
+
+        # Partes ausentes (todo cero): min=0, rango=1 → valores sin cambio
+        absent = ~np.any(pts != 0, axis=(1, 2))
+        mins[absent] = 0.0
+        ranges[absent] = 1.0
+
+        pts -= mins[:, np.newaxis, :]
+        pts /= ranges[:, np.newaxis, :]
+
+    return out
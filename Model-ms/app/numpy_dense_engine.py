@@ -0,0 +1,111 @@
+"""
+Motor de inferencia NumPy puro para el clasificador denso V1.
+
+`get_model_coord_dense_5` es solo una pila de capas Dense
+(226 → 512 → 256 → 128 → 160) con Dropout, que en inferencia no hace nada.
+Para un batch de 1 frame, el overhead de despacho de Keras/TF en
+`model.predict` es mucho mayor que las multiplicaciones en sí, así que aquí
+se reproduce el forward pass con matmuls de NumPy sobre buffers
+preasignados.
+
+Expone la misma firma `predict(x, verbose=0)` que un modelo Keras, de modo
+que `ExactoPredictorCOLNUMWORD` lo puede usar como `model` sin cambios.
+"""
+import os
+import threading
+
+import numpy as np
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+class NumpyDenseModel:
+    """
+    Forward pass de una pila Dense(relu)… → Dense(softmax) en NumPy.
+
+    - `layers`: lista de tuplas (kernel (in, out), bias (out,)) en orden.
+    - Todas las capas ocultas usan ReLU; la última usa softmax.
+    - Los buffers de activación se preasignan para `batch_capacity` filas y
+      crecen solo si llega un batch más grande.
+    """
+
+    def __init__(self, layers, batch_capacity: int = 2):
+        if not layers:
+            raise ValueError("Se necesita al menos una capa Dense")
+        self.kernels = [np.ascontiguousarray(k, dtype=np.float32) for k, _ in layers]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for _, b in layers]
+        for i in range(1, len(self.kernels)):
+            if self.kernels[i].shape[0] != self.kernels[i - 1].shape[1]:
+                raise ValueError(
+                    f"Capa {i}: entrada {self.kernels[i].shape[0]} no coincide "
+                    f"con salida previa {self.kernels[i - 1].shape[1]}"
+                )
+        self.input_dim = self.kernels[0].shape[0]
+        self.num_classes = self.kernels[-1].shape[1]
+        self._lock = threading.Lock()
+        self._allocate(batch_capacity)
+
+    @classmethod
+    def from_npz(cls, weights_path: str, batch_capacity: int = 2):
+        """Carga desde `weights.npz` (arr_0=kernel, arr_1=bias, arr_2=kernel, …)."""
+        data = np.load(weights_path, allow_pickle=True)
+        arrays = [data[k] for k in sorted(data.files, key=lambda s: int(s.split("_")[1]))]
+        if len(arrays) % 2 != 0:
+            raise ValueError(f"weights.npz con {len(arrays)} tensores; se esperaban pares kernel/bias")
+        layers = [(arrays[i], arrays[i + 1]) for i in range(0, len(arrays), 2)]
+        model = cls(layers, batch_capacity=batch_capacity)
+        log(f"✅ NumpyDenseModel: {len(layers)} capas "
+            f"({' → '.join(str(k.shape[0]) for k in model.kernels)} → {model.num_classes})")
+        return model
+
+    def _allocate(self, capacity: int):
+        self._capacity = capacity
+        self._buffers = [np.empty((capacity, k.shape[1]), dtype=np.float32) for k in self.kernels]
+        self._row_max = np.empty((capacity, 1), dtype=np.float32)
+        self._row_sum = np.empty((capacity, 1), dtype=np.float32)
+
+    def predict(self, x, verbose=0) -> np.ndarray:
+        """
+        Devuelve probabilidades (N, num_classes) para `x` de forma (N, 226) o (226,).
+        `verbose` se acepta solo por compatibilidad con la API de Keras.
+        """
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[np.newaxis, :]
+        if x.shape[-1] != self.input_dim:
+            raise ValueError(f"Se esperaba dim {self.input_dim}, se recibió {x.shape[-1]}")
+
+        n = x.shape[0]
+        with self._lock:
+            if n > self._capacity:
+                self._allocate(n)
+
+            h = x
+            last = len(self.kernels) - 1
+            for i, (kernel, bias) in enumerate(zip(self.kernels, self.biases)):
+                out = self._buffers[i][:n]
+                np.matmul(h, kernel, out=out)
+                out += bias
+                if i < last:
+                    np.maximum(out, 0.0, out=out)
+                h = out
+
+            # Softmax estable por fila, in-place sobre el buffer de salida
+            row_max = self._row_max[:n]
+            row_sum = self._row_sum[:n]
+            np.max(h, axis=1, keepdims=True, out=row_max)
+            h -= row_max
+            np.exp(h, out=h)
+            np.sum(h, axis=1, keepdims=True, out=row_sum)
+            h /= row_sum
+
+            # Copia: el buffer se reutiliza en la siguiente llamada
+            return h.copy()
+
+    def __call__(self, x):
+        return self.predict(x)
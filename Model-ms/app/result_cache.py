@@ -0,0 +1,224 @@
+"""
+Cache de resultados direccionada por contenido para /predict, /predict/audio y /tts.
+
+Los clientes móviles reintentan uploads y el mismo clip suele ir a
+/predict y después a /predict/audio: cada vez se pagaba decode +
+MediaPipe + inferencia (+ gTTS + Cloudinary). Aquí el resultado se guarda
+bajo `sha256(tipo, versión del modelo, sha256 del contenido)`:
+
+- Nivel 1: LRU en memoria de `RESULT_CACHE_SIZE` entradas.
+- Nivel 2 (opcional, `RESULT_CACHE_DIR`): un JSON por entrada en disco,
+  compartido entre workers y reinicios. Si el directorio supera
+  `RESULT_CACHE_DISK_MB` se borran las entradas menos usadas (mtime; cada
+  hit la renueva).
+
+Los valores son dicts JSON-serializables; `get` devuelve una copia.
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", "")
+RESULT_CACHE_DISK_MB = float(os.getenv("RESULT_CACHE_DISK_MB", "64"))
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(fileobj, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 de un archivo abierto (desde el inicio); deja el cursor al inicio."""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def fingerprint(paths: Iterable[str], *extra) -> str:
+    """
+    Versión corta de un modelo: tamaño y mtime de sus archivos más los
+    parámetros que cambian el resultado (`extra`). Cambiar de pesos o de
+    preprocesamiento invalida las entradas viejas sin borrarlas.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            st = os.stat(path)
+            digest.update(f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns};".encode())
+        except OSError:
+            digest.update(f"{os.path.basename(path)}:missing;".encode())
+    digest.update(repr(extra).encode())
+    return digest.hexdigest()[:12]
+
+
+def make_key(kind: str, content_hash: str, version: str) -> str:
+    return hashlib.sha256(f"{kind}:{version}:{content_hash}".encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, disk_dir: Optional[str] = None,
+                 disk_max_bytes: int = 0, enabled: bool = True):
+        self.enabled = enabled
+        self.max_entries = max(1, max_entries)
+        self.disk_dir = disk_dir or None
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_sizes = {}  # key -> bytes en disco
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.disk_evictions = 0
+
+        if self.enabled and self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".json"):
+                    try:
+                        self._disk_sizes[name[:-5]] = os.path.getsize(os.path.join(self.disk_dir, name))
+                    except OSError:
+                        pass
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return copy.deepcopy(value)
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, value)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: dict):
+        if not self.enabled:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self.puts += 1
+            self._remember(key, value)
+        if self.disk_dir:
+            self._write_disk(key, value)
+
+    def _remember(self, key: str, value: dict):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[dict]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # LRU en disco por mtime
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, value: dict):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except (OSError, TypeError, ValueError) as e:
+            log(f"⚠️ [ResultCache] No se pudo escribir {path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._disk_sizes[key] = size
+            over = sum(self._disk_sizes.values()) - self.disk_max_bytes
+        if self.disk_max_bytes > 0 and over > 0:
+            self._evict_disk(over)
+
+    def _evict_disk(self, excess: int):
+        """Borra las entradas con mtime más viejo hasta liberar `excess` bytes."""
+        entries = []
+        with self._lock:
+            keys = list(self._disk_sizes)
+        for key in keys:
+            try:
+                entries.append((os.path.getmtime(self._disk_path(key)), key))
+            except OSError:
+                with self._lock:
+                    self._disk_sizes.pop(key, None)
+        for _, key in sorted(entries):
+            if excess <= 0:
+                break
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+            with self._lock:
+                excess -= self._disk_sizes.pop(key, 0)
+                self.disk_evictions += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": ((self.memory_hits + self.disk_hits) / lookups) if lookups else 0.0,
+                "puts": self.puts,
+                "disk_entries": len(self._disk_sizes) if self.disk_dir else None,
+                "disk_bytes": sum(self._disk_sizes.values()) if self.disk_dir else None,
+                "disk_evictions": self.disk_evictions,
+            }
+
+
+_cache = None
+
+
+def get_result_cache() -> ResultCache:
+    """Cache del proceso configurada por variables de entorno."""
+    global _cache
+    if _cache is None:
+        _cache = ResultCache(
+            max_entries=RESULT_CACHE_SIZE,
+            disk_dir=RESULT_CACHE_DIR or None,
+            disk_max_bytes=int(RESULT_CACHE_DISK_MB * 1024 * 1024),
+            enabled=RESULT_CACHE_ENABLED,
+        )
+    return _cache
@@ -0,0 +1,82 @@
+"""
+Ingesta por sesión con coalescencia "latest-frame-wins" y backpressure.
+
+Si la inferencia se atrasa, los eventos `landmarks` se acumulaban sin límite
+y las predicciones llegaban segundos tarde (inútil para señas en vivo). Cada
+sid tiene ahora un slot acotado:
+
+- Mientras un frame de la sesión está en inferencia, los nuevos esperan en
+  una ventana de tamaño `window` (1 en V1 = solo el más reciente; unos pocos
+  en V2, que necesita continuidad temporal).
+- Si llega un frame con la ventana llena, se descarta el más viejo y se cuenta.
+- Un único "drenador" por sesión procesa la ventana en orden, así la
+  latencia extremo a extremo queda acotada bajo sobrecarga.
+"""
+import time
+from collections import deque
+from typing import Any, Optional
+
+
+class FrameIngestSlot:
+    """Ventana acotada de frames pendientes de una sesión."""
+
+    def __init__(self, window: int = 1, lag_notify_interval_s: float = 1.0):
+        self.window = max(1, window)
+        self.pending = deque()
+        self.busy = False  # True mientras hay un drenador activo para la sesión
+
+        self.received = 0
+        self.dropped = 0
+        self.processed = 0
+
+        self._lag_notify_interval = lag_notify_interval_s
+        self._last_lag_notify = 0.0
+        self._dropped_since_notify = 0
+
+    def offer(self, item: Any) -> bool:
+        """Encola `item`. Retorna True si hubo que descartar un frame viejo."""
+        self.received += 1
+        dropped = False
+        if len(self.pending) >= self.window:
+            self.pending.popleft()
+            self.dropped += 1
+            self._dropped_since_notify += 1
+            dropped = True
+        self.pending.append(item)
+        return dropped
+
+    def take(self) -> Optional[Any]:
+        """Saca el siguiente frame pendiente (el más viejo de la ventana)."""
+        if not self.pending:
+            return None
+        self.processed += 1
+        return self.pending.popleft()
+
+    def lag_notice(self) -> Optional[dict]:
+        """
+        Si hubo descartes desde el último aviso y pasó el intervalo mínimo,
+        retorna el payload de `server_lagging`; si no, None.
+        """
+        if self._dropped_since_notify == 0:
+            return None
+        now = time.monotonic()
+        if now - self._last_lag_notify < self._lag_notify_interval:
+            return None
+        notice = {
+            "dropped": self._dropped_since_notify,
+            "dropped_total": self.dropped,
+            "pending": len(self.pending),
+            "window": self.window,
+        }
+        self._last_lag_notify = now
+        self._dropped_since_notify = 0
+        return notice
+
+    def get_stats(self) -> dict:
+        return {
+            "window": self.window,
+            "pending": len(self.pending),
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": self.dropped,
+        }
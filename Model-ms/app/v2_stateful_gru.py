@@ -0,0 +1,127 @@
+"""
+Inferencia stateful (frame a frame) para la variante forward-only del V2.
+
+El BiGRU de `build_model_v2` es bidireccional: cada predicción reprocesa
+la ventana completa de 30 frames. La variante `build_streaming_model_v2`
+usa GRU unidireccionales, así que en streaming basta con llevar el estado
+oculto de cada sesión y avanzar UN paso por frame: costo O(1) por frame,
+independiente del largo de la ventana.
+
+Aquí se reproduce ese paso en NumPy (mismas ecuaciones que Keras GRU con
+`reset_after=True`, orden de compuertas z, r, h) a partir de
+`streaming_weights.npz` (ver `export_streaming_weights`).
+"""
+import os
+
+import numpy as np
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+class NumpyStatefulGRUModel:
+    """
+    Pila GRU(return_sequences) … → Dense(relu)… → Dense(softmax) paso a paso.
+
+    - `gru_layers`: lista de (kernel (in, 3u), recurrent_kernel (u, 3u), bias (2, 3u)).
+    - `dense_layers`: lista de (kernel, bias); ReLU en las ocultas, softmax al final.
+    - El estado es una lista de arrays (B, u), uno por capa GRU; `step` lo
+      actualiza in-place, así cada sesión guarda el suyo.
+    """
+
+    def __init__(self, gru_layers, dense_layers):
+        if not gru_layers or not dense_layers:
+            raise ValueError("Se necesita al menos una capa GRU y una Dense")
+        self.gru_layers = []
+        for kernel, recurrent, bias in gru_layers:
+            bias = np.asarray(bias, dtype=np.float32).reshape(2, -1)
+            self.gru_layers.append((
+                np.ascontiguousarray(kernel, dtype=np.float32),
+                np.ascontiguousarray(recurrent, dtype=np.float32),
+                bias[0].copy(),
+                bias[1].copy(),
+            ))
+        self.dense_layers = [
+            (np.ascontiguousarray(k, dtype=np.float32), np.ascontiguousarray(b, dtype=np.float32))
+            for k, b in dense_layers
+        ]
+        self.units = [recurrent.shape[0] for _, recurrent, _, _ in self.gru_layers]
+        self.input_dim = self.gru_layers[0][0].shape[0]
+        self.num_classes = self.dense_layers[-1][0].shape[1]
+
+    @classmethod
+    def from_npz(cls, weights_path: str):
+        """Carga `streaming_weights.npz`: GRU = 3 tensores (bias 2D), Dense = 2 tensores."""
+        data = np.load(weights_path, allow_pickle=True)
+        arrays = [data[k] for k in sorted(data.files, key=lambda s: int(s.split("_")[1]))]
+        gru_layers, dense_layers = [], []
+        i = 0
+        while i < len(arrays):
+            recurrent = arrays[i + 1] if i + 1 < len(arrays) else None
+            is_gru = (i + 2 < len(arrays) and recurrent.ndim == 2
+                      and recurrent.shape[1] == 3 * recurrent.shape[0]
+                      and arrays[i + 2].shape == (2, recurrent.shape[1]))
+            if is_gru:
+                gru_layers.append(tuple(arrays[i:i + 3]))
+                i += 3
+            else:
+                dense_layers.append(tuple(arrays[i:i + 2]))
+                i += 2
+        model = cls(gru_layers, dense_layers)
+        log(f"✅ NumpyStatefulGRUModel: GRU {model.units} + {len(dense_layers)} Dense "
+            f"({model.input_dim} → {model.num_classes})")
+        return model
+
+    def initial_state(self, batch: int = 1) -> list:
+        """Estado oculto en cero para `batch` sesiones/secuencias."""
+        return [np.zeros((batch, u), dtype=np.float32) for u in self.units]
+
+    def step(self, x: np.ndarray, state: list) -> np.ndarray:
+        """
+        Avanza un paso: `x` (B, input_dim) → probabilidades (B, num_classes).
+        `state` se actualiza in-place.
+        """
+        h_in = np.asarray(x, dtype=np.float32)
+        if h_in.ndim == 1:
+            h_in = h_in[np.newaxis, :]
+        for (kernel, recurrent, input_bias, recurrent_bias), h in zip(self.gru_layers, state):
+            u = h.shape[1]
+            x_proj = h_in @ kernel + input_bias
+            h_proj = h @ recurrent + recurrent_bias
+            z = _sigmoid(x_proj[:, :u] + h_proj[:, :u])
+            r = _sigmoid(x_proj[:, u:2 * u] + h_proj[:, u:2 * u])
+            candidate = np.tanh(x_proj[:, 2 * u:] + r * h_proj[:, 2 * u:])
+            h[...] = z * h + (1.0 - z) * candidate
+            h_in = h
+
+        out = h_in
+        last = len(self.dense_layers) - 1
+        for i, (kernel, bias) in enumerate(self.dense_layers):
+            out = out @ kernel + bias
+            if i < last:
+                np.maximum(out, 0.0, out=out)
+        out = out - out.max(axis=1, keepdims=True)
+        np.exp(out, out=out)
+        out /= out.sum(axis=1, keepdims=True)
+        return out
+
+    def predict(self, x, verbose=0) -> np.ndarray:
+        """Firma compatible con Keras sobre ventanas (B, T, input_dim) (p. ej. `predict_video`)."""
+        return self.predict_sequence(x)
+
+    def predict_sequence(self, x: np.ndarray) -> np.ndarray:
+        """(B, T, input_dim) → probabilidades del último paso (B, num_classes)."""
+        x = np.asarray(x, dtype=np.float32)
+        state = self.initial_state(x.shape[0])
+        probs = None
+        for t in range(x.shape[1]):
+            probs = self.step(x[:, t], state)
+        return probs
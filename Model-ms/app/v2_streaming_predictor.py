@@ -12,7 +12,6 @@ para minimizar cambios en `main.py`.
 import os
 import sys
 import numpy as np
-from collections import deque
 from typing import Optional
 
 LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
@@ -30,8 +29,83 @@ if _DEPS_PATH not in sys.path:
     sys.path.insert(0, _DEPS_PATH)
 
 from features_v2 import (
-    normalize_frame, add_velocity_features, has_hand, TOTAL_SIZE,
+    normalize_sequence, add_velocity_features, hand_presence_mask, TOTAL_SIZE,
 )
+from video_landmarks import extract_coords, extract_video_landmarks, video_debug_info
+
+
+class SequenceRing:
+    """
+    Ventana deslizante de features V2 (T, 2*226) preasignada.
+
+    Cada frame se normaliza UNA vez al llegar y su fila de velocidad se calcula
+    contra el frame anterior, así el costo por frame no crece con T. `window()`
+    arma la ventana en orden cronológico con dos copias de slices (sin loops
+    por frame) y pone en cero la velocidad de la primera fila, igual que
+    `add_velocity_features` sobre la secuencia completa.
+    """
+
+    def __init__(self, length: int, frame_dim: int = TOTAL_SIZE):
+        self.length = length
+        self.frame_dim = frame_dim
+        self.data = np.zeros((length, 2 * frame_dim), dtype=np.float32)
+        self.hand_mask = np.zeros(length, dtype=bool)
+        self._window = np.empty_like(self.data)
+        self._prev = np.zeros(frame_dim, dtype=np.float32)  # último frame normalizado
+        self.head = 0    # próxima fila a escribir (= fila más vieja si está lleno)
+        self.count = 0
+        self.hand_count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self):
+        self.hand_mask[:] = False
+        self.head = 0
+        self.count = 0
+        self.hand_count = 0
+
+    def append(self, coords: np.ndarray):
+        """Normaliza `coords` (226,) y lo escribe sobre la fila más vieja."""
+        self.extend(coords[np.newaxis])
+
+    def extend(self, frames: np.ndarray):
+        """Agrega K frames (K, 226) de una vez: normalización, velocidades y
+        máscara de manos se calculan con los kernels de secuencia de `features_v2`."""
+        norm = normalize_sequence(frames)
+        prev = self._prev if self.count else norm[0]
+        velocity = np.diff(norm, axis=0, prepend=prev[np.newaxis])
+        hands = hand_presence_mask(frames)
+        self._prev[:] = norm[-1]
+
+        # Solo las últimas `length` filas sobreviven en el ring
+        keep = min(len(frames), self.length)
+        rows = (self.head + len(frames) - keep + np.arange(keep)) % self.length
+        self.data[rows, :self.frame_dim] = norm[-keep:]
+        self.data[rows, self.frame_dim:] = velocity[-keep:]
+        self.hand_mask[rows] = hands[-keep:]
+
+        self.head = (self.head + len(frames)) % self.length
+        self.count = min(self.count + len(frames), self.length)
+        self.hand_count = int(self.hand_mask.sum())
+
+    def latest(self) -> np.ndarray:
+        """Fila (2*226,) del último frame agregado (normalizado + velocidad). Es un view."""
+        return self.data[(self.head - 1) % self.length]
+
+    def window(self) -> np.ndarray:
+        """Secuencia (count, 2*226) en orden cronológico. Se reutiliza entre llamadas."""
+        if self.count < self.length:
+            out = self._window[:self.count]
+            out[:] = self.data[:self.count]
+        else:
+            out = self._window
+            tail = self.length - self.head
+            out[:tail] = self.data[self.head:]
+            out[tail:] = self.data[:self.head]
+        if self.count:
+            out[0, self.frame_dim:] = 0.0
+        return out
 
 
 class V2StreamingPredictor:
@@ -45,7 +119,7 @@ class V2StreamingPredictor:
             # result["status"] ∈ {"waiting", "no_sign", "ok", "error_shape", "error"}
     """
 
-    def __init__(self, model, config: dict):
+    def __init__(self, model, config: dict, hop_size: int = 1):
         self.model = model
         self.config = config
         info = config["model_info"]
@@ -54,92 +128,135 @@ class V2StreamingPredictor:
         self.classes = config["classes"]
         self.num_classes = info["num_classes"]
 
-        # Buffer rotativo de coords crudas (226 por frame)
-        self.buffer = deque(maxlen=self.frames_per_sequence)
+        # Buffer rotativo de features ya normalizadas + velocidades (30, 452)
+        self.buffer = SequenceRing(self.frames_per_sequence)
         # Umbral: porcentaje del buffer que debe tener manos para predecir
         self.hand_ratio_threshold = 0.5
 
+        # Stride de predicción: con buffer listo, el BiGRU corre cada `hop_size`
+        # frames (o al cruzar el umbral de manos); en medio se reutiliza el último
+        # resultado y `result_age` indica cuántos frames tiene.
+        self.hop_size = max(1, int(hop_size))
+        self._last_pred = None
+        self._frames_since_prediction = 0
+        self._pending_result = None
+
     def add_frame(self, coords: np.ndarray):
-        """Agrega un frame al buffer interno."""
+        """Agrega un frame al buffer interno (se normaliza una sola vez, aquí)."""
         if coords is not None and coords.shape[-1] == TOTAL_SIZE:
-            self.buffer.append(coords.astype(np.float32))
+            self.buffer.append(np.asarray(coords, dtype=np.float32))
+            self._frames_since_prediction += 1
+
+    def add_frames(self, frames: np.ndarray):
+        """Agrega K frames (K, 226) al buffer en una sola pasada vectorizada."""
+        if len(frames) and frames.shape[-1] == TOTAL_SIZE:
+            self.buffer.extend(np.asarray(frames, dtype=np.float32))
+            self._frames_since_prediction += len(frames)
 
     def clear_buffer(self):
         """Limpia el buffer (útil entre videos o al reiniciar sesión)."""
         self.buffer.clear()
+        self._last_pred = None
+        self._frames_since_prediction = 0
 
     def is_buffer_ready(self) -> bool:
         """True si el buffer está lleno Y la mitad o más tienen manos visibles."""
         if len(self.buffer) < self.frames_per_sequence:
             return False
-        hands = sum(1 for f in self.buffer if has_hand(f))
-        return hands / self.frames_per_sequence >= self.hand_ratio_threshold
+        return self.buffer.hand_count / self.frames_per_sequence >= self.hand_ratio_threshold
 
-    def predict_from_coords(self, coords_list: list, include_probabilities: bool = False) -> dict:
+    def predict_from_coords(self, coords_list, include_probabilities: bool = False) -> dict:
         """
-        Recibe UN frame (226 coords). Lo agrega al buffer y predice si está listo.
+        Recibe UN frame (226 coords, lista o np.ndarray). Lo agrega al buffer y predice si está listo.
 
         Status codes:
           - "waiting"     → buffer llenándose (primeros frames de la sesión)
           - "no_sign"     → buffer lleno pero sin manos visibles
           - "ok"          → predicción válida sobre los últimos 30 frames
+                            (`result_age` = frames desde la última inferencia; 0 = fresca)
           - "error_shape" → coords no tiene 226 elementos
           - "error"       → excepción durante la inferencia
         """
         try:
-            if len(coords_list) != TOTAL_SIZE:
-                return {
-                    "word": None,
-                    "confidence": 0.0,
-                    "status": "error_shape",
-                }
-
-            coords = np.array(coords_list, dtype=np.float32)
-            self.add_frame(coords)
-
-            # Buffer aún llenándose
-            if len(self.buffer) < self.frames_per_sequence:
-                return {
-                    "word": None,
-                    "confidence": 0.0,
-                    "status": "waiting",
-                    "buffer_progress": len(self.buffer),
-                    "buffer_size": self.frames_per_sequence,
-                }
-
-            # Buffer lleno pero sin manos suficientes
-            if not self.is_buffer_ready():
-                return {
-                    "word": None,
-                    "confidence": 0.0,
-                    "status": "no_sign",
-                }
-
-            # Procesar la secuencia: normalizar + velocidades
-            raw_seq = np.array(list(self.buffer))
-            norm_seq = np.array([normalize_frame(f) for f in raw_seq], dtype=np.float32)
-            full_seq = add_velocity_features(norm_seq)  # (30, 452)
-
-            # Predecir
-            pred = self.model.predict(np.expand_dims(full_seq, 0), verbose=0)[0]
-            top_idx = int(np.argmax(pred))
-            confidence = float(pred[top_idx])
-            word = self.classes.get(str(top_idx), f"Clase_{top_idx}")
-
-            result = {
-                "word": word,
-                "confidence": confidence,
-                "class_idx": top_idx,
-                "status": "ok",
-            }
-            if include_probabilities:
-                result["probabilities"] = pred.tolist()
-            return result
+            early, needs_inference = self._advance(coords_list)
+            if early is not None:
+                return early
+
+            if needs_inference:
+                # Ventana ya normalizada y con velocidades (30, 452)
+                full_seq = self.buffer.window()
+                self._store_prediction(self.model.predict(np.expand_dims(full_seq, 0), verbose=0)[0])
+
+            return self._ok_result(include_probabilities)
 
         except Exception as e:
             log(f"[ERROR V2] predict_from_coords falló: {e}")
             return {"word": None, "confidence": 0.0, "status": "error"}
 
+    def predict_window(self, include_probabilities: bool = False) -> dict:
+        """Infiere sobre la ventana actual sin agregar frames (el buffer debe estar listo)."""
+        self._store_prediction(self.model.predict(self.buffer.window()[np.newaxis], verbose=0)[0])
+        return self._ok_result(include_probabilities)
+
+    def _advance(self, coords_list):
+        """
+        Agrega el frame al buffer. Retorna `(resultado, necesita_inferencia)`:
+        `resultado` es el dict final si no hay nada que predecir (waiting,
+        no_sign, error_shape) o None si el buffer está listo.
+        """
+        if len(coords_list) != TOTAL_SIZE:
+            return {
+                "word": None,
+                "confidence": 0.0,
+                "status": "error_shape",
+            }, False
+
+        coords = np.asarray(coords_list, dtype=np.float32)
+        self.add_frame(coords)
+
+        # Buffer aún llenándose
+        if len(self.buffer) < self.frames_per_sequence:
+            return {
+                "word": None,
+                "confidence": 0.0,
+                "status": "waiting",
+                "buffer_progress": len(self.buffer),
+                "buffer_size": self.frames_per_sequence,
+            }, False
+
+        # Buffer lleno pero sin manos suficientes
+        if not self.is_buffer_ready():
+            self._last_pred = None  # al volver a cruzar el umbral se predice de inmediato
+            return {
+                "word": None,
+                "confidence": 0.0,
+                "status": "no_sign",
+            }, False
+
+        return None, self._last_pred is None or self._frames_since_prediction >= self.hop_size
+
+    def _store_prediction(self, pred: np.ndarray):
+        self._last_pred = pred
+        self._frames_since_prediction = 0
+
+    def _ok_result(self, include_probabilities: bool = False) -> dict:
+        """Resultado "ok" a partir de la última inferencia guardada."""
+        pred = self._last_pred
+        top_idx = int(np.argmax(pred))
+        confidence = float(pred[top_idx])
+        word = self.classes.get(str(top_idx), f"Clase_{top_idx}")
+
+        result = {
+            "word": word,
+            "confidence": confidence,
+            "class_idx": top_idx,
+            "status": "ok",
+            "result_age": self._frames_since_prediction,
+        }
+        if include_probabilities:
+            result["probabilities"] = pred.tolist()
+        return result
+
     def predict_landmarks(self, coords_list: list) -> dict:
         """Alias para compatibilidad con código V1."""
         return self.predict_from_coords(coords_list)
@@ -157,8 +274,31 @@ class V2StreamingPredictor:
         Recibe un array/list de 226 floats. Devuelve dict con el mismo schema
         que V1 (con campos de contexto en None porque V2 Fase 1 no los usa).
         """
-        coords_list = landmarks.tolist() if hasattr(landmarks, 'tolist') else list(landmarks)
-        result = self.predict_from_coords(coords_list)
+        return self._compat_result(self.predict_from_coords(landmarks))
+
+    def prepare_landmarks(self, landmarks):
+        """
+        Paso 1 de la inferencia en batch entre sesiones (ver `main.py`).
+
+        Agrega el frame y retorna la ventana (1, 30, 452) si toca inferir, o
+        None si el resultado no necesita forward pass. Las probabilidades del
+        batch compartido se entregan luego a `complete_landmarks`.
+        """
+        early, needs_inference = self._advance(landmarks)
+        self._pending_result = early
+        if needs_inference:
+            return self.buffer.window()[np.newaxis].copy()
+        return None
+
+    def complete_landmarks(self, probabilities=None) -> dict:
+        """Paso 2: arma el resultado V1-compat con las probabilidades (1, clases) del batch."""
+        if probabilities is not None:
+            self._store_prediction(np.asarray(probabilities)[0])
+        result = self._pending_result or self._ok_result()
+        self._pending_result = None
+        return self._compat_result(result)
+
+    def _compat_result(self, result: dict) -> dict:
         buffer_fill = len(self.buffer) / self.frames_per_sequence
 
         return {
@@ -166,6 +306,7 @@ class V2StreamingPredictor:
             "confidence": float(result.get("confidence", 0.0)),
             "buffer_fill": float(buffer_fill),
             "status": result["status"],
+            "result_age": result.get("result_age"),
             # Campos V1 que no aplican en V2 Fase 1
             "current_context": None,
             "last_accepted_word": None,
@@ -173,6 +314,24 @@ class V2StreamingPredictor:
             "distance_alert": None,
         }
 
+    def add_landmarks_batch(self, frames) -> list:
+        """
+        Procesa K frames consecutivos (K, 226) de la misma sesión.
+
+        Los K-1 primeros solo entran al buffer; la inferencia se hace una
+        única vez sobre la ventana que queda tras el último frame. Retorna una
+        lista con el resultado de ese último frame.
+        """
+        frames = np.asarray(frames, dtype=np.float32)
+        if frames.ndim != 2 or frames.shape[0] == 0:
+            return [{
+                "word": None, "confidence": 0.0, "buffer_fill": 0.0, "status": "error_shape",
+                "current_context": None, "last_accepted_word": None,
+                "context_changed": False, "distance_alert": None,
+            }]
+        self.add_frames(frames[:-1])
+        return [self.add_landmarks(frames[-1])]
+
     def reset_buffer(self):
         """Alias V1-compat de clear_buffer."""
         self.clear_buffer()
@@ -185,7 +344,9 @@ class V2StreamingPredictor:
         """Stub V1-compat — V2 no usa contexto en Fase 1."""
         pass
 
-    def predict_video(self, video_path: str, min_confidence: float = 0.15) -> Optional[str]:
+    def predict_video(self, video_path: str, min_confidence: float = 0.15,
+                      on_progress=None, debug: Optional[dict] = None,
+                      content_hash: Optional[str] = None) -> Optional[str]:
         """
         Predice una palabra desde un video completo.
 
@@ -195,67 +356,26 @@ class V2StreamingPredictor:
 
         El buffer rotativo se usa solo en streaming en vivo (donde no sabes
         cuándo termina la seña).
-        """
-        import cv2
-        import mediapipe as mp
 
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            log(f"[ERROR V2] No se pudo abrir el video: {video_path}")
+        `on_progress(frames_decoded, frames_total)` reporta el avance de MediaPipe;
+        si se pasa `debug`, se completa con las estadísticas de extracción.
+        `content_hash` (SHA-256 del video) habilita el store de landmarks.
+        """
+        extracted = self._extract_video_landmarks(video_path, on_progress, debug, content_hash)
+        if extracted is None:
             return None
+        raw_frames_np, _ = extracted
 
-        raw_frames = []
-        frames_processed = 0
-        frames_with_hands = 0
-
-        mp_holistic = mp.solutions.holistic
-        holistic = mp_holistic.Holistic(
-            static_image_mode=False,
-            model_complexity=1,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
-
-        try:
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    break
-
-                frames_processed += 1
-
-                image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = holistic.process(image_rgb)
-
-                # Lógica de espejo: si detecta solo mano derecha, espeja para
-                # mantener consistencia con el entrenamiento.
-                if results.right_hand_landmarks and not results.left_hand_landmarks:
-                    frame = cv2.flip(frame, 1)
-                    image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    results = holistic.process(image_rgb)
-
-                if (results.pose_landmarks
-                        or results.right_hand_landmarks
-                        or results.left_hand_landmarks):
-                    frames_with_hands += 1
-                    coords = self._extract_coords(results)
-                    raw_frames.append(coords.astype(np.float32))
-        finally:
-            cap.release()
-
-        log(f"[V2 video] {frames_processed} frames, {frames_with_hands} con manos detectadas")
-
-        if len(raw_frames) < 5:
+        if len(raw_frames_np) < 5:
             log("[V2 video] Muy pocos frames válidos para predecir")
             return None
 
         # Muestrear 30 frames UNIFORMEMENTE del video entero (igual que en training)
-        raw_frames_np = np.array(raw_frames)
         indices = np.linspace(0, len(raw_frames_np) - 1, self.frames_per_sequence, dtype=int)
         sequence = raw_frames_np[indices]  # (30, 226)
 
         # Procesar igual que training: normalize + velocidades
-        norm_seq = np.array([normalize_frame(f) for f in sequence], dtype=np.float32)
+        norm_seq = normalize_sequence(sequence.astype(np.float32))
         full_seq = add_velocity_features(norm_seq)  # (30, 452)
 
         # Predicción única sobre la secuencia completa
@@ -275,28 +395,211 @@ class V2StreamingPredictor:
             return None
         return word
 
+    def segment_video(self, video_path: str, stride: int = 5, min_confidence: float = 0.5,
+                      min_windows: int = 1, content_hash: Optional[str] = None) -> Optional[dict]:
+        """
+        Reconoce VARIAS señas en un video largo (ver `segment_sequence`).
+        Retorna None si el video no se pudo abrir.
+        """
+        debug = {}
+        extracted = self._extract_video_landmarks(video_path, debug=debug, content_hash=content_hash)
+        if extracted is None:
+            return None
+        raw_frames, timestamps = extracted
+        result = self.segment_sequence(raw_frames, timestamps, stride=stride,
+                                       min_confidence=min_confidence, min_windows=min_windows)
+        result["debug"] = debug
+        words = ", ".join(f"{s['word']}@{s['start_s']:.2f}s" for s in result["signs"])
+        log(f"[V2 segment] {result['windows']} ventanas → {len(result['signs'])} señas: {words}")
+        return result
+
+    def segment_sequence(self, raw_frames: np.ndarray, timestamps: Optional[np.ndarray] = None,
+                         stride: int = 5, min_confidence: float = 0.5, min_windows: int = 1,
+                         batch_size: int = 64) -> dict:
+        """
+        Segmentación continua de una secuencia de landmarks (T, 226).
+
+        - Normaliza y calcula velocidades de TODA la secuencia una sola vez.
+        - Corta todas las ventanas de 30 frames con paso `stride` (la velocidad
+          del primer frame de cada ventana va en cero, igual que en training).
+        - Descarta ventanas sin manos suficientes y clasifica el resto en
+          batches de `batch_size`.
+        - Fusiona ventanas consecutivas con la misma palabra (confianza >=
+          `min_confidence`) en una seña con tiempos de inicio/fin; las señas
+          con menos de `min_windows` ventanas se descartan.
+
+        Si la secuencia es más corta que la ventana, se clasifica una única
+        ventana muestreada uniformemente (como `predict_video`).
+        """
+        raw_frames = np.asarray(raw_frames, dtype=np.float32).reshape(-1, TOTAL_SIZE)
+        frames_total = total = len(raw_frames)
+        if timestamps is None:
+            timestamps = np.arange(total, dtype=np.float64) / 30.0
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        window_len = self.frames_per_sequence
+        stride = max(1, int(stride))
+        empty = {"status": "no_sign", "frames_total": frames_total, "windows": 0, "signs": []}
+        if total == 0:
+            return empty
+
+        if total < window_len:
+            indices = np.linspace(0, total - 1, window_len, dtype=int)
+            raw_frames, timestamps = raw_frames[indices], timestamps[indices]
+            frame_index = indices
+            total = window_len
+        else:
+            frame_index = np.arange(total)
+
+        norm = normalize_sequence(raw_frames)
+        features = add_velocity_features(norm)  # (T, 452)
+        starts = np.arange(0, total - window_len + 1, stride)
+        if starts[-1] != total - window_len:
+            starts = np.append(starts, total - window_len)  # cubrir el final del video
+
+        # Ventanas con suficientes manos (suma acumulada de la máscara → O(T))
+        hands = np.concatenate([[0], np.cumsum(hand_presence_mask(raw_frames))])
+        hand_ratio = (hands[starts + window_len] - hands[starts]) / window_len
+        starts = starts[hand_ratio >= self.hand_ratio_threshold]
+        if len(starts) == 0:
+            return empty
+
+        windows = np.lib.stride_tricks.sliding_window_view(features, window_len, axis=0)
+        windows = np.ascontiguousarray(windows[starts].transpose(0, 2, 1))  # (B, 30, 452)
+        windows[:, 0, TOTAL_SIZE:] = 0.0
+
+        probs = np.concatenate([
+            self.model.predict(windows[i:i + batch_size], verbose=0)
+            for i in range(0, len(windows), batch_size)
+        ])
+        top_idx = probs.argmax(axis=1)
+        confidence = probs[np.arange(len(probs)), top_idx]
+
+        signs = []
+        prev_start = None
+        for start, idx, conf in zip(starts, top_idx, confidence):
+            if conf < min_confidence:
+                prev_start = None
+                continue
+            end = start + window_len - 1
+            word = self.classes.get(str(int(idx)), f"Clase_{int(idx)}")
+            last = signs[-1] if signs else None
+            # Misma palabra en la ventana accesible anterior → extender la seña
+            if last is not None and last["word"] == word and prev_start is not None \
+                    and start - prev_start <= stride:
+                last["end"] = end
+                last["windows"] += 1
+                last["confidence"] = max(last["confidence"], float(conf))
+            else:
+                signs.append({"word": word, "confidence": float(conf), "start": start, "end": end, "windows": 1})
+            prev_start = start
+
+        signs = [s for s in signs if s["windows"] >= min_windows]
+        for sign in signs:
+            start, end = sign.pop("start"), sign.pop("end")
+            sign["start_frame"] = int(frame_index[start])
+            sign["end_frame"] = int(frame_index[end])
+            sign["start_s"] = float(timestamps[start])
+            sign["end_s"] = float(timestamps[end])
+
+        return {
+            "status": "ok" if signs else "no_sign",
+            "frames_total": frames_total,
+            "windows": len(starts),
+            "signs": signs,
+        }
+
+    def _extract_video_landmarks(self, video_path: str, on_progress=None, debug: Optional[dict] = None,
+                                 content_hash: Optional[str] = None):
+        """
+        Corre MediaPipe (pool compartido) sobre todo el video, o toma los
+        landmarks del store si `content_hash` ya se procesó. Retorna
+        `(frames (N, 226) float32, timestamps (N,) en segundos)` con solo los
+        frames donde hubo detección, o None si el video no se pudo abrir.
+        """
+        extracted = extract_video_landmarks(video_path, on_progress=on_progress,
+                                            content_hash=content_hash)
+        if extracted is None:
+            return None
+        if debug is not None:
+            debug.update(video_debug_info(extracted))
+        log(f"[V2 video] {extracted['frames_processed']}/{extracted['frames_decoded']} frames "
+            f"(~{extracted['estimated_speedup']:.1f}x), "
+            f"{extracted['frames_with_hands']} con manos detectadas")
+        return extracted["frames"], extracted["timestamps"]
+
     def _extract_coords(self, results) -> np.ndarray:
         """Extrae coords (226,) de un resultado MediaPipe. Mismo layout que V1."""
-        if results.pose_landmarks:
-            pose = np.array(
-                [[lm.x, lm.y, lm.z, lm.visibility]
-                 for lm in results.pose_landmarks.landmark[:25]]
-            ).flatten()
-        else:
-            pose = np.zeros(100)
+        return extract_coords(results)
 
-        if results.right_hand_landmarks:
-            rh = np.array(
-                [[lm.x, lm.y, lm.z] for lm in results.right_hand_landmarks.landmark]
-            ).flatten()
-        else:
-            rh = np.zeros(63)
 
-        if results.left_hand_landmarks:
-            lh = np.array(
-                [[lm.x, lm.y, lm.z] for lm in results.left_hand_landmarks.landmark]
-            ).flatten()
-        else:
-            lh = np.zeros(63)
+class StatefulV2StreamingPredictor(V2StreamingPredictor):
+    """
+    Variante de streaming O(1) por frame para la GRU forward-only
+    (`build_streaming_model_v2` + `NumpyStatefulGRUModel`).
+
+    En lugar de reclasificar la ventana de 30 frames, cada frame avanza un
+    paso de la GRU llevando el estado oculto de la sesión. El buffer se
+    mantiene solo para calcular velocidades y la proporción de manos (mismos
+    status que `V2StreamingPredictor`). Cuando no queda ninguna mano en la
+    ventana el estado se reinicia y no se calcula nada hasta la siguiente seña.
+
+    Horizonte acotado: el modelo se entrena con ventanas de
+    `frames_per_sequence` frames que arrancan con estado cero, así que un
+    estado que acumula una seña larga sale de esa distribución. Se llevan
+    dos estados desfasados media ventana; cada uno se reinicia cada
+    `frames_per_sequence` frames y se predice con el que lleva más frames.
+    La GRU siempre ve entre media y una ventana completa de contexto, a
+    costo de dos pasos por frame.
+    """
+
+    def __init__(self, model, config: dict):
+        super().__init__(model, config, hop_size=1)
+        self.horizon = self.frames_per_sequence
+        self._offsets = (0, self.horizon // 2)
+        self.states = [model.initial_state(1) for _ in self._offsets]
+        self.frames_in_sign = 0  # frames desde el último reinicio por falta de manos
+
+    def _reset_state(self):
+        self.frames_in_sign = 0
+        for state in self.states:
+            for h in state:
+                h.fill(0.0)
+
+    def _step(self, x: np.ndarray) -> np.ndarray:
+        """Avanza ambos estados (reiniciando el que completa su horizonte) y predice con el más largo."""
+        n = self.frames_in_sign
+        best, best_age = None, -1
+        for offset, state in zip(self._offsets, self.states):
+            if n < offset:
+                continue
+            age = (n - offset) % self.horizon  # frames ya acumulados en este estado
+            if age == 0:
+                for h in state:
+                    h.fill(0.0)
+            probs = self.model.step(x, state)
+            if age > best_age:
+                best, best_age = probs, age
+        self.frames_in_sign += 1
+        return best
 
-        return np.concatenate([pose, rh, lh])
+    def add_frame(self, coords: np.ndarray):
+        if coords is None or coords.shape[-1] != TOTAL_SIZE:
+            return
+        super().add_frame(coords)
+        if self.buffer.hand_count == 0:
+            self._reset_state()
+            return
+        self._store_prediction(self._step(self.buffer.latest()[np.newaxis])[0])
+
+    def add_frames(self, frames: np.ndarray):
+        # Cada frame debe avanzar la GRU en orden
+        for frame in np.asarray(frames, dtype=np.float32):
+            self.add_frame(frame)
+
+    def _advance(self, coords_list):
+        early, _ = super()._advance(coords_list)
+        return early, False  # el paso de la GRU ya se hizo en `add_frame`
+
+    def clear_buffer(self):
+        super().clear_buffer()
+        self._reset_state()
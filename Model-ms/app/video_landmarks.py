@@ -0,0 +1,462 @@
+"""
+Extracción de landmarks (T, 226) de un video completo, común a V1 y V2.
+
+Ambos `predict_video` repetían el mismo loop (MediaPipe por frame, espejo
+si solo aparece la mano derecha, extracción de coords). Aquí vive una sola
+vez y usa una instancia Holistic del pool compartido (`holistic_pool.py`).
+
+Espejo (`VIDEO_MIRROR_MODE`):
+  - "numeric" (default): se espeja el vector (226,) ya extraído con el
+    mismo kernel que el streaming V1 (x → 1 - x, pares izq↔der de pose y
+    manos intercambiadas). MediaPipe corre una sola vez por frame.
+  - "redetect": comportamiento original, `cv2.flip` del frame y segunda
+    pasada de Holistic.
+
+Decodificación: un archivo se lee con `cv2.VideoCapture`; un FIFO (upload
+que todavía está llegando, ver `video_stream.py`) se decodifica con un
+subproceso ffmpeg que emite yuv4mpegpipe por stdout.
+
+Cada extracción se guarda en el store de landmarks (`landmark_store.py`)
+bajo el SHA-256 del video: reprocesar el mismo video (otro motor, modelo
+nuevo, /predict/segments después de /predict) no vuelve a correr MediaPipe.
+"""
+import os
+import queue
+import re
+import stat
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from holistic_pool import HOLISTIC_MODEL_COMPLEXITY, get_holistic_pool
+from landmark_store import get_landmark_store, landmark_key
+from result_cache import sha256_file
+
+_MODEL_V2_DEPS = os.path.join(os.path.dirname(__file__), "Modelo-V2-Full-Augmented-EXPORT", "dependencies")
+if _MODEL_V2_DEPS not in sys.path:
+    sys.path.insert(0, _MODEL_V2_DEPS)
+
+from features_v2 import MirrorKernel
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+# Cada cuántos frames se reporta avance a `on_progress` (jobs asíncronos)
+VIDEO_PROGRESS_EVERY = int(os.getenv("VIDEO_PROGRESS_EVERY", "15"))
+
+VIDEO_MIRROR_MODE = os.getenv("VIDEO_MIRROR_MODE", "numeric").lower()
+
+# Preprocesamiento antes de MediaPipe: fps objetivo (0 = todos los frames) y
+# lado mayor máximo en píxeles (0 = resolución nativa)
+VIDEO_TARGET_FPS = float(os.getenv("VIDEO_TARGET_FPS", "30"))
+VIDEO_MAX_EDGE = int(os.getenv("VIDEO_MAX_EDGE", "640"))
+
+# Versión de la extracción dentro de la clave del store de landmarks: subirla
+# cuando cambian los vectores para los mismos parámetros (2: partes ausentes
+# quedan en cero en el espejo numérico)
+LANDMARK_EXTRACTION_VERSION = 2
+
+# Coords de imagen en [0, 1]: equivale a extraer landmarks del frame volteado
+_MIRROR_IMAGE = MirrorKernel(x_offset=1.0)
+
+
+def extract_coords(results) -> np.ndarray:
+    """Coords (226,) de un resultado Holistic: pose 25×4 + mano der. 21×3 + mano izq. 21×3."""
+    if results.pose_landmarks:
+        pose = np.array(
+            [[lm.x, lm.y, lm.z, lm.visibility] for lm in results.pose_landmarks.landmark[:25]]
+        ).flatten()
+    else:
+        pose = np.zeros(100)
+
+    if results.right_hand_landmarks:
+        rh = np.array([[lm.x, lm.y, lm.z] for lm in results.right_hand_landmarks.landmark]).flatten()
+    else:
+        rh = np.zeros(63)
+
+    if results.left_hand_landmarks:
+        lh = np.array([[lm.x, lm.y, lm.z] for lm in results.left_hand_landmarks.landmark]).flatten()
+    else:
+        lh = np.zeros(63)
+
+    return np.concatenate([pose, rh, lh])
+
+
+# (slot de origen, slot de destino) de cada parte tras el espejo: las manos se intercambian
+_MIRROR_PARTS = (
+    (slice(0, 100), slice(0, 100)),
+    (slice(100, 163), slice(163, 226)),
+    (slice(163, 226), slice(100, 163)),
+)
+
+
+def mirror_image_coords(coords: np.ndarray) -> np.ndarray:
+    """
+    Coords (226,) o (N, 226) del frame espejado, sin volver a correr MediaPipe.
+
+    Una parte ausente (todo cero) sigue en cero en su nuevo slot, igual que
+    si MediaPipe no la detectara en el frame volteado (`1 - x` la dejaría en x = 1).
+    """
+    coords = np.asarray(coords, dtype=np.float32)
+    out = _MIRROR_IMAGE(coords)
+    for src, dst in _MIRROR_PARTS:
+        absent = ~np.any(coords[..., src] != 0, axis=-1)
+        out[..., dst][absent] = 0.0
+    return out
+
+
+class FrameDecimator:
+    """
+    Elige frames por timestamp para acercarse a `target_fps`.
+
+    Se conserva un frame cuando su timestamp alcanza el próximo instante
+    programado (cada 1/target_fps s). Con fps variable o timestamps con
+    saltos la cadencia se mantiene en tiempo real, no en número de frames.
+    `target_fps <= 0` conserva todos.
+    """
+
+    def __init__(self, target_fps: float):
+        self.period = 1.0 / target_fps if target_fps > 0 else 0.0
+        self._next_t = None
+
+    def keep(self, t: float) -> bool:
+        if self.period == 0.0:
+            return True
+        # Tolerancia de medio ms para timestamps redondeados por el contenedor
+        if self._next_t is not None and t + 5e-4 < self._next_t:
+            return False
+        scheduled = t if self._next_t is None else self._next_t
+        # Si hubo un hueco mayor a un período, reprogramar desde t
+        self._next_t = scheduled + self.period if scheduled + self.period > t else t + self.period
+        return True
+
+
+def scaled_size(width: int, height: int, max_edge: int) -> Tuple[int, int]:
+    """(ancho, alto) con el lado mayor <= `max_edge`, manteniendo la proporción."""
+    longest = max(width, height)
+    if max_edge <= 0 or longest <= max_edge:
+        return width, height
+    scale = max_edge / longest
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def video_debug_info(extracted: dict) -> dict:
+    """Estadísticas de extracción (sin los arrays) para el campo `debug` de las respuestas."""
+    return {key: value for key, value in extracted.items() if not isinstance(value, np.ndarray)}
+
+
+class VideoUnreadable(Exception):
+    """El video no se pudo abrir/decodificar."""
+
+
+def _cv2_frames(video_path: str, keep, max_edge: int, info: dict, on_progress=None):
+    """
+    Frames RGB (t, imagen) elegidos por `keep(t)`, decodificados con OpenCV.
+    Solo los elegidos se pasan a BGR (`retrieve`) y se reducen antes de cvtColor.
+    """
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise VideoUnreadable(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frames_total = max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0))
+        info.update(fps=float(fps), decoder="cv2")
+        while cap.isOpened():
+            if not cap.grab():
+                break
+
+            info["frames_decoded"] += 1
+            decoded = info["frames_decoded"]
+            if on_progress is not None and decoded % VIDEO_PROGRESS_EVERY == 0:
+                on_progress(decoded, max(frames_total, decoded))
+
+            # Timestamp del contenedor; si no lo informa, índice / fps
+            pos_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            t = pos_ms / 1000.0 if pos_ms and pos_ms > 0 else (decoded - 1) / fps
+            if not keep(t):
+                continue
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+
+            height, width = frame.shape[:2]
+            info["source_size"] = (width, height)
+            info["processed_size"] = scaled_size(width, height, max_edge)
+            if info["processed_size"] != info["source_size"]:
+                frame = cv2.resize(frame, info["processed_size"], interpolation=cv2.INTER_AREA)
+            yield t, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    finally:
+        cap.release()
+
+
+_SHOWINFO_PTS = re.compile(r"\bn:\s*\d+.*\bpts_time:(\S+)")
+_STREAM_SIZE = re.compile(r"Stream #.*Video:.*?\b(\d{2,5})x(\d{2,5})\b")
+
+
+def _ffmpeg_command(source: str, max_edge: int):
+    filters = []
+    if max_edge > 0:
+        # Lado mayor <= max_edge, proporción intacta, dimensiones pares (yuv420p)
+        filters.append(
+            f"scale=w='if(gte(iw,ih),trunc(min({max_edge},iw)/2)*2,-2)'"
+            f":h='if(gte(iw,ih),-2,trunc(min({max_edge},ih)/2)*2)'"
+        )
+    # showinfo imprime el pts_time de cada frame por stderr: yuv4mpegpipe no los transporta
+    filters.append("showinfo")
+    return [
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "info",
+        "-i", source, "-an", "-sn",
+        "-vf", ",".join(filters), "-vsync", "passthrough",
+        "-pix_fmt", "yuv420p", "-f", "yuv4mpegpipe", "pipe:1",
+    ]
+
+
+def _ffmpeg_frames(source: str, keep, max_edge: int, info: dict, on_progress=None):
+    """
+    Frames RGB (t, imagen) de un subproceso ffmpeg (sirve para FIFOs: no necesita seek).
+    El escalado lo hace ffmpeg; memoria acotada a un frame más los buffers del pipe.
+    """
+    import cv2
+
+    proc = subprocess.Popen(_ffmpeg_command(source, max_edge),
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=1 << 20)
+    pts = queue.Queue()
+    stderr_tail = []
+    found = {}
+
+    def read_stderr():
+        for raw in proc.stderr:
+            line = raw.decode("utf-8", "replace")
+            match = _SHOWINFO_PTS.search(line)
+            if match:
+                try:
+                    pts.put(float(match.group(1)))
+                except ValueError:
+                    pts.put(None)  # NOPTS
+                continue
+            # El primer "Stream #..: Video: ... WxH" es el de entrada (resolución original)
+            size = _STREAM_SIZE.search(line) if "source_size" not in found else None
+            if size:
+                found["source_size"] = (int(size.group(1)), int(size.group(2)))
+            if "showinfo" not in line:
+                stderr_tail.append(line.rstrip())
+                del stderr_tail[:-20]
+        pts.put(None)
+
+    reader = threading.Thread(target=read_stderr, name="ffmpeg-stderr", daemon=True)
+    reader.start()
+    try:
+        header = proc.stdout.readline()
+        if not header.startswith(b"YUV4MPEG2"):
+            proc.wait()
+            reader.join(timeout=1.0)
+            raise VideoUnreadable("ffmpeg: " + " | ".join(stderr_tail[-3:]))
+        # "YUV4MPEG2 W640 H360 F30000:1001 Ip A1:1 C420jpeg": un parámetro por token
+        params = {token[:1]: token[1:] for token in header.split()[1:]}
+        width, height = int(params[b"W"]), int(params[b"H"])
+        num, _, den = params.get(b"F", b"30:1").partition(b":")
+        fps = (float(num) / float(den or 1)) or 30.0
+        frame_bytes = width * height * 3 // 2
+        info.update(fps=fps, decoder="ffmpeg", processed_size=(width, height))
+
+        while True:
+            marker = proc.stdout.readline()
+            if not marker.startswith(b"FRAME"):
+                break
+            buf = proc.stdout.read(frame_bytes)
+            if len(buf) < frame_bytes:
+                break
+
+            info["frames_decoded"] += 1
+            decoded = info["frames_decoded"]
+            if on_progress is not None and decoded % VIDEO_PROGRESS_EVERY == 0:
+                on_progress(decoded, decoded)
+
+            try:
+                t = pts.get(timeout=5.0)
+            except queue.Empty:
+                t = None
+            if t is None:
+                t = (decoded - 1) / fps
+            if not keep(t):
+                continue
+            yuv = np.frombuffer(buf, dtype=np.uint8).reshape(height * 3 // 2, width)
+            yield t, cv2.cvtColor(yuv, cv2.COLOR_YUV2RGB_I420)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        reader.join(timeout=1.0)
+        info["source_size"] = found.get("source_size", info["processed_size"])
+        if info["frames_decoded"] == 0 and proc.returncode not in (0, None):
+            log(f"[ERROR] ffmpeg ({proc.returncode}): {' | '.join(stderr_tail[-3:])}")
+
+
+def landmark_store_key(content_hash: str, mirror_mode: Optional[str] = None,
+                       target_fps: Optional[float] = None, max_edge: Optional[int] = None) -> str:
+    """Clave del store para un video y los parámetros de extracción (default: los del entorno)."""
+    return landmark_key(
+        content_hash,
+        target_fps=float(VIDEO_TARGET_FPS if target_fps is None else target_fps),
+        max_edge=int(VIDEO_MAX_EDGE if max_edge is None else max_edge),
+        mirror_mode=(mirror_mode or VIDEO_MIRROR_MODE).lower(),
+        model_complexity=HOLISTIC_MODEL_COMPLEXITY,
+        version=LANDMARK_EXTRACTION_VERSION,
+    )
+
+
+def _is_pipe(path: str) -> bool:
+    try:
+        return stat.S_ISFIFO(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def extract_video_landmarks(video_path: str, pool=None,
+                            on_progress: Optional[Callable[[int, int], None]] = None,
+                            mirror_mode: Optional[str] = None,
+                            target_fps: Optional[float] = None,
+                            max_edge: Optional[int] = None,
+                            content_hash: Optional[str] = None,
+                            store=None) -> Optional[dict]:
+    """
+    Corre Holistic sobre el video. Retorna None si no se pudo abrir, o:
+      - "frames": (N, 226) float32, solo frames con alguna detección
+      - "timestamps": (N,) segundos de cada frame
+      - "mirrored": (N,) bool, frames espejados (solo mano derecha detectada)
+      - "fps", "decoder", "frames_decoded", "frames_processed", "frames_with_hands",
+        "mirror_triggers", "mirror_mode"
+      - "decimation_ratio" (procesados / decodificados), tamaños de origen y
+        procesado y "estimated_speedup" (píxeles por MediaPipe vs. sin preprocesar)
+
+    Preprocesamiento: solo los frames que elige `FrameDecimator(target_fps)`
+    llegan a MediaPipe, reducidos a `max_edge` antes de la conversión a RGB.
+    Los landmarks salen normalizados a [0, 1], así que el resize no cambia
+    su escala.
+
+    `video_path` puede ser un FIFO: se decodifica con ffmpeg a medida que
+    llegan los bytes.
+
+    `on_progress(frames_decoded, frames_total)` se llama cada
+    `VIDEO_PROGRESS_EVERY` frames y al terminar (`frames_total` es el conteo
+    del contenedor, o lo decodificado hasta ahora si no se conoce).
+
+    Store de landmarks: con `content_hash` (SHA-256 del video calculado por
+    el servidor, nunca uno enviado por el cliente) se busca antes una
+    extracción guardada con los mismos parámetros; en un hit "frames" es un
+    memmap de solo lectura y se agrega "hand_mask". Un archivo regular sin
+    hash se hashea aquí; un FIFO sin hash no usa el store (el llamador puede
+    pasar una clave provisoria y renombrarla con `LandmarkStore.rename` al
+    terminar el upload). "landmark_cache" indica "hit", "miss" u "off".
+    """
+    mirror_mode = (mirror_mode or VIDEO_MIRROR_MODE).lower()
+    target_fps = VIDEO_TARGET_FPS if target_fps is None else target_fps
+    max_edge = VIDEO_MAX_EDGE if max_edge is None else max_edge
+    store = store or get_landmark_store()
+
+    key = None
+    if store.enabled:
+        if content_hash is None and not _is_pipe(video_path):
+            try:
+                with open(video_path, "rb") as f:
+                    content_hash = sha256_file(f)
+            except OSError:
+                pass
+        if content_hash:
+            key = landmark_store_key(content_hash, mirror_mode, target_fps, max_edge)
+
+    if key is not None:
+        started = time.perf_counter()
+        extracted = store.load(key)
+        if extracted is not None:
+            log(f"[DEBUG] Landmarks desde el store ({content_hash[:12]}): {len(extracted['frames'])} frames")
+            if on_progress is not None:
+                on_progress(extracted["frames_decoded"], extracted["frames_decoded"])
+            extracted["extract_ms"] = (time.perf_counter() - started) * 1000.0
+            extracted["landmark_cache"] = "hit"
+            return extracted
+
+    extracted = _extract_landmarks(video_path, pool, on_progress, mirror_mode, target_fps, max_edge)
+    if extracted is not None and key is not None:
+        store.save(key, extracted)
+    if extracted is not None:
+        extracted["landmark_cache"] = "miss" if key is not None else "off"
+    return extracted
+
+
+def _extract_landmarks(video_path: str, pool, on_progress, mirror_mode: str,
+                       target_fps: float, max_edge: int) -> Optional[dict]:
+    """Decodificación + MediaPipe de `extract_video_landmarks`, sin store."""
+    decimator = FrameDecimator(target_fps)
+    source = _ffmpeg_frames if _is_pipe(video_path) else _cv2_frames
+    info = {"frames_decoded": 0, "source_size": (0, 0), "processed_size": (0, 0)}
+    frames, timestamps, mirrored = [], [], []
+    frames_processed = 0
+    mirror_triggers = 0
+    started = time.perf_counter()
+
+    try:
+        with (pool or get_holistic_pool()).checkout() as holistic:
+            for t, image_rgb in source(video_path, decimator.keep, max_edge, info, on_progress):
+                frames_processed += 1
+                results = holistic.process(image_rgb)
+
+                # Lógica de espejo: si detecta solo mano derecha, espeja para
+                # mantener consistencia con el entrenamiento.
+                mirror = bool(results.right_hand_landmarks and not results.left_hand_landmarks)
+                if mirror:
+                    mirror_triggers += 1
+                    if mirror_mode == "redetect":
+                        results = holistic.process(np.ascontiguousarray(image_rgb[:, ::-1]))
+
+                if results.pose_landmarks or results.right_hand_landmarks or results.left_hand_landmarks:
+                    coords = extract_coords(results).astype(np.float32)
+                    if mirror and mirror_mode != "redetect":
+                        coords = mirror_image_coords(coords)
+                    frames.append(coords)
+                    timestamps.append(t)
+                    mirrored.append(mirror)
+    except VideoUnreadable as e:
+        log(f"[ERROR] No se pudo abrir el video: {e}")
+        return None
+
+    frames_decoded = info["frames_decoded"]
+    if frames_decoded == 0 and source is _ffmpeg_frames:
+        return None
+    if on_progress is not None:
+        on_progress(frames_decoded, frames_decoded)
+
+    source_size, processed_size = info["source_size"], info["processed_size"]
+    source_px = source_size[0] * source_size[1]
+    processed_px = processed_size[0] * processed_size[1]
+    work_ratio = (frames_processed * processed_px) / (frames_decoded * source_px) \
+        if processed_px and source_px and frames_decoded else 1.0
+    return {
+        "frames": np.array(frames, dtype=np.float32).reshape(-1, 226),
+        "timestamps": np.array(timestamps, dtype=np.float64),
+        "mirrored": np.array(mirrored, dtype=bool),
+        "fps": float(info.get("fps", 30.0)),
+        "target_fps": float(target_fps),
+        "decoder": info.get("decoder", "cv2"),
+        "frames_decoded": frames_decoded,
+        "frames_processed": frames_processed,
+        "frames_with_hands": len(frames),
+        "decimation_ratio": (frames_processed / frames_decoded) if frames_decoded else 1.0,
+        "source_size": list(source_size),
+        "processed_size": list(processed_size),
+        "estimated_speedup": (1.0 / work_ratio) if work_ratio else 1.0,
+        "extract_ms": (time.perf_counter() - started) * 1000.0,
+        "mirror_triggers": mirror_triggers,
+        "mirror_mode": mirror_mode,
+    }
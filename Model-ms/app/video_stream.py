@@ -0,0 +1,263 @@
+"""
+Ingesta de uploads de video sin copia completa en memoria ni en disco.
+
+Antes: `await file.read()` (todo el video en RAM) → `NamedTemporaryFile` →
+`cv2.VideoCapture` reabre el archivo. Ahora el upload se consume por
+chunks de `VIDEO_STREAM_CHUNK` bytes:
+
+- Contenedores que se pueden decodificar de corrido (WebM/MKV, MPEG-TS y
+  MP4/MOV con el átomo `moov` antes de `mdat`) se escriben en un FIFO; el
+  worker de video lo decodifica con ffmpeg mientras siguen llegando bytes
+  (ver `video_landmarks._ffmpeg_frames`). El pipe da backpressure: la
+  memoria queda acotada a un chunk más el buffer del pipe.
+- El resto (típicamente MP4 de celular con `moov` al final, que necesita
+  seek) se copia chunk a chunk a un archivo temporal y sigue la ruta de
+  OpenCV de siempre.
+
+`VIDEO_STREAM_INGEST=false` (o sin ffmpeg en el PATH) usa siempre el archivo temporal.
+"""
+import asyncio
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+VIDEO_STREAM_INGEST = os.getenv("VIDEO_STREAM_INGEST", "true").lower() == "true"
+VIDEO_STREAM_CHUNK = int(os.getenv("VIDEO_STREAM_CHUNK", str(1 << 20)))
+# Bytes máximos a inspeccionar para decidir si el contenedor es transmisible
+VIDEO_STREAM_HEAD_MAX = int(os.getenv("VIDEO_STREAM_HEAD_MAX", str(1 << 20)))
+
+# Espera entre intentos de abrir el FIFO mientras el job está en cola
+_FIFO_POLL_S = 0.05
+
+# Referencias fuertes a las limpiezas de uploads cortados
+_cleanup_tasks = set()
+
+_MATROSKA_MAGIC = b"\x1a\x45\xdf\xa3"
+_TS_PACKET = 188
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+
+def sniff_container(head: bytes) -> Tuple[str, Optional[bool]]:
+    """
+    `(contenedor, transmisible)` a partir de los primeros bytes del upload.
+    `transmisible` es None si hacen falta más bytes para decidir.
+    """
+    if head[:4] == _MATROSKA_MAGIC:
+        return "matroska", True
+    if len(head) < 12:
+        return "unknown", None
+    if head[4:8] == b"ftyp":
+        return "mp4", _mp4_moov_first(head)
+    if head[0] == 0x47 and len(head) > _TS_PACKET and head[_TS_PACKET] == 0x47:
+        return "mpegts", True
+    return "unknown", False
+
+
+def _mp4_moov_first(head: bytes) -> Optional[bool]:
+    """Recorre las cajas de primer nivel: True si `moov` aparece antes que `mdat`."""
+    offset = 0
+    while offset + 8 <= len(head):
+        size = int.from_bytes(head[offset:offset + 4], "big")
+        box = head[offset + 4:offset + 8]
+        if box == b"moov":
+            return True
+        if box == b"mdat":
+            return False
+        if size == 1:  # tamaño de 64 bits a continuación
+            if offset + 16 > len(head):
+                return None
+            size = int.from_bytes(head[offset + 8:offset + 16], "big")
+        if size < 8:  # 0 = hasta el final del archivo (o caja corrupta)
+            return False
+        offset += size
+    return None
+
+
+async def upload_chunks(upload, chunk_size: int = VIDEO_STREAM_CHUNK) -> AsyncIterator[bytes]:
+    """Chunks de un `UploadFile` (o cualquier objeto con `async read(n)`)."""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _sha256_path(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def ingest_verified(chunks: AsyncIterator[bytes], claimed_hash: Optional[str],
+                          run_job: Callable[[str, str, bool], Awaitable]) -> Tuple[object, dict]:
+    """
+    Para uploads con un hash declarado por el cliente (`X-Content-SHA256`):
+    el upload se recibe completo a un archivo temporal (sin FIFO), se
+    hashea aquí y se llama `run_job(path, sha256, coincide_con_claimed)`.
+    El job solo ve hashes calculados por el servidor, así que puede usarlos
+    como clave de caches sin riesgo de envenenarlas.
+    """
+    async def job(path):
+        digest = await asyncio.to_thread(_sha256_path, path)
+        return await run_job(path, digest, digest == claimed_hash)
+
+    return await ingest_upload(chunks, job, allow_fifo=False)
+
+
+async def spool_upload(chunks: AsyncIterator[bytes], suffix: str = ".mp4") -> Tuple[str, str]:
+    """
+    Copia el upload completo a un archivo temporal (jobs asíncronos, que
+    corren después de responder). Retorna `(path, sha256)`; si el upload se
+    corta o falla la escritura, borra el archivo y relanza el error.
+    """
+    fd, path = tempfile.mkstemp(prefix="lsc-job-", suffix=suffix)
+    digest = hashlib.sha256()
+    try:
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                await asyncio.to_thread(_write_all, fd, chunk)
+        finally:
+            os.close(fd)
+    except BaseException:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+    return path, digest.hexdigest()
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+async def _open_fifo_writer(path: str, job: asyncio.Future) -> Optional[int]:
+    """Abre el FIFO para escritura cuando el worker (ffmpeg) lo abre para lectura."""
+    while not job.done():
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError as e:
+            if e.errno != errno.ENXIO:  # ENXIO = todavía no hay lector
+                raise
+            await asyncio.sleep(_FIFO_POLL_S)
+            continue
+        os.set_blocking(fd, True)
+        return fd
+    return None
+
+
+async def _feed_fifo(fd: int, head: bytes, chunks: AsyncIterator[bytes], info: dict, digest):
+    """Copia el upload al FIFO; cada write bloquea (en un hilo) mientras ffmpeg no consume."""
+    try:
+        await asyncio.to_thread(_write_all, fd, head)
+        async for chunk in chunks:
+            digest.update(chunk)
+            await asyncio.to_thread(_write_all, fd, chunk)
+            info["bytes"] += len(chunk)
+        info["sha256"] = digest.hexdigest()
+    except BrokenPipeError:
+        # ffmpeg terminó antes de leer todo (video corrupto o cortado): el job reporta el error
+        log("[VideoStream] ffmpeg cerró el pipe antes del fin del upload")
+
+
+async def _release_fifo(path: str, job: asyncio.Future, tmp_dir: str):
+    """
+    El upload falló a mitad de camino: si el worker abre (o ya tiene abierto)
+    el FIFO se le da EOF inmediato para que no quede bloqueado esperando un
+    escritor; al terminar el job se borra el directorio temporal.
+    """
+    try:
+        fd = await _open_fifo_writer(path, job)
+        if fd is not None:
+            os.close(fd)
+        await asyncio.gather(job, return_exceptions=True)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+async def ingest_upload(chunks: AsyncIterator[bytes],
+                        run_job: Callable[[str], Awaitable],
+                        allow_fifo: bool = True) -> Tuple[object, dict]:
+    """
+    Entrega el upload a `run_job(path)` por FIFO o por archivo temporal.
+    Retorna `(resultado del job, {"ingest", "container", "bytes", "sha256"})`;
+    `sha256` solo está si el upload se consumió completo.
+
+    Con `allow_fifo=False` siempre se usa el archivo temporal: `run_job`
+    arranca recién con el upload completo en disco.
+    """
+    chunks = chunks.__aiter__()
+    head = b""
+    container, streamable = "unknown", None
+    while streamable is None and len(head) < VIDEO_STREAM_HEAD_MAX:
+        try:
+            head += await chunks.__anext__()
+        except StopAsyncIteration:
+            break
+        container, streamable = sniff_container(head)
+
+    use_fifo = allow_fifo and VIDEO_STREAM_INGEST and bool(streamable) and ffmpeg_available()
+    info = {"ingest": "fifo" if use_fifo else "file", "container": container, "bytes": len(head)}
+    digest = hashlib.sha256(head)
+    tmp_dir = tempfile.mkdtemp(prefix="lsc-upload-")
+
+    if not use_fifo:
+        try:
+            path = os.path.join(tmp_dir, "upload.mp4")
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o600)
+            try:
+                await asyncio.to_thread(_write_all, fd, head)
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    await asyncio.to_thread(_write_all, fd, chunk)
+                    info["bytes"] += len(chunk)
+            finally:
+                os.close(fd)
+            info["sha256"] = digest.hexdigest()
+            return await run_job(path), info
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    path = os.path.join(tmp_dir, "upload.fifo")
+    os.mkfifo(path, 0o600)
+    job = asyncio.ensure_future(run_job(path))
+    fd = None
+    try:
+        fd = await _open_fifo_writer(path, job)
+        if fd is not None:
+            await _feed_fifo(fd, head, chunks, info, digest)
+    except BaseException:
+        # Upload cortado: EOF al worker y limpieza cuando el job termine
+        if fd is not None:
+            os.close(fd)
+        task = asyncio.ensure_future(_release_fifo(path, job, tmp_dir))
+        _cleanup_tasks.add(task)
+        task.add_done_callback(_cleanup_tasks.discard)
+        raise
+    if fd is not None:
+        os.close(fd)  # EOF: ffmpeg termina de decodificar lo que quedó en el pipe
+
+    try:
+        return await job, info
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,245 @@
+"""
+Pool de procesos para los jobs de video (/predict, /predict/audio, /predict/segments).
+
+Decodificar el video y correr MediaPipe + el modelo sobre todos sus frames
+es CPU pura: ejecutado dentro de un `async def` bloqueaba el event loop de
+uvicorn y congelaba todos los streams de Socket.IO del pod. Aquí cada video
+corre en un proceso worker aparte:
+
+- `VIDEO_WORKERS` procesos (spawn) con modelo y MediaPipe precalentados por
+  el initializer; usan varios núcleos sin competir con el GIL del server.
+- Admisión acotada: como máximo `VIDEO_WORKERS + VIDEO_QUEUE_LIMIT` videos
+  en curso o en cola; el resto recibe `VideoPoolSaturated` (→ 503 + Retry-After).
+- `VIDEO_WORKERS=0` corre los jobs en un hilo del proceso principal.
+- Si un worker muere (segfault de MediaPipe, OOM kill) el executor queda
+  roto para siempre (`BrokenProcessPool`): se reconstruye junto con el
+  Manager de progreso y los jobs afectados reciben `VideoWorkerCrashed` (→ 503).
+
+Las funciones `*_job` son de nivel de módulo para poder serializarlas hacia
+los workers.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+
+LOGS_ENABLED = os.getenv("LOGS_ENABLED", "true").lower() == "true"
+
+
+def log(*args, **kwargs):
+    if LOGS_ENABLED:
+        print(*args, **kwargs)
+
+
+VIDEO_WORKERS = int(os.getenv("VIDEO_WORKERS", "2"))
+VIDEO_QUEUE_LIMIT = int(os.getenv("VIDEO_QUEUE_LIMIT", "8"))
+VIDEO_RETRY_AFTER_S = int(os.getenv("VIDEO_RETRY_AFTER_S", "5"))
+
+
+class VideoPoolSaturated(Exception):
+    """No hay lugar en el pool ni en la cola; reintentar tras `retry_after` segundos."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Pool de video saturado, reintentar en {retry_after}s")
+        self.retry_after = retry_after
+
+
+class VideoWorkerCrashed(VideoPoolSaturated):
+    """Un worker murió a mitad del job; el pool ya se reconstruyó y se puede reintentar."""
+
+    def __init__(self, retry_after: int):
+        Exception.__init__(self, f"Worker de video caído, reintentar en {retry_after}s")
+        self.retry_after = retry_after
+
+
+# ============================================================
+# Código que corre dentro de los workers
+# ============================================================
+
+def _get_video_predictor(use_v2: bool):
+    if use_v2:
+        from lsc_engine_v2 import LSCEngineV2
+        predictor = LSCEngineV2.create_predictor(stateful=False)
+    else:
+        from lsc_engine import LSCEngine
+        predictor = LSCEngine.get_predictor()
+    if predictor is None:
+        raise RuntimeError("Modelo no cargado")
+    return predictor
+
+
+def _init_worker(use_v2: bool):
+    """Carga el modelo y una instancia Holistic caliente en el proceso worker."""
+    from holistic_pool import configure_holistic_pool
+
+    started = time.perf_counter()
+    _get_video_predictor(use_v2)
+    try:
+        configure_holistic_pool(1).warm_up()
+    except Exception as e:
+        log(f"⚠️ [VideoWorker {os.getpid()}] Holistic no disponible: {e}")
+    log(f"✅ [VideoWorker {os.getpid()}] listo en {time.perf_counter() - started:.1f}s")
+
+
+def _ping():
+    return os.getpid()
+
+
+def _progress_reporter(progress, job_id):
+    """Callback que publica `(frames_processed, frames_total)` en el tablero compartido."""
+    if progress is None or job_id is None:
+        return None
+
+    def report(done, total):
+        try:
+            progress[job_id] = (done, total)
+        except Exception:
+            pass  # el avance es informativo: un Manager reconstruido no debe tumbar el job
+    return report
+
+
+def predict_video_job(video_path: str, use_v2: bool, progress=None, job_id=None, content_hash=None):
+    """
+    `{"text": palabra o None, "debug": estadísticas de extracción}`.
+    Con `progress`/`job_id` reporta avance; con `content_hash` usa el store de landmarks.
+    """
+    on_progress = _progress_reporter(progress, job_id)
+    debug = {}
+    text = _get_video_predictor(use_v2).predict_video(video_path, on_progress=on_progress, debug=debug,
+                                                      content_hash=content_hash)
+    return {"text": text, "debug": debug}
+
+
+def segment_video_job(video_path: str, stride: int, min_confidence: float, min_windows: int,
+                      content_hash=None):
+    """Segmentación multi-seña V2 (ver `V2StreamingPredictor.segment_video`)."""
+    return _get_video_predictor(True).segment_video(video_path, stride, min_confidence, min_windows,
+                                                    content_hash=content_hash)
+
+
+# ============================================================
+# Lado del event loop
+# ============================================================
+
+class VideoJobPool:
+    """Admisión acotada + ejecución de jobs de video fuera del event loop."""
+
+    def __init__(self, workers: int = VIDEO_WORKERS, queue_limit: int = VIDEO_QUEUE_LIMIT,
+                 retry_after_s: int = VIDEO_RETRY_AFTER_S, use_v2: bool = False):
+        self.workers = max(0, workers)
+        self.capacity = max(1, self.workers) + max(0, queue_limit)
+        self.retry_after_s = retry_after_s
+        self.use_v2 = use_v2
+        self.executor = None
+        self._manager = None
+        self._progress = None
+
+        self.admitted = 0       # en curso + en cola (solo se toca desde el loop)
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.total_run_s = 0.0
+
+    def start(self):
+        """Crea los procesos y fuerza su arranque (initializer = warm-up)."""
+        if self.workers == 0 or self.executor is not None:
+            return
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.use_v2,),
+        )
+        for _ in range(self.workers):
+            self.executor.submit(_ping)
+        log(f"📦 [VideoJobPool] {self.workers} workers, cola máx {self.capacity - self.workers}")
+
+    def acquire(self):
+        """Reserva un lugar (en ejecución o en cola) o lanza `VideoPoolSaturated`."""
+        if self.admitted >= self.capacity:
+            self.rejected += 1
+            raise VideoPoolSaturated(self.retry_after_s)
+        self.admitted += 1
+
+    def release(self):
+        self.admitted -= 1
+
+    @asynccontextmanager
+    async def admit(self):
+        """`acquire()` / `release()` alrededor de un request síncrono."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def progress_board(self):
+        """
+        Dict `job_id -> (frames_processed, frames_total)` escribible desde los
+        workers: un dict de un Manager si hay procesos, o uno normal si los
+        jobs corren en hilos. Se crea en el primer job asíncrono.
+        """
+        if self._progress is None:
+            if self.executor is None:
+                self._progress = {}
+            else:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+                self._progress = self._manager.dict()
+        return self._progress
+
+    async def run(self, fn, *args):
+        """Ejecuta `fn(*args)` en un worker (o en un hilo si `workers=0`)."""
+        started = time.perf_counter()
+        executor = self.executor
+        try:
+            if executor is None:
+                result = await asyncio.to_thread(fn, *args)
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool as e:
+            self.jobs_failed += 1
+            self._restart(executor)
+            raise VideoWorkerCrashed(self.retry_after_s) from e
+        except Exception:
+            self.jobs_failed += 1
+            raise
+        self.jobs_done += 1
+        self.total_run_s += time.perf_counter() - started
+        return result
+
+    def _restart(self, broken):
+        """Reemplaza un executor roto (una sola vez aunque fallen varios jobs a la vez)."""
+        if broken is None or broken is not self.executor:
+            return
+        log("⚠️ [VideoJobPool] Un worker de video murió; reconstruyendo el pool")
+        self.restarts += 1
+        self.shutdown()
+        self.start()
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "admitted": self.admitted,
+            "jobs_done": self.jobs_done,
+            "jobs_failed": self.jobs_failed,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "avg_job_s": (self.total_run_s / self.jobs_done) if self.jobs_done else 0.0,
+        }
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        if self._manager is not None:
+            try:
+                self._manager.shutdown()
+            except Exception:
+                pass
+            self._manager = None
+        self._progress = None
@@ -0,0 +1,123 @@
+"""
+Reporte de precisión/latencia: BiGRU por ventana vs GRU stateful (V2).
+
+Compara, sobre un set de secuencias etiquetadas de landmarks, el modelo V2
+actual (`weights.hdf5`, reclasifica la ventana de 30 frames en cada
+predicción) contra la variante forward-only (`streaming_weights.npz`,
+un paso de GRU por frame).
+
+Entrada: un .npz con
+  - `X`: secuencias de landmarks crudos, (N, T, 226) o array de objetos con (T_i, 226)
+  - `y`: índice de clase de cada secuencia (N,)
+
+Uso:
+    python compare_v2_streaming.py --data secuencias_val.npz [--out reporte.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(base_dir, "app"))
+sys.path.append(os.path.join(base_dir, "app", "Modelo-V2-Full-Augmented-EXPORT", "dependencies"))
+
+from lsc_engine_v2 import LSCEngineV2, STREAMING_WEIGHTS_V2_PATH
+from features_v2 import normalize_sequence, add_velocity_features
+
+
+def _percentiles(samples_ms):
+    values = np.asarray(samples_ms, dtype=np.float64)
+    p50, p95 = np.percentile(values, [50, 95])
+    return {"mean": float(values.mean()), "p50": float(p50), "p95": float(p95)}
+
+
+def _load_sequences(path):
+    data = np.load(path, allow_pickle=True)
+    sequences = [np.asarray(seq, dtype=np.float32).reshape(-1, 226) for seq in data["X"]]
+    return sequences, np.asarray(data["y"], dtype=int)
+
+
+def evaluate_bigru(config, sequences, labels):
+    """Predicción por ventana (30 frames uniformes, como `predict_video`) + costo por frame en streaming."""
+    windows = []
+    for seq in sequences:
+        indices = np.linspace(0, len(seq) - 1, config["model_info"]["frames_per_sequence"], dtype=int)
+        windows.append(add_velocity_features(normalize_sequence(seq[indices])))
+    probs = LSCEngineV2.predict_proba_batch(np.stack(windows))
+    hits = int((probs.argmax(axis=1) == labels).sum())
+
+    # Costo de streaming: cada frame con buffer listo reclasifica la ventana completa
+    predictor = LSCEngineV2.create_predictor(stateful=False, hop_size=1)
+    frame_ms = []
+    for seq in sequences:
+        predictor.clear_buffer()
+        for frame in seq:
+            started = time.perf_counter()
+            predictor.add_landmarks(frame)
+            frame_ms.append((time.perf_counter() - started) * 1000.0)
+    return {"accuracy": hits / len(sequences), "frame_ms": _percentiles(frame_ms)}
+
+
+def evaluate_stateful(config, sequences, labels):
+    """Predicción del último paso tras alimentar la secuencia frame a frame."""
+    predictor = LSCEngineV2.create_predictor(stateful=True)
+    if predictor is None or not hasattr(predictor, "state"):
+        return None
+    hits = 0
+    frame_ms = []
+    for seq, label in zip(sequences, labels):
+        predictor.clear_buffer()
+        result = None
+        for frame in seq:
+            started = time.perf_counter()
+            result = predictor.predict_from_coords(frame)
+            frame_ms.append((time.perf_counter() - started) * 1000.0)
+        hits += int(result["status"] == "ok" and result["word"] == config["classes"][str(label)])
+    return {"accuracy": hits / len(sequences), "frame_ms": _percentiles(frame_ms)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", required=True, help=".npz con X (secuencias) e y (clases)")
+    parser.add_argument("--out", help="ruta del reporte JSON")
+    args = parser.parse_args()
+
+    config = LSCEngineV2.get_config()
+    if config is None:
+        print("❌ No se pudo cargar el modelo V2")
+        return 1
+    if not os.path.exists(STREAMING_WEIGHTS_V2_PATH):
+        print(f"❌ Falta {STREAMING_WEIGHTS_V2_PATH} (exportar con export_streaming_weights)")
+        return 1
+
+    sequences, labels = _load_sequences(args.data)
+    print(f"📦 {len(sequences)} secuencias, {sum(len(s) for s in sequences)} frames")
+
+    report = {
+        "data": os.path.abspath(args.data),
+        "sequences": len(sequences),
+        "bigru": evaluate_bigru(config, sequences, labels),
+        "stateful": evaluate_stateful(config, sequences, labels),
+    }
+
+    print(f"\n{'modelo':<10} {'accuracy':>9} {'ms/frame p50':>13} {'ms/frame p95':>13}")
+    for name in ("bigru", "stateful"):
+        row = report[name]
+        if row is None:
+            print(f"{name:<10} {'n/a':>9}")
+            continue
+        print(f"{name:<10} {row['accuracy']:>9.2%} {row['frame_ms']['p50']:>13.3f} {row['frame_ms']['p95']:>13.3f}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Reporte guardado en {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,8 +37,8 @@ def simulate_dynamic_sign():
             self.conf = conf
             self.word = word
 
-    # Mock de predict_from_coords para simular la "curva" de una seña dinámica
-    original_predict = predictor.predict_from_coords
+    # Mock de predict_dual_from_coords para simular la "curva" de una seña dinámica
+    original_predict = predictor.predict_dual_from_coords
     
     results_sequence = []
     for i in range(30):
@@ -49,10 +49,11 @@ def simulate_dynamic_sign():
             conf = 0.1
             word = "None"
             
-        def mock_predict(c, include_probabilities=False):
-            return {'status': 'ok', 'word': word, 'confidence': conf, 'probabilities': [0]*200}
+        def mock_predict(c, c_mirror, include_probabilities=False):
+            res = {'status': 'ok', 'word': word, 'confidence': conf, 'probabilities': [0]*200}
+            return res, dict(res)
         
-        predictor.predict_from_coords = mock_predict
+        predictor.predict_dual_from_coords = mock_predict
         
         # Landmarks dummy (226)
         dummy = np.zeros(226)
@@ -70,7 +71,7 @@ def simulate_dynamic_sign():
         
         print(f"F{i:02d} | In: {word:12} ({conf:.2f}) | Out: {str(res.get('word')):12} | Status: {res.get('status')}")
 
-    predictor.predict_from_coords = original_predict
+    predictor.predict_dual_from_coords = original_predict
     
     final_recognized = [r['final_word'] for r in results_sequence if r['final_word'] is not None]
     if final_recognized:
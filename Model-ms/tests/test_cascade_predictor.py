@@ -0,0 +1,111 @@
+import sys
+import os
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from cascade_predictor import CascadeStreamingPredictor
+from v2_streaming_predictor import V2StreamingPredictor
+
+
+class FakeV1:
+    """V1 con confianza programable por frame."""
+
+    context_aware_enabled = False
+
+    def __init__(self, confidences):
+        self.confidences = list(confidences)
+        self.motion_velocity = 0.0
+
+    def add_landmarks(self, landmarks, probabilities=None):
+        conf = self.confidences.pop(0)
+        return {"status": "predicting", "word": "V1_WORD" if conf >= 0.4 else None, "confidence": conf}
+
+    def reset_buffer(self):
+        pass
+
+
+class CountingV2Model:
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, x, verbose=0):
+        self.calls += 1
+        probs = np.zeros((len(x), 2), dtype=np.float32)
+        probs[:, 1] = 0.9
+        probs[:, 0] = 0.1
+        return probs
+
+
+CONFIG = {
+    "model_info": {"frames_per_sequence": 30, "feature_dim_per_frame": 452, "num_classes": 2},
+    "classes": {"0": "A", "1": "V2_WORD"},
+}
+
+
+def test_cascade_escalates_only_on_uncertain_frames():
+    print("Testing V1 → V2 cascade gating...")
+    confidences = [0.9] * 40 + [0.3] * 5 + [0.9] * 15
+    model = CountingV2Model()
+    cascade = CascadeStreamingPredictor(FakeV1(confidences), V2StreamingPredictor(model, CONFIG),
+                                        uncertainty_threshold=0.6)
+    frames = np.random.default_rng(0).random((60, 226)).astype(np.float32)
+
+    results = [cascade.add_landmarks(f) for f in frames]
+
+    assert model.calls == 5
+    assert all(r["source"] == "v1" and not r["escalated"] for r in results[:40])
+    assert all(r["source"] == "v2" and r["word"] == "V2_WORD" for r in results[40:45])
+    assert results[50]["word"] == "V1_WORD"
+    stats = cascade.get_stats()
+    assert stats["frames"] == 60 and stats["escalations"] == 5
+    assert abs(stats["escalation_fraction"] - 5 / 60) < 1e-9
+    assert stats["reasons"] == {"uncertain": 5}
+    print("✅ V2 runs only on the uncertain frames")
+
+
+def test_cascade_escalates_on_hand_change_once_buffer_ready():
+    model = CountingV2Model()
+    cascade = CascadeStreamingPredictor(FakeV1([0.9] * 60), V2StreamingPredictor(model, CONFIG))
+    frames = np.random.default_rng(1).random((60, 226)).astype(np.float32)
+    frames[10, 100:] = 0.0  # manos perdidas antes de que el buffer esté listo → no escala
+    frames[45, 100:] = 0.0  # manos perdidas y recuperadas con buffer listo → 2 escalados
+
+    for f in frames:
+        cascade.add_landmarks(f)
+
+    assert model.calls == 2
+    assert cascade.get_stats()["reasons"] == {"hands_changed": 2}
+
+
+class WaitingV1(FakeV1):
+    """V1 sin usuario en cuadro: 'waiting' con confianza 0 tras su auto-reset."""
+
+    def add_landmarks(self, landmarks, probabilities=None):
+        self.confidences.pop(0)
+        return {"status": "waiting", "word": None, "confidence": 0,
+                "buffer_fill": 1.0, "distance_alert": "NO_USER"}
+
+
+def test_cascade_keeps_v1_waiting_without_user():
+    print("Testing that an empty scene never escalates to V2...")
+    model = CountingV2Model()
+    cascade = CascadeStreamingPredictor(WaitingV1([0.0] * 40), V2StreamingPredictor(model, CONFIG),
+                                        uncertainty_threshold=0.6)
+    frames = np.random.default_rng(2).random((40, 226)).astype(np.float32)
+
+    results = [cascade.add_landmarks(f) for f in frames]
+
+    assert model.calls == 0
+    assert all(r["status"] == "waiting" and r["word"] is None and r["source"] == "v1"
+               and not r["escalated"] for r in results)
+    assert cascade.get_stats()["escalations"] == 0
+    print("✅ 'waiting' de V1 se mantiene y V2 no corre")
+
+
+if __name__ == "__main__":
+    test_cascade_escalates_only_on_uncertain_frames()
+    test_cascade_escalates_on_hand_change_once_buffer_ready()
+    test_cascade_keeps_v1_waiting_without_user()
@@ -0,0 +1,53 @@
+import sys
+import os
+import numpy as np
+
+# Add V2 dependencies directory to sys.path
+deps_dir = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "app", "Modelo-V2-Full-Augmented-EXPORT", "dependencies"
+))
+sys.path.insert(0, deps_dir)
+
+from features_v2 import (
+    normalize_frame, normalize_sequence, mirror_frame, has_hand, hand_presence_mask,
+    LEFT_SHOULDER, RIGHT_SHOULDER, POSE_DIMS, POSE_SIZE, HAND_MIDDLE_MCP, HAND_DIMS,
+)
+
+
+def _sequences():
+    rng = np.random.default_rng(0)
+    seqs = rng.random((3, 40, 226)).astype(np.float32)
+    seqs[0, :5, POSE_SIZE:] = 0.0   # sin manos
+    seqs[1, 3, :POSE_SIZE] = 0.0    # sin pose
+    seqs[2, :, :] = 0.0             # secuencia vacía (padding)
+    # Hombros coincidentes y palma degenerada → escala < 1e-6 (solo se centra)
+    l, r = LEFT_SHOULDER * POSE_DIMS, RIGHT_SHOULDER * POSE_DIMS
+    seqs[1, 9, l:l + 3] = seqs[1, 9, r:r + 3]
+    mcp = POSE_SIZE + HAND_MIDDLE_MCP * HAND_DIMS
+    seqs[0, 7, mcp:mcp + 3] = seqs[0, 7, POSE_SIZE:POSE_SIZE + 3]
+    return seqs
+
+
+def test_sequence_kernels_match_per_frame_functions():
+    print("Testing vectorized features_v2 kernels vs per-frame functions...")
+    seqs = _sequences()
+
+    expected = np.array([[normalize_frame(f) for f in seq] for seq in seqs], dtype=np.float32)
+    np.testing.assert_array_equal(normalize_sequence(seqs), expected)       # (B, T, 226)
+    np.testing.assert_array_equal(normalize_sequence(seqs[1]), expected[1])  # (T, 226)
+    np.testing.assert_array_equal(normalize_sequence(seqs[1, 9]), expected[1, 9])
+
+    inplace = seqs.copy()
+    assert normalize_sequence(inplace, out=inplace) is inplace
+    np.testing.assert_array_equal(inplace, expected)
+
+    expected_mask = np.array([[has_hand(f) for f in seq] for seq in seqs])
+    np.testing.assert_array_equal(hand_presence_mask(seqs), expected_mask)
+
+    expected_mirror = np.array([[mirror_frame(f) for f in seq] for seq in seqs])
+    np.testing.assert_array_equal(mirror_frame(seqs), expected_mirror)
+    print("✅ Sequence kernels are bit-exact with the per-frame path")
+
+
+if __name__ == "__main__":
+    test_sequence_kernels_match_per_frame_functions()
@@ -0,0 +1,113 @@
+import sys
+import os
+import threading
+import time
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+import pytest
+
+from holistic_pool import HolisticPool, HolisticPoolTimeout
+
+
+class FakeHolistic:
+    created = 0
+
+    def __init__(self):
+        FakeHolistic.created += 1
+        self.frames = 0
+        self.resets = 0
+
+    def process(self, image):
+        self.frames += 1
+
+    def reset(self):
+        self.resets += 1
+        self.frames = 0
+
+    def close(self):
+        pass
+
+
+def test_pool_reuses_warm_instances_and_resets_them():
+    print("Testing HolisticPool checkout/reset...")
+    FakeHolistic.created = 0
+    pool = HolisticPool(size=2, factory=FakeHolistic)
+    pool.warm_up()
+    assert FakeHolistic.created == 2
+
+    in_use = []
+    lock = threading.Lock()
+    peak = [0]
+
+    def video_job():
+        with pool.checkout() as holistic:
+            with lock:
+                in_use.append(holistic)
+                peak[0] = max(peak[0], len(in_use))
+            holistic.process(None)
+            time.sleep(0.01)
+            with lock:
+                in_use.remove(holistic)
+
+    threads = [threading.Thread(target=video_job) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Nunca más de `size` instancias ni instancias nuevas tras el warm-up
+    assert peak[0] <= 2
+    assert FakeHolistic.created == 2
+    stats = pool.get_stats()
+    assert stats["checkouts"] == 6 and stats["idle"] == 2
+    with pool.checkout() as holistic:
+        assert holistic.frames == 0 and holistic.resets >= 1
+    print("✅ Warm instances are shared, exclusive and reset between videos")
+
+
+def test_failed_creation_frees_its_slot():
+    print("Testing HolisticPool when instance creation fails...")
+    attempts = [0]
+
+    def flaky_factory():
+        attempts[0] += 1
+        if attempts[0] <= 2:
+            raise RuntimeError("modelo no disponible")
+        return FakeHolistic()
+
+    pool = HolisticPool(size=1, factory=flaky_factory)
+    with pytest.raises(RuntimeError):
+        pool.warm_up()
+    assert pool.get_stats()["created"] == 0
+
+    # checkout reintenta crear en vez de quedarse esperando una instancia que no existe
+    with pytest.raises(RuntimeError):
+        with pool.checkout(timeout=1.0):
+            pass
+    with pool.checkout(timeout=1.0) as holistic:
+        assert isinstance(holistic, FakeHolistic)
+    assert pool.get_stats()["created"] == 1
+    print("✅ Una creación fallida no deja el pool bloqueado")
+
+
+def test_checkout_times_out_when_busy():
+    print("Testing HolisticPool checkout timeout...")
+    pool = HolisticPool(size=1, factory=FakeHolistic)
+    with pool.checkout():
+        started = time.perf_counter()
+        with pytest.raises(HolisticPoolTimeout):
+            with pool.checkout(timeout=0.2):
+                pass
+        assert time.perf_counter() - started < 2.0
+    with pool.checkout(timeout=0.2):
+        pass
+    print("✅ checkout con timeout falla en vez de bloquear para siempre")
+
+
+if __name__ == "__main__":
+    test_pool_reuses_warm_instances_and_resets_them()
+    test_failed_creation_frees_its_slot()
+    test_checkout_times_out_when_busy()
@@ -0,0 +1,46 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from inference_executor import InferenceExecutor
+
+
+def test_executor_keeps_session_order_off_loop():
+    print("Testing per-session ordering on a multi-thread inference pool...")
+    executor = InferenceExecutor(max_workers=4)
+    processed = {"a": [], "b": []}
+    loop_thread = threading.get_ident()
+    worker_threads = set()
+
+    def slow_frame(sid, i):
+        worker_threads.add(threading.get_ident())
+        # Frames pares más lentos: sin orden por sesión se adelantarían los impares
+        time.sleep(0.02 if i % 2 == 0 else 0.001)
+        processed[sid].append(i)
+        return i
+
+    async def run():
+        jobs = [executor.run(sid, slow_frame, sid, i) for i in range(6) for sid in ("a", "b")]
+        return await asyncio.gather(*jobs)
+
+    results = asyncio.run(run())
+    executor.shutdown()
+
+    assert processed["a"] == list(range(6))
+    assert processed["b"] == list(range(6))
+    assert sorted(results) == sorted(list(range(6)) * 2)
+    assert loop_thread not in worker_threads
+    stats = executor.get_stats()
+    assert stats["jobs_done"] == 12
+    assert stats["run_ms"]["max"] > 0
+    print("✅ Frames ran in arrival order per session, never on the event loop thread")
+
+
+if __name__ == "__main__":
+    test_executor_keeps_session_order_off_loop()
@@ -0,0 +1,57 @@
+import sys
+import os
+import asyncio
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from inference_scheduler import MicroBatchScheduler
+
+
+def test_scheduler_batches_sessions():
+    print("Testing cross-session micro-batching...")
+    calls = []
+
+    def fake_predict(batch):
+        calls.append(batch.shape[0])
+        return batch * 2.0
+
+    async def run():
+        scheduler = MicroBatchScheduler(fake_predict, max_batch_size=64, max_wait_ms=5)
+        # 10 "sesiones" con 2 filas cada una (original + espejo)
+        requests = [np.full((2, 3), i, dtype=np.float32) for i in range(10)]
+        results = await asyncio.gather(*(scheduler.submit(r) for r in requests))
+        return scheduler, requests, results
+
+    scheduler, requests, results = asyncio.run(run())
+
+    assert calls == [20], f"Se esperaba 1 batch de 20 filas, hubo {calls}"
+    for req, res in zip(requests, results):
+        assert np.array_equal(res, req * 2.0)
+    assert scheduler.get_stats()["batches"] == 1
+    print("✅ 10 sessions resolved by a single forward pass")
+
+
+def test_scheduler_flushes_on_max_batch():
+    print("Testing flush on max batch size...")
+    calls = []
+
+    def fake_predict(batch):
+        calls.append(batch.shape[0])
+        return batch
+
+    async def run():
+        scheduler = MicroBatchScheduler(fake_predict, max_batch_size=4, max_wait_ms=1000)
+        requests = [np.zeros((2, 3), dtype=np.float32) for _ in range(4)]
+        await asyncio.wait_for(asyncio.gather(*(scheduler.submit(r) for r in requests)), timeout=0.5)
+
+    asyncio.run(run())
+    assert calls == [4, 4], f"Se esperaban 2 batches de 4 filas, hubo {calls}"
+    print("✅ Batches dispatched at max_batch_size without waiting for the timer")
+
+
+if __name__ == "__main__":
+    test_scheduler_batches_sessions()
+    test_scheduler_flushes_on_max_batch()
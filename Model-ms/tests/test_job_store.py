@@ -0,0 +1,63 @@
+import sys
+import os
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from job_store import JobStore, JobStoreFull
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_job_lifecycle_and_ttl():
+    print("Testing async video job lifecycle...")
+    clock = FakeClock()
+    store = JobStore(max_jobs=4, ttl_s=60, clock=clock)
+    job = store.create("predict", owner="sid-1")
+    assert store.get(job["job_id"])["status"] == "queued"
+
+    assert store.set_progress(job["job_id"], 15, 90)
+    assert not store.set_progress(job["job_id"], 15, 90)  # sin cambios → sin evento
+    view = JobStore.public_view(store.get(job["job_id"]))
+    assert view["status"] == "running" and abs(view["progress"]["fraction"] - 15 / 90) < 1e-9
+
+    store.finish(job["job_id"], {"success": True, "text": "HOLA"})
+    assert not store.set_progress(job["job_id"], 90, 90)
+    assert store.get(job["job_id"])["result"]["text"] == "HOLA"
+
+    clock.now += 61
+    assert store.get(job["job_id"]) is None
+    assert store.get_stats()["expired"] == 1
+    print("✅ Jobs move queued → running → done and expire after the TTL")
+
+
+def test_full_store_evicts_finished_then_rejects():
+    print("Testing bounded job store...")
+    store = JobStore(max_jobs=2, ttl_s=600, clock=FakeClock())
+    first = store.create("predict")
+    second = store.create("predict")
+    store.fail(first["job_id"], "No se pudo reconocer ninguna seña", status_code=422)
+
+    third = store.create("predict")  # desplaza al terminado más viejo
+    assert store.get(first["job_id"]) is None
+    assert store.get(second["job_id"]) and store.get(third["job_id"])
+
+    try:
+        store.create("predict")
+        raise AssertionError("debió rechazarse")
+    except JobStoreFull:
+        pass
+    assert store.get_stats()["evicted"] == 1
+    print("✅ Finished jobs are evicted first; running jobs are never dropped")
+
+
+if __name__ == "__main__":
+    test_job_lifecycle_and_ttl()
+    test_full_store_evicts_finished_then_rejects()
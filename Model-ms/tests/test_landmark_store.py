@@ -0,0 +1,162 @@
+import sys
+import os
+import asyncio
+import tempfile
+import time
+
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from landmark_store import LandmarkStore, landmark_key
+from result_cache import sha256_bytes
+
+
+def _extracted(n_frames: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    frames = rng.random((n_frames, 226), dtype=np.float32)
+    frames[::2, 100:] = 0.0  # frames pares sin manos
+    return {
+        "frames": frames,
+        "timestamps": np.arange(n_frames, dtype=np.float64) / 30.0,
+        "mirrored": np.arange(n_frames) % 3 == 0,
+        "fps": 30.0,
+        "frames_decoded": n_frames,
+        "frames_processed": n_frames,
+        "frames_with_hands": n_frames,
+        "source_size": [1280, 720],
+        "mirror_mode": "numeric",
+    }
+
+
+def test_roundtrip_memmap_and_metadata():
+    print("Testing landmark store roundtrip (memmap + metadata)...")
+    with tempfile.TemporaryDirectory() as root:
+        store = LandmarkStore(root)
+        key = landmark_key(sha256_bytes(b"video"), target_fps=30.0, max_edge=640)
+        assert key != landmark_key(sha256_bytes(b"video"), target_fps=15.0, max_edge=640)
+        assert store.load(key) is None
+
+        original = _extracted(12)
+        store.save(key, original)
+        loaded = store.load(key)
+
+        assert isinstance(loaded["frames"], np.memmap)
+        assert not loaded["frames"].flags.writeable
+        np.testing.assert_array_equal(loaded["frames"], original["frames"])
+        np.testing.assert_array_equal(loaded["timestamps"], original["timestamps"])
+        np.testing.assert_array_equal(loaded["mirrored"], original["mirrored"])
+        np.testing.assert_array_equal(loaded["hand_mask"], np.arange(12) % 2 == 1)
+        assert loaded["fps"] == 30.0 and loaded["source_size"] == [1280, 720]
+
+        stats = store.get_stats()
+        assert stats["entries"] == 1 and stats["hits"] == 1 and stats["misses"] == 1
+    print("✅ Landmarks y metadatos sobreviven al store sin copia")
+
+
+def test_size_eviction_keeps_recent_entries():
+    print("Testing landmark store LRU eviction by size...")
+    with tempfile.TemporaryDirectory() as root:
+        entry_bytes = 100 * 226 * 4
+        store = LandmarkStore(root, max_bytes=int(entry_bytes * 2.5))
+        keys = [landmark_key(sha256_bytes(bytes([i]))) for i in range(3)]
+        store.save(keys[0], _extracted(100, 0))
+        store.save(keys[1], _extracted(100, 1))
+        # keys[0] usada recién: la menos usada pasa a ser keys[1]
+        old = time.time() - 60
+        os.utime(os.path.join(root, f"{keys[1]}.json"), (old, old))
+        assert store.load(keys[0]) is not None
+        store.save(keys[2], _extracted(100, 2))
+
+        assert store.load(keys[1]) is None
+        assert store.load(keys[0]) is not None and store.load(keys[2]) is not None
+        assert store.get_stats()["evictions"] == 1
+        assert not os.path.exists(os.path.join(root, f"{keys[1]}.npy"))
+    print("✅ Se descarta la entrada menos usada")
+
+
+def test_extract_video_landmarks_uses_store():
+    print("Testing extract_video_landmarks store hit without decoding...")
+    from video_landmarks import extract_video_landmarks, landmark_store_key
+
+    with tempfile.TemporaryDirectory() as root:
+        store = LandmarkStore(root)
+        content_hash = sha256_bytes(b"clip")
+        store.save(landmark_store_key(content_hash, "numeric", 30, 640), _extracted(8))
+
+        progress = []
+        # El path no existe: un hit no debe intentar abrir el video ni MediaPipe
+        extracted = extract_video_landmarks("/nonexistent.mp4", on_progress=lambda d, t: progress.append((d, t)),
+                                            mirror_mode="numeric", target_fps=30, max_edge=640,
+                                            content_hash=content_hash, store=store)
+        assert extracted["landmark_cache"] == "hit"
+        assert extracted["frames"].shape == (8, 226)
+        assert progress == [(8, 8)]
+    print("✅ Un video ya procesado no vuelve a pasar por MediaPipe")
+
+
+def test_pending_entry_is_renamed_to_server_hash():
+    print("Testing provisional landmark keys promoted after ingest...")
+    from video_landmarks import landmark_store_key
+
+    with tempfile.TemporaryDirectory() as root:
+        store = LandmarkStore(root)
+        pending, real = landmark_store_key("pending-abc"), landmark_store_key(sha256_bytes(b"clip"))
+        assert pending != real
+
+        store.save(pending, _extracted(6))
+        assert store.rename(pending, real)
+        assert store.load(pending) is None
+        assert store.load(real)["frames"].shape == (6, 226)
+
+        # Upload cortado: la entrada provisoria se descarta
+        store.save(pending, _extracted(3))
+        store.discard(pending)
+        assert not store.rename(pending, real) and store.get_stats()["entries"] == 1
+        assert os.listdir(root) and all(name.startswith(real) for name in os.listdir(root))
+    print("✅ Solo quedan entradas bajo hashes calculados por el servidor")
+
+
+def test_repeat_stream_upload_after_model_switch_reuses_landmarks():
+    print("Testing repeat /predict/stream upload reusing stored landmarks...")
+    from video_landmarks import extract_video_landmarks, landmark_store_key
+    from video_stream import ingest_verified
+
+    data = np.random.default_rng(3).bytes(64 * 1024)
+    content_hash = sha256_bytes(data)
+
+    async def chunks():
+        for i in range(0, len(data), 4096):
+            yield data[i:i + 4096]
+
+    with tempfile.TemporaryDirectory() as root:
+        store = LandmarkStore(root)
+        # Primer upload (modelo anterior): la extracción quedó bajo el hash del servidor
+        store.save(landmark_store_key(content_hash, "numeric", 30, 640), _extracted(8))
+        assert store.contains(landmark_store_key(content_hash, "numeric", 30, 640))
+
+        async def run_job(path, digest, matches):
+            # Los bytes no son un video: solo un hit del store puede responder
+            extracted = extract_video_landmarks(path, mirror_mode="numeric", target_fps=30, max_edge=640,
+                                                content_hash=digest, store=store)
+            return matches, extracted["landmark_cache"], extracted["frames"].shape
+
+        # Cambio de modelo: la cache de resultados no tiene nada, el header sí coincide
+        result, info = asyncio.run(ingest_verified(chunks(), content_hash, run_job))
+        assert result == (True, "hit", (8, 226))
+        assert info["ingest"] == "file" and info["sha256"] == content_hash
+
+        # Un header falso no cambia la clave: el job recibe el hash calculado
+        result, info = asyncio.run(ingest_verified(chunks(), sha256_bytes(b"otro"), run_job))
+        assert result == (False, "hit", (8, 226))
+    print("✅ Reenviar el mismo video tras cambiar de modelo no vuelve a correr MediaPipe")
+
+
+if __name__ == "__main__":
+    test_roundtrip_memmap_and_metadata()
+    test_size_eviction_keeps_recent_entries()
+    test_extract_video_landmarks_uses_store()
+    test_pending_entry_is_renamed_to_server_hash()
+    test_repeat_stream_upload_after_model_switch_reuses_landmarks()
@@ -0,0 +1,69 @@
+import sys
+import os
+import json
+
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from landmarks_batch import BatchRequestError, parse_landmarks_batch
+
+
+def _status(body, content_type="application/json", **kwargs):
+    try:
+        parse_landmarks_batch(body, content_type, **kwargs)
+    except BatchRequestError as e:
+        return e.status_code
+    return 200
+
+
+def test_list_and_dict_bodies():
+    print("Testing /predict/landmarks/batch body forms...")
+    frames = np.random.default_rng(0).random((4, 226), dtype=np.float32)
+
+    coords, top_k = parse_landmarks_batch(json.dumps(frames.tolist()).encode(), "application/json", 3)
+    np.testing.assert_allclose(coords, frames)
+    assert top_k == 3  # la lista directa usa el top_k del query
+
+    coords, top_k = parse_landmarks_batch(
+        json.dumps({"data": frames.tolist(), "top_k": 5}).encode(), "application/json", 3
+    )
+    assert coords.shape == (4, 226) and top_k == 5
+
+    coords, top_k = parse_landmarks_batch(frames.astype("<f4").tobytes(), "application/octet-stream", 2)
+    np.testing.assert_array_equal(coords, frames)
+    assert top_k == 2
+    print("✅ Lista, dict y binario producen el mismo (N, 226)")
+
+
+def test_shape_validation():
+    print("Testing batch shape validation...")
+    assert _status(b"{not json") == 400
+    assert _status(json.dumps([[0.0] * 225]).encode()) == 400
+    assert _status(json.dumps([]).encode()) == 400
+    assert _status(json.dumps({"data": None}).encode()) == 400
+    assert _status(json.dumps({"data": [[0.0] * 226, [0.0] * 10]}).encode()) == 400
+    assert _status(b"\x00" * (226 * 4 + 1), "application/octet-stream") == 400
+    assert _status(b"", "application/octet-stream") == 400
+    assert _status(json.dumps([[0.0] * 226] * 3).encode(), max_frames=2) == 413
+    print("✅ Formas inválidas → 400, exceso de frames → 413")
+
+
+def test_top_k_validation():
+    print("Testing batch top_k validation...")
+    frame = [[0.0] * 226]
+    for bad in ("abc", [3], True, 0, -1, 2.5, 10_000):
+        assert _status(json.dumps({"data": frame, "top_k": bad}).encode()) == 400, bad
+    _, top_k = parse_landmarks_batch(json.dumps({"data": frame, "top_k": None}).encode(), "application/json", 4)
+    assert top_k == 4  # null = default
+    _, top_k = parse_landmarks_batch(json.dumps({"data": frame, "top_k": "2"}).encode(), "application/json")
+    assert top_k == 2
+    print("✅ top_k inválido → 400 en vez de 500")
+
+
+if __name__ == "__main__":
+    test_list_and_dict_bodies()
+    test_shape_validation()
+    test_top_k_validation()
@@ -0,0 +1,83 @@
+import sys
+import os
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from minmax_normalizer import normalize_landmarks_batch
+
+
+def legacy_normalize(coords):
+    """Implementación original por frame de normalize_landmarks_exacto."""
+    pose = coords[:100].reshape(25, 4).copy()
+    rh = coords[100:163].reshape(21, 3).copy()
+    lh = coords[163:226].reshape(21, 3).copy()
+
+    def min_max_norm(parts_coords):
+        pts = parts_coords[:, :3]
+        if np.all(pts == 0):
+            return parts_coords
+        xmin, xmax = pts[:, 0].min(), pts[:, 0].max()
+        ymin, ymax = pts[:, 1].min(), pts[:, 1].max()
+        zmin, zmax = pts[:, 2].min(), pts[:, 2].max()
+        rx = (xmax - xmin) if (xmax - xmin) > 1e-6 else 1.0
+        ry = (ymax - ymin) if (ymax - ymin) > 1e-6 else 1.0
+        rz = (zmax - zmin) if (zmax - zmin) > 1e-6 else 1.0
+        parts_coords[:, 0] = (parts_coords[:, 0] - xmin) / rx
+        parts_coords[:, 1] = (parts_coords[:, 1] - ymin) / ry
+        parts_coords[:, 2] = (parts_coords[:, 2] - zmin) / rz
+        return parts_coords
+
+    return np.concatenate([min_max_norm(pose).flatten(), min_max_norm(rh).flatten(), min_max_norm(lh).flatten()])
+
+
+def make_frames():
+    rng = np.random.default_rng(0)
+    frames = rng.random((12, 226)).astype(np.float32)
+    frames[1, 163:] = 0.0                 # mano izquierda ausente
+    frames[2, 100:226] = 0.0              # sin manos
+    frames[3, :] = 0.0                    # frame vacío
+    frames[4, 100:163:3] = 0.42           # rango x de la mano derecha = 0 (guarda 1e-6)
+    frames[5, 0:100:4] = 0.0              # pose con x = 0 pero no toda cero
+    frames[6, :100] = 0.0                 # pose ausente…
+    frames[6, 3:100:4] = 0.9              # …aunque con visibility
+    return frames
+
+
+def test_batch_normalizer_matches_legacy():
+    print("Testing vectorized min-max normalization against the per-frame version...")
+    frames = make_frames()
+    expected = np.stack([legacy_normalize(f) for f in frames])
+
+    result = normalize_landmarks_batch(frames)
+    assert result.shape == frames.shape
+    assert np.array_equal(result, expected)
+
+    # Un frame suelto conserva la forma (226,)
+    single = normalize_landmarks_batch(frames[4])
+    assert single.shape == (226,)
+    assert np.array_equal(single, expected[4])
+    print("✅ Batched normalizer is bit-exact with the per-frame closure")
+
+
+def test_batch_normalizer_in_place():
+    print("Testing in-place normalization...")
+    frames = make_frames()
+    expected = np.stack([legacy_normalize(f) for f in frames])
+    original = frames.copy()
+
+    # Sin `out` no se toca la entrada
+    normalize_landmarks_batch(frames)
+    assert np.array_equal(frames, original)
+
+    result = normalize_landmarks_batch(frames, out=frames)
+    assert result is frames
+    assert np.array_equal(frames, expected)
+    print("✅ In-place normalization OK")
+
+
+if __name__ == "__main__":
+    test_batch_normalizer_matches_legacy()
+    test_batch_normalizer_in_place()
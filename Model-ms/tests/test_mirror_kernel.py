@@ -0,0 +1,70 @@
+import sys
+import os
+import numpy as np
+
+# Add V2 dependencies directory to sys.path
+deps_dir = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), "..", "app", "Modelo-V2-Full-Augmented-EXPORT", "dependencies"
+))
+sys.path.insert(0, deps_dir)
+
+from features_v2 import MirrorKernel, mirror_frame, POSE_MIRROR_PAIRS
+
+PAIRS = [(1,4), (2,5), (3,6), (7,8), (9,10), (11,12), (13,14), (15,16), (17,18), (19,20), (21,22), (23,24)]
+
+
+def legacy_mirror_v1(landmarks):
+    """Implementación original de LSCStreamingExactoPredictor.add_landmarks."""
+    landmarks_mirror = landmarks.copy()
+    landmarks_mirror[0:100:4] = 1.0 - landmarks_mirror[0:100:4]
+    landmarks_mirror[100:226:3] = 1.0 - landmarks_mirror[100:226:3]
+    for p1, p2 in PAIRS:
+        idx1, idx2 = p1*4, p2*4
+        temp = landmarks_mirror[idx1:idx1+4].copy()
+        landmarks_mirror[idx1:idx1+4] = landmarks_mirror[idx2:idx2+4]
+        landmarks_mirror[idx2:idx2+4] = temp
+    rh_part = landmarks_mirror[100:163].copy()
+    landmarks_mirror[100:163] = landmarks_mirror[163:226]
+    landmarks_mirror[163:226] = rh_part
+    return landmarks_mirror
+
+
+def legacy_mirror_v2(coords):
+    """Implementación original de features_v2.mirror_frame."""
+    pose = coords[:100].reshape(25, 4).copy()
+    right_hand = coords[100:163].reshape(21, 3).copy()
+    left_hand = coords[163:].reshape(21, 3).copy()
+    pose[:, 0] *= -1
+    right_hand[:, 0] *= -1
+    left_hand[:, 0] *= -1
+    for left_idx, right_idx in POSE_MIRROR_PAIRS:
+        pose[[left_idx, right_idx]] = pose[[right_idx, left_idx]]
+    right_hand, left_hand = left_hand, right_hand
+    return np.concatenate([pose.flatten(), right_hand.flatten(), left_hand.flatten()])
+
+
+def test_mirror_kernel_matches_legacy():
+    print("Testing MirrorKernel against the legacy V1/V2 mirror code...")
+    rng = np.random.default_rng(0)
+    frames = rng.random((16, 226)).astype(np.float32)
+    frames[3, 163:] = 0.0  # mano izquierda ausente
+
+    v1 = MirrorKernel(x_offset=1.0)
+    for frame in frames:
+        assert np.array_equal(v1(frame), legacy_mirror_v1(frame))
+        assert np.array_equal(mirror_frame(frame), legacy_mirror_v2(frame))
+
+    # Batch (N, 226) en un solo gather, y con buffer de salida preasignado
+    expected = np.stack([legacy_mirror_v1(f) for f in frames])
+    out = np.empty_like(frames)
+    assert np.array_equal(v1(frames), expected)
+    assert v1(frames, out=out) is out
+    assert np.array_equal(out, expected)
+
+    # Espejar dos veces devuelve el frame original
+    assert np.allclose(mirror_frame(mirror_frame(frames)), frames)
+    print("✅ MirrorKernel is bit-exact with both legacy implementations")
+
+
+if __name__ == "__main__":
+    test_mirror_kernel_matches_legacy()
@@ -0,0 +1,63 @@
+import sys
+import os
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from numpy_dense_engine import NumpyDenseModel
+
+WEIGHTS_NPZ = os.path.join(app_dir, "Modelo_Full-EXPORT", "weights.npz")
+
+
+def test_numpy_engine_shapes():
+    print("Testing NumpyDenseModel shapes and softmax...")
+    model = NumpyDenseModel.from_npz(WEIGHTS_NPZ)
+    assert model.input_dim == 226
+    assert model.num_classes == 160
+
+    rng = np.random.default_rng(0)
+    batch = rng.random((8, 226), dtype=np.float32)
+
+    probs = model.predict(batch, verbose=0)
+    assert probs.shape == (8, 160)
+    assert np.allclose(probs.sum(axis=1), 1.0, atol=1e-5)
+
+    # Un frame suelto debe dar lo mismo que su fila dentro del batch
+    single = model.predict(batch[3])
+    assert single.shape == (1, 160)
+    assert np.allclose(single[0], probs[3], atol=1e-6)
+    print("✅ Shapes, softmax and batch/single consistency OK")
+
+
+def test_numpy_engine_matches_keras():
+    try:
+        import tensorflow as tf
+    except ImportError:
+        print("⏭️ TensorFlow no disponible, se omite la comparación con Keras")
+        return
+
+    sys.path.insert(0, os.path.join(app_dir, "Modelo_Full-EXPORT", "dependencies"))
+    from coordenates_models import get_model_coord_dense_5
+
+    print("Testing top-1 parity NumPy vs Keras...")
+    data = np.load(WEIGHTS_NPZ, allow_pickle=True)
+    arrays = [data[k] for k in sorted(data.files, key=lambda s: int(s.split("_")[1]))]
+    keras_model = get_model_coord_dense_5((226,), 160)
+    keras_model.set_weights(arrays)
+    numpy_model = NumpyDenseModel.from_npz(WEIGHTS_NPZ)
+
+    rng = np.random.default_rng(1)
+    batch = rng.random((64, 226), dtype=np.float32)
+    keras_probs = keras_model.predict(batch, verbose=0)
+    numpy_probs = numpy_model.predict(batch)
+
+    assert np.array_equal(np.argmax(keras_probs, axis=1), np.argmax(numpy_probs, axis=1))
+    assert np.allclose(keras_probs, numpy_probs, atol=1e-5)
+    print("✅ NumPy engine matches Keras top-1 on 64 random frames")
+
+
+if __name__ == "__main__":
+    test_numpy_engine_shapes()
+    test_numpy_engine_matches_keras()
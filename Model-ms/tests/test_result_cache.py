@@ -0,0 +1,58 @@
+import sys
+import os
+import tempfile
+import time
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from result_cache import ResultCache, make_key, sha256_bytes
+
+
+def test_memory_lru_and_counters():
+    print("Testing in-process LRU result cache...")
+    cache = ResultCache(max_entries=2)
+    keys = [make_key("predict", sha256_bytes(bytes([i])), "v1") for i in range(3)]
+    assert make_key("predict", sha256_bytes(b"\x00"), "v2") != keys[0]  # otra versión, otra entrada
+
+    cache.put(keys[0], {"text": "HOLA", "debug": {}})
+    cache.put(keys[1], {"text": None, "debug": {}})
+    assert cache.get(keys[0])["text"] == "HOLA"  # keys[0] pasa a ser el más reciente
+    cache.put(keys[2], {"text": "CHAO", "debug": {}})
+    assert cache.get(keys[1]) is None
+
+    hit = cache.get(keys[0])
+    hit["text"] = "mutado"
+    assert cache.get(keys[0])["text"] == "HOLA"  # get devuelve copias
+
+    stats = cache.get_stats()
+    assert stats["memory_hits"] == 3 and stats["misses"] == 1 and stats["entries"] == 2
+    print("✅ LRU evicts the least recently used entry and counts hits/misses")
+
+
+def test_disk_tier_survives_restart_and_evicts_by_size():
+    print("Testing on-disk result cache tier...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(max_entries=1, disk_dir=tmp, disk_max_bytes=400)
+        keys = [make_key("audio", sha256_bytes(bytes([i])), "v1") for i in range(4)]
+        for i, key in enumerate(keys[:3]):
+            cache.put(key, {"audioUrl": f"https://cdn/{i}.mp3", "pad": "x" * 80})
+            os.utime(os.path.join(tmp, f"{key}.json"), (time.time() - 100 + i, time.time() - 100 + i))
+
+        # Nuevo proceso: memoria vacía, hit en disco (y se renueva su mtime)
+        restarted = ResultCache(max_entries=1, disk_dir=tmp, disk_max_bytes=400)
+        assert restarted.get(keys[0])["audioUrl"] == "https://cdn/0.mp3"
+        assert restarted.get_stats()["disk_hits"] == 1
+
+        # Superar el límite borra la entrada menos usada (keys[1]), no la recién leída
+        restarted.put(keys[3], {"audioUrl": "https://cdn/3.mp3", "pad": "x" * 80})
+        assert restarted.get_stats()["disk_bytes"] <= 400
+        assert not os.path.exists(os.path.join(tmp, f"{keys[1]}.json"))
+        assert os.path.exists(os.path.join(tmp, f"{keys[0]}.json"))
+        print("✅ Disk entries persist across instances and are evicted by size, LRU first")
+
+
+if __name__ == "__main__":
+    test_memory_lru_and_counters()
+    test_disk_tier_survives_restart_and_evicts_by_size()
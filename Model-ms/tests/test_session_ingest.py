@@ -0,0 +1,35 @@
+import sys
+import os
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from session_ingest import FrameIngestSlot
+
+
+def test_slot_keeps_latest_frames_and_reports_lag():
+    print("Testing latest-frame-wins window under overload...")
+    slot = FrameIngestSlot(window=2, lag_notify_interval_s=0.0)
+
+    dropped = [slot.offer(i) for i in range(5)]
+    assert dropped == [False, False, True, True, True]
+    assert list(slot.pending) == [3, 4]
+
+    notice = slot.lag_notice()
+    assert notice == {"dropped": 3, "dropped_total": 3, "pending": 2, "window": 2}
+    assert slot.lag_notice() is None  # sin descartes nuevos no se repite el aviso
+
+    assert slot.take() == 3
+    assert slot.take() == 4
+    assert slot.take() is None
+
+    stats = slot.get_stats()
+    assert stats["received"] == 5
+    assert stats["processed"] == 2
+    assert stats["dropped"] == 3
+    print("✅ Oldest frames dropped, newest kept in order, lag notice emitted once")
+
+
+if __name__ == "__main__":
+    test_slot_keeps_latest_frames_and_reports_lag()
@@ -0,0 +1,107 @@
+import sys
+import os
+import asyncio
+
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from v2_streaming_predictor import V2StreamingPredictor
+from inference_scheduler import MicroBatchScheduler
+
+
+class WindowSumModel:
+    """Probabilidades deterministas por ventana: dependen solo de su contenido."""
+
+    def predict(self, x, verbose=0):
+        logits = np.stack([x.sum(axis=(1, 2)), x[:, -1].sum(axis=1), x[:, 0].sum(axis=1)], axis=1)
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+class CountingModel:
+    def __init__(self, num_classes=3):
+        self.calls = 0
+        self.num_classes = num_classes
+
+    def predict(self, x, verbose=0):
+        self.calls += 1
+        probs = np.zeros((x.shape[0], self.num_classes), dtype=np.float32)
+        probs[:, self.calls % self.num_classes] = 1.0
+        return probs
+
+
+CONFIG = {
+    "model_info": {"frames_per_sequence": 30, "feature_dim_per_frame": 452, "num_classes": 3},
+    "classes": {"0": "A", "1": "B", "2": "C"},
+}
+
+
+def test_hop_reuses_result_between_inferences():
+    print("Testing V2 prediction stride...")
+    model = CountingModel()
+    predictor = V2StreamingPredictor(model, CONFIG, hop_size=5)
+    rng = np.random.default_rng(0)
+    hands = rng.random((60, 226)).astype(np.float32)
+
+    results = [predictor.predict_from_coords(frame) for frame in hands]
+    assert all(r["status"] == "waiting" for r in results[:29])
+    ok = results[29:]
+    assert all(r["status"] == "ok" for r in ok)
+    # Primera inferencia al llenarse el buffer, luego cada 5 frames
+    assert [r["result_age"] for r in ok[:7]] == [0, 1, 2, 3, 4, 0, 1]
+    assert model.calls == 1 + (len(ok) - 1) // 5
+    assert ok[1]["word"] == ok[0]["word"]
+
+    # Sin manos → no_sign; al volver a cruzar el umbral se infiere de inmediato
+    empty = np.zeros(226, dtype=np.float32)
+    statuses = [predictor.predict_from_coords(empty)["status"] for _ in range(30)]
+    assert statuses[-1] == "no_sign"
+    calls = model.calls
+    for frame in hands[:15]:
+        result = predictor.predict_from_coords(frame)
+    assert result["status"] == "ok" and result["result_age"] == 0
+    assert model.calls == calls + 1
+    print("✅ Inference runs every hop_size frames and on readiness crossings")
+
+
+def test_cross_session_batch_matches_per_session_predict():
+    print("Testing V2 prepare/complete through the shared scheduler...")
+    model = WindowSumModel()
+    rng = np.random.default_rng(1)
+    streams = [rng.random((40, 226)).astype(np.float32) for _ in range(3)]
+    solo = [V2StreamingPredictor(model, CONFIG, hop_size=3) for _ in streams]
+    batched = [V2StreamingPredictor(model, CONFIG, hop_size=3) for _ in streams]
+
+    async def run():
+        scheduler = MicroBatchScheduler(model.predict, max_batch_size=8, max_wait_ms=1.0, name="v2")
+
+        async def step(predictor, frame):
+            window = predictor.prepare_landmarks(frame)
+            probabilities = await scheduler.submit(window) if window is not None else None
+            return predictor.complete_landmarks(probabilities)
+
+        outputs = []
+        for t in range(40):
+            outputs.append(await asyncio.gather(*(step(p, s[t]) for p, s in zip(batched, streams))))
+        return outputs, scheduler
+
+    outputs, scheduler = asyncio.run(run())
+    for t in range(40):
+        for i, stream in enumerate(streams):
+            expected = solo[i].add_landmarks(stream[t])
+            got = outputs[t][i]
+            assert got["status"] == expected["status"]
+            assert got["word"] == expected["word"]
+            assert got["result_age"] == expected["result_age"]
+            np.testing.assert_allclose(got["confidence"], expected["confidence"], rtol=1e-6)
+    # Las tres sesiones comparten cada forward pass
+    assert scheduler.get_stats()["avg_rows_per_batch"] == 3
+    print("✅ Batched V2 results match per-session inference")
+
+
+if __name__ == "__main__":
+    test_hop_reuses_result_between_inferences()
+    test_cross_session_batch_matches_per_session_predict()
@@ -0,0 +1,81 @@
+import sys
+import os
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from v2_streaming_predictor import V2StreamingPredictor
+
+
+class MarkerModel:
+    """Clasifica por la visibility del landmark 0 (no la toca la normalización)."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, x, verbose=0):
+        self.batch_sizes.append(len(x))
+        marker = x[:, :, 3]
+        probs = np.full((len(x), 3), 0.05, dtype=np.float32)
+        for i, row in enumerate(marker):
+            values, counts = np.unique(np.round(row).astype(int), return_counts=True)
+            cls = int(values[counts.argmax()])
+            uniform = len(values) == 1
+            probs[i, cls] = 0.9 if uniform else 0.4
+        return probs
+
+
+CONFIG = {
+    "model_info": {"frames_per_sequence": 30, "feature_dim_per_frame": 452, "num_classes": 3},
+    "classes": {"0": "NADA", "1": "HOLA", "2": "GRACIAS"},
+}
+
+
+def _clip(marker, frames, hands=True, seed=0):
+    rng = np.random.default_rng(seed)
+    clip = rng.random((frames, 226)).astype(np.float32)
+    clip[:, 3] = marker
+    if not hands:
+        clip[:, 100:] = 0.0
+    return clip
+
+
+def test_sliding_windows_merge_into_timed_signs():
+    print("Testing V2 multi-sign segmentation...")
+    model = MarkerModel()
+    predictor = V2StreamingPredictor(model, CONFIG)
+    sequence = np.concatenate([
+        _clip(1, 60, seed=1),
+        _clip(0, 60, hands=False, seed=2),
+        _clip(2, 45, seed=3),
+    ])
+    timestamps = np.arange(len(sequence)) / 30.0
+
+    result = predictor.segment_sequence(sequence, timestamps, stride=5, min_confidence=0.5, batch_size=4)
+
+    assert result["status"] == "ok"
+    assert result["frames_total"] == 165
+    assert [s["word"] for s in result["signs"]] == ["HOLA", "GRACIAS"]
+    hola, gracias = result["signs"]
+    assert hola["start_frame"] == 0 and hola["end_frame"] == 59
+    assert gracias["start_frame"] == 120 and gracias["end_frame"] == 164  # ventana final alineada al cierre
+    assert abs(gracias["start_s"] - 4.0) < 1e-9
+    assert hola["windows"] == 7
+    # Todas las ventanas con manos se clasificaron en batches de a lo sumo 4
+    assert sum(model.batch_sizes) == result["windows"] and max(model.batch_sizes) <= 4
+    print("✅ Adjacent windows merged into timed signs, hand-less windows skipped")
+
+
+def test_short_sequence_falls_back_to_single_window():
+    predictor = V2StreamingPredictor(MarkerModel(), CONFIG)
+    result = predictor.segment_sequence(_clip(2, 12), stride=5)
+    assert result["windows"] == 1
+    assert [s["word"] for s in result["signs"]] == ["GRACIAS"]
+    assert result["signs"][0]["end_frame"] == 11
+
+
+if __name__ == "__main__":
+    test_sliding_windows_merge_into_timed_signs()
+    test_short_sequence_falls_back_to_single_window()
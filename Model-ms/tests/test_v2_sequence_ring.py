@@ -0,0 +1,59 @@
+import sys
+import os
+
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from v2_streaming_predictor import SequenceRing
+from features_v2 import normalize_frame, add_velocity_features, has_hand
+
+
+def _legacy_window(raw_frames):
+    """Ruta anterior: renormalizar toda la ventana + velocidades."""
+    norm_seq = np.array([normalize_frame(f) for f in raw_frames], dtype=np.float32)
+    return add_velocity_features(norm_seq)
+
+
+def test_ring_matches_full_window_recompute():
+    print("Testing incremental V2 ring vs full-window normalization...")
+    rng = np.random.default_rng(0)
+    frames = rng.random((75, 226)).astype(np.float32)
+    frames[10:20, 100:] = 0.0  # tramo sin manos
+    frames[40, :100] = 0.0     # frame sin pose
+
+    ring = SequenceRing(30)
+    for t, frame in enumerate(frames):
+        ring.append(frame)
+        start = max(0, t + 1 - 30)
+        expected = _legacy_window(frames[start:t + 1])
+        np.testing.assert_allclose(ring.window(), expected, rtol=0, atol=1e-5)
+        assert ring.hand_count == sum(has_hand(f) for f in frames[start:t + 1])
+
+    ring.clear()
+    assert len(ring) == 0 and ring.hand_count == 0
+    print("✅ Ring window matches legacy recompute at every step")
+
+
+def test_ring_extend_matches_append():
+    print("Testing chunked ring extend vs frame-by-frame append...")
+    rng = np.random.default_rng(1)
+    frames = rng.random((70, 226)).astype(np.float32)
+    frames[20:25, 100:] = 0.0
+
+    one_by_one, chunked = SequenceRing(30), SequenceRing(30)
+    for frame in frames:
+        one_by_one.append(frame)
+    for chunk in (frames[:4], frames[4:5], frames[5:48], frames[48:]):
+        chunked.extend(chunk)
+
+    np.testing.assert_array_equal(chunked.window(), one_by_one.window())
+    assert chunked.hand_count == one_by_one.hand_count
+    print("✅ Chunked extend leaves the same window as per-frame appends")
+
+
+if __name__ == "__main__":
+    test_ring_matches_full_window_recompute()
+    test_ring_extend_matches_append()
@@ -0,0 +1,134 @@
+import sys
+import os
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from v2_stateful_gru import NumpyStatefulGRUModel
+from v2_streaming_predictor import StatefulV2StreamingPredictor
+
+CONFIG = {
+    "model_info": {"frames_per_sequence": 30, "feature_dim_per_frame": 452, "num_classes": 5},
+    "classes": {str(i): f"Clase{i}" for i in range(5)},
+}
+
+
+def _random_weights(rng, feature_dim=452, units=(16, 8), dense_units=12, num_classes=5):
+    arrays = []
+    in_dim = feature_dim
+    for u in units:
+        arrays += [
+            rng.normal(0, 0.1, (in_dim, 3 * u)).astype(np.float32),
+            rng.normal(0, 0.1, (u, 3 * u)).astype(np.float32),
+            rng.normal(0, 0.1, (2, 3 * u)).astype(np.float32),
+        ]
+        in_dim = u
+    arrays += [
+        rng.normal(0, 0.1, (in_dim, dense_units)).astype(np.float32),
+        rng.normal(0, 0.1, (dense_units,)).astype(np.float32),
+        rng.normal(0, 0.1, (dense_units, num_classes)).astype(np.float32),
+        rng.normal(0, 0.1, (num_classes,)).astype(np.float32),
+    ]
+    return arrays
+
+
+def _model_from_arrays(arrays, tmp_path):
+    path = os.path.join(str(tmp_path), "streaming_weights.npz")
+    np.savez(path, *arrays)
+    return NumpyStatefulGRUModel.from_npz(path)
+
+
+def test_stateful_steps_match_full_sequence(tmp_path):
+    print("Testing NumPy stateful GRU stepping...")
+    rng = np.random.default_rng(0)
+    model = _model_from_arrays(_random_weights(rng), tmp_path)
+    assert model.units == [16, 8] and model.num_classes == 5
+
+    x = rng.random((3, 20, 452)).astype(np.float32)
+    full = model.predict_sequence(x)
+    assert np.allclose(full.sum(axis=1), 1.0, atol=1e-5)
+
+    # Cada sesión con su propio estado, un frame por vez
+    for b in range(3):
+        state = model.initial_state(1)
+        for t in range(20):
+            probs = model.step(x[b, t], state)
+        assert np.allclose(probs[0], full[b], atol=1e-6)
+    print("✅ Per-session stepping matches the batched sequence pass")
+
+
+def test_stateful_matches_keras_gru(tmp_path):
+    try:
+        import tensorflow as tf
+    except ImportError:
+        print("⏭️ TensorFlow no disponible, se omite la comparación con Keras")
+        return
+
+    sys.path.insert(0, os.path.join(app_dir, "Modelo-V2-Full-Augmented-EXPORT", "dependencies"))
+    from coordenates_models_v2 import build_streaming_model_v2
+
+    rng = np.random.default_rng(1)
+    keras_model = build_streaming_model_v2(5, units=(16, 8), dense_units=12)
+    arrays = _random_weights(rng)
+    keras_model.set_weights(arrays)
+    model = _model_from_arrays(arrays, tmp_path)
+
+    x = rng.random((4, 25, 452)).astype(np.float32)
+    keras_last = keras_model.predict(x, verbose=0)[:, -1]
+    assert np.allclose(model.predict_sequence(x), keras_last, atol=1e-5)
+    print("✅ NumPy stateful GRU matches Keras on the last step")
+
+
+def test_stateful_predictor_statuses(tmp_path):
+    rng = np.random.default_rng(2)
+    model = _model_from_arrays(_random_weights(rng), tmp_path)
+    predictor = StatefulV2StreamingPredictor(model, CONFIG)
+
+    frames = rng.random((40, 226)).astype(np.float32)
+    results = [predictor.add_landmarks(f) for f in frames]
+    assert results[28]["status"] == "waiting"
+    assert all(r["status"] == "ok" and r["result_age"] == 0 for r in results[29:])
+
+    # Sin manos en toda la ventana → no_sign y estado reiniciado
+    empty = np.zeros(226, dtype=np.float32)
+    for _ in range(30):
+        result = predictor.add_landmarks(empty)
+    assert result["status"] == "no_sign"
+    assert all(not h.any() for state in predictor.states for h in state)
+
+
+def test_stateful_predictor_bounded_horizon(tmp_path):
+    print("Testing stateful V2 predictor horizon reset...")
+    rng = np.random.default_rng(3)
+    model = _model_from_arrays(_random_weights(rng), tmp_path)
+    predictor = StatefulV2StreamingPredictor(model, CONFIG)
+    horizon = predictor.horizon
+
+    # Seña larga (nunca se pierden las manos); se guardan las entradas reales de la GRU
+    frames = rng.random((100, 226)).astype(np.float32)
+    inputs = []
+    for frame in frames:
+        predictor.add_landmarks(frame)
+        inputs.append(predictor.buffer.latest().copy())
+
+    # Lo publicado = GRU desde estado cero sobre los últimos `age` frames,
+    # con `age` entre media ventana y una ventana completa
+    n = len(frames)
+    age = max((n - 1 - offset) % horizon + 1 for offset in (0, horizon // 2))
+    assert horizon // 2 < age <= horizon
+    state = model.initial_state(1)
+    for x in inputs[n - age:]:
+        probs = model.step(x[np.newaxis], state)
+    assert np.allclose(predictor._last_pred, probs[0], atol=1e-6)
+    print(f"✅ Estado acotado: la predicción usa los últimos {age} frames")
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_stateful_steps_match_full_sequence(tmp)
+        test_stateful_matches_keras_gru(tmp)
+        test_stateful_predictor_statuses(tmp)
+        test_stateful_predictor_bounded_horizon(tmp)
@@ -0,0 +1,131 @@
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from video_landmarks import extract_coords, mirror_image_coords
+from features_v2 import mirror_frame
+
+# Video con señas a una mano (derecha) para comparar contra MediaPipe real
+PARITY_VIDEO = os.getenv("LSC_MIRROR_PARITY_VIDEO")
+
+# Pares izq↔der de los 33 puntos de pose de MediaPipe (los 25 primeros llegan al vector)
+POSE_PAIRS_33 = [(1, 4), (2, 5), (3, 6), (7, 8), (9, 10), (11, 12), (13, 14), (15, 16),
+                 (17, 18), (19, 20), (21, 22), (23, 24), (25, 26), (27, 28), (29, 30), (31, 32)]
+
+
+def _xy(coords):
+    """(x, y) de pose y manos de un vector (226,)."""
+    pose = coords[:100].reshape(25, 4)[:, :2]
+    hands = coords[100:].reshape(42, 3)[:, :2]
+    return np.concatenate([pose, hands])
+
+
+def _landmarks(points):
+    if points is None:
+        return None
+    fields = ("x", "y", "z", "visibility")
+    return SimpleNamespace(landmark=[SimpleNamespace(**dict(zip(fields, p))) for p in points])
+
+
+def _results(pose=None, right=None, left=None):
+    """Resultado Holistic sintético con la misma forma que el de MediaPipe."""
+    return SimpleNamespace(pose_landmarks=_landmarks(pose), right_hand_landmarks=_landmarks(right),
+                           left_hand_landmarks=_landmarks(left))
+
+
+def _flipped_detection(pose=None, right=None, left=None):
+    """Lo que detectaría MediaPipe ideal en `cv2.flip(frame, 1)`: x → 1 - x y lados intercambiados."""
+    def flip(points):
+        if points is None:
+            return None
+        points = points.copy()
+        points[:, 0] = 1.0 - points[:, 0]
+        return points
+
+    pose = flip(pose)
+    if pose is not None:
+        for a, b in POSE_PAIRS_33:
+            pose[[a, b]] = pose[[b, a]]
+    return _results(pose, right=flip(left), left=flip(right))
+
+
+@pytest.mark.parametrize("parts", [("pose", "right"), ("pose", "right", "left"), ("right",), ("pose",)])
+def test_numeric_mirror_matches_synthetic_flip(parts):
+    print(f"Testing numeric video mirror on synthetic frames {parts}...")
+    rng = np.random.default_rng(len(parts))
+    detection = {
+        "pose": rng.random((33, 4)) if "pose" in parts else None,
+        "right": rng.random((21, 3)) if "right" in parts else None,
+        "left": rng.random((21, 3)) if "left" in parts else None,
+    }
+    coords = extract_coords(_results(**detection)).astype(np.float32)
+    expected = extract_coords(_flipped_detection(**detection)).astype(np.float32)
+
+    mirrored = mirror_image_coords(coords)
+    assert np.allclose(mirrored, expected, atol=1e-6)
+    # Batch (N, 226) igual que frame a frame
+    assert np.allclose(mirror_image_coords(np.stack([coords, coords]))[1], expected, atol=1e-6)
+
+    # Mismo gather que `mirror_frame` (coords normalizadas): solo cambia -x por 1 - x
+    reference = mirror_frame(coords)
+    x_mask = np.zeros(226, dtype=bool)
+    x_mask[0:100:4] = True
+    x_mask[100::3] = True
+    present = expected != 0
+    reference[x_mask] += 1.0
+    assert np.allclose(mirrored[present], reference[present], atol=1e-6)
+    print("✅ 1 - x + intercambio de lados = detección sobre el frame volteado")
+
+
+def test_numeric_mirror_matches_redetection():
+    print("Testing numeric video mirror against MediaPipe on the flipped frame...")
+    cv2 = pytest.importorskip("cv2")
+    mp = pytest.importorskip("mediapipe")
+    if not PARITY_VIDEO or not os.path.exists(PARITY_VIDEO):
+        pytest.skip("LSC_MIRROR_PARITY_VIDEO no definido")
+
+    # static_image_mode: cada imagen se detecta sin tracking, así ambas rutas ven lo mismo
+    holistic = mp.solutions.holistic.Holistic(static_image_mode=True, model_complexity=1)
+    cap = cv2.VideoCapture(PARITY_VIDEO)
+    compared, slot_matches, errors = 0, 0, []
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            results = holistic.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if not (results.right_hand_landmarks and not results.left_hand_landmarks):
+                continue
+            flipped = holistic.process(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+            numeric = mirror_image_coords(extract_coords(results))
+            redetected = extract_coords(flipped).astype(np.float32)
+
+            compared += 1
+            # La única mano detectada debe quedar en el slot izquierdo en ambas rutas
+            if flipped.left_hand_landmarks and not flipped.right_hand_landmarks:
+                slot_matches += 1
+                present = np.any(_xy(redetected) != 0, axis=1) & np.any(_xy(numeric) != 0, axis=1)
+                errors.append(np.abs(_xy(numeric) - _xy(redetected))[present].mean())
+    finally:
+        cap.release()
+        holistic.close()
+
+    assert compared > 0, "el video no tiene frames con solo mano derecha"
+    assert slot_matches / compared >= 0.9
+    # Diferencias de detección de MediaPipe entre imagen y espejo, no de semántica
+    assert float(np.mean(errors)) < 0.02
+    print(f"✅ {compared} frames espejados: slots iguales en {slot_matches}, "
+          f"error xy medio {np.mean(errors):.4f}")
+
+
+if __name__ == "__main__":
+    for parts in [("pose", "right"), ("pose", "right", "left"), ("right",), ("pose",)]:
+        test_numeric_mirror_matches_synthetic_flip(parts)
+    test_numeric_mirror_matches_redetection()
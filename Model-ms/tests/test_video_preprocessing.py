@@ -0,0 +1,49 @@
+import sys
+import os
+
+import numpy as np
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from video_landmarks import FrameDecimator, scaled_size
+
+
+def _kept(timestamps, target_fps):
+    decimator = FrameDecimator(target_fps)
+    return [t for t in timestamps if decimator.keep(t)]
+
+
+def test_decimation_by_timestamp():
+    print("Testing timestamp-based frame decimation...")
+    # 60 fps → 30 fps: uno de cada dos frames
+    sixty = np.arange(120) / 60.0
+    kept = _kept(sixty, 30)
+    assert len(kept) == 60
+    np.testing.assert_allclose(np.diff(kept), 1 / 30)
+
+    # Fuente más lenta que el objetivo, o sin objetivo: se conservan todos
+    assert len(_kept(np.arange(50) / 25.0, 30)) == 50
+    assert len(_kept(sixty, 0)) == 120
+
+    # Fps variable: un tramo a 120 fps y otro a 24 fps siguen saliendo a ~15 fps
+    vfr = np.concatenate([np.arange(240) / 120.0, 2.0 + np.arange(48) / 24.0])
+    kept = np.array(_kept(vfr, 15))
+    assert abs((kept < 2.0).sum() - 30) <= 1
+    assert abs((kept >= 2.0).sum() - 30) <= 1
+    print("✅ Frames are picked by timestamp at the target fps")
+
+
+def test_scaled_size_keeps_aspect_ratio():
+    print("Testing max-edge downscaling...")
+    assert scaled_size(1920, 1080, 640) == (640, 360)
+    assert scaled_size(1080, 1920, 640) == (360, 640)
+    assert scaled_size(480, 360, 640) == (480, 360)  # nunca se agranda
+    assert scaled_size(1920, 1080, 0) == (1920, 1080)
+    print("✅ Long edge is capped without changing the aspect ratio")
+
+
+if __name__ == "__main__":
+    test_decimation_by_timestamp()
+    test_scaled_size_keeps_aspect_ratio()
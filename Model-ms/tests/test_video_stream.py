@@ -0,0 +1,129 @@
+import sys
+import os
+import asyncio
+import hashlib
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+import video_stream
+from video_stream import ingest_upload, sniff_container, spool_upload
+
+
+def _box(kind, payload=b""):
+    return (8 + len(payload)).to_bytes(4, "big") + kind + payload
+
+
+def test_sniff_container():
+    print("Testing container sniffing for streamable uploads...")
+    ftyp = _box(b"ftyp", b"isom" + b"\0" * 8)
+    assert sniff_container(ftyp + _box(b"moov", b"\0" * 32)) == ("mp4", True)
+    assert sniff_container(ftyp + _box(b"free") + _box(b"mdat", b"\0" * 32)) == ("mp4", False)
+    assert sniff_container(ftyp) == ("mp4", None)  # faltan bytes para decidir
+    assert sniff_container(b"\x1a\x45\xdf\xa3" + b"\0" * 60) == ("matroska", True)
+    assert sniff_container(b"RIFF" + b"\0" * 60) == ("unknown", False)
+    print("✅ moov-first MP4 and WebM stream; mdat-first MP4 falls back to a file")
+
+
+def _chunks(data, size, fail_after=None):
+    async def gen():
+        for i, start in enumerate(range(0, len(data), size)):
+            if fail_after is not None and i == fail_after:
+                raise ConnectionError("upload cortado")
+            await asyncio.sleep(0)
+            yield data[start:start + size]
+    return gen()
+
+
+def _read_path(path):
+    with open(path, "rb") as f:
+        return os.path.basename(path), f.read()
+
+
+def test_fifo_and_file_ingest_deliver_same_bytes():
+    print("Testing FIFO and temp-file ingestion...")
+    video_stream.ffmpeg_available = lambda: True
+    streamable = _box(b"ftyp", b"isom" + b"\0" * 8) + _box(b"moov", b"m" * 100) + os.urandom(300_000)
+    seekable = _box(b"ftyp", b"isom" + b"\0" * 8) + _box(b"mdat", os.urandom(300_000))
+
+    async def run(data):
+        return await ingest_upload(_chunks(data, 4096), lambda path: asyncio.to_thread(_read_path, path))
+
+    (name, got), info = asyncio.run(run(streamable))
+    assert name == "upload.fifo" and got == streamable
+    assert info == {"ingest": "fifo", "container": "mp4", "bytes": len(streamable),
+                    "sha256": hashlib.sha256(streamable).hexdigest()}
+
+    (name, got), info = asyncio.run(run(seekable))
+    assert name == "upload.mp4" and got == seekable and info["ingest"] == "file"
+
+    # allow_fifo=False (verificación de X-Content-SHA256): el job ve el upload completo en disco
+    (name, got), info = asyncio.run(ingest_upload(
+        _chunks(streamable, 4096), lambda path: asyncio.to_thread(_read_path, path), allow_fifo=False
+    ))
+    assert name == "upload.mp4" and got == streamable and info["ingest"] == "file"
+    print("✅ Both paths hand the worker the complete upload")
+
+
+def test_cut_upload_releases_fifo_reader():
+    print("Testing that a cut upload does not leave the worker blocked...")
+    video_stream.ffmpeg_available = lambda: True
+    data = b"\x1a\x45\xdf\xa3" + os.urandom(200_000)
+    reads = []
+
+    def worker(path):
+        reads.append(_read_path(path)[1])
+
+    async def run():
+        try:
+            await ingest_upload(_chunks(data, 4096, fail_after=5),
+                                lambda path: asyncio.to_thread(worker, path))
+        except ConnectionError:
+            pass
+        await asyncio.wait_for(asyncio.gather(*video_stream._cleanup_tasks), timeout=5)
+
+    asyncio.run(run())
+    assert len(reads) == 1 and data.startswith(reads[0]) and len(reads[0]) < len(data)
+    print("✅ The worker gets EOF after a partial upload")
+
+
+def test_spool_upload_cut_midway_leaves_nothing():
+    print("Testing async job upload spooling...")
+    data = os.urandom(50_000)
+
+    path, digest = asyncio.run(spool_upload(_chunks(data, 4096)))
+    try:
+        with open(path, "rb") as f:
+            assert f.read() == data
+        assert digest == hashlib.sha256(data).hexdigest()
+    finally:
+        os.remove(path)
+
+    # Upload cortado a mitad: error al llamador y ningún archivo huérfano
+    created = []
+    real_mkstemp = video_stream.tempfile.mkstemp
+
+    def tracking_mkstemp(*args, **kwargs):
+        fd, tmp_path = real_mkstemp(*args, **kwargs)
+        created.append(tmp_path)
+        return fd, tmp_path
+
+    video_stream.tempfile.mkstemp = tracking_mkstemp
+    try:
+        try:
+            asyncio.run(spool_upload(_chunks(data, 4096, fail_after=3)))
+            raise AssertionError("debió propagar el corte")
+        except ConnectionError:
+            pass
+    finally:
+        video_stream.tempfile.mkstemp = real_mkstemp
+    assert len(created) == 1 and not os.path.exists(created[0])
+    print("✅ Un upload cortado no deja archivo (y /jobs/predict no llega a crear el job)")
+
+
+if __name__ == "__main__":
+    test_sniff_container()
+    test_fifo_and_file_ingest_deliver_same_bytes()
+    test_cut_upload_releases_fifo_reader()
+    test_spool_upload_cut_midway_leaves_nothing()
@@ -0,0 +1,98 @@
+import sys
+import os
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Add app directory to sys.path
+app_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, app_dir)
+
+from video_workers import VideoJobPool, VideoPoolSaturated, VideoWorkerCrashed
+
+
+def test_admission_rejects_beyond_capacity():
+    print("Testing bounded admission of video jobs...")
+    pool = VideoJobPool(workers=0, queue_limit=2, retry_after_s=7)
+    release = threading.Event()
+
+    async def job():
+        async with pool.admit():
+            return await pool.run(release.wait, 5)
+
+    async def run():
+        running = [asyncio.create_task(job()) for _ in range(pool.capacity)]
+        await asyncio.sleep(0.05)
+        assert pool.admitted == 3
+        try:
+            async with pool.admit():
+                raise AssertionError("debió rechazarse")
+        except VideoPoolSaturated as e:
+            assert e.retry_after == 7
+        release.set()
+        return await asyncio.gather(*running)
+
+    results = asyncio.run(run())
+    assert results == [True, True, True]
+    stats = pool.get_stats()
+    assert stats["admitted"] == 0 and stats["rejected"] == 1 and stats["jobs_done"] == 3
+    print("✅ Jobs beyond workers + queue limit are rejected with Retry-After")
+
+
+def test_failed_job_releases_slot():
+    print("Testing that a failing video job frees its slot...")
+    pool = VideoJobPool(workers=0, queue_limit=0)
+
+    def boom():
+        raise ValueError("video corrupto")
+
+    async def run():
+        try:
+            async with pool.admit():
+                await pool.run(boom)
+        except ValueError:
+            pass
+        async with pool.admit():
+            return await pool.run(lambda: "ok")
+
+    assert asyncio.run(run()) == "ok"
+    assert pool.get_stats()["jobs_failed"] == 1
+    print("✅ Slot is released after a failed job")
+
+
+def test_worker_crash_rebuilds_pool():
+    print("Testing recovery after a video worker dies...")
+    pool = VideoJobPool(workers=1, queue_limit=0)
+
+    # Sin el initializer real (cargaría el modelo): solo el executor
+    def start():
+        if pool.executor is None:
+            pool.executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    pool.start = start
+    pool.start()
+
+    async def run():
+        crashed = pool.executor
+        try:
+            await pool.run(os._exit, 1)  # simula segfault / OOM kill
+            raise AssertionError("debió fallar")
+        except VideoWorkerCrashed as e:
+            assert isinstance(e, VideoPoolSaturated) and e.retry_after == pool.retry_after_s
+        assert pool.executor is not None and pool.executor is not crashed
+        return await pool.run(os.getpid)
+
+    try:
+        pid = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert pid != os.getpid()
+    stats = pool.get_stats()
+    assert stats["restarts"] == 1 and stats["jobs_failed"] == 1 and stats["jobs_done"] == 1
+    print("✅ A dead worker costs one 503, not the whole pool")
+
+
+if __name__ == "__main__":
+    test_admission_rejects_beyond_capacity()
+    test_failed_job_releases_slot()
+    test_worker_crash_rebuilds_pool()
@@ -1,4 +1,4 @@
-import { Controller, Post, UploadedFile, UseInterceptors, Body, Res, StreamableFile, Header } from '@nestjs/common';
+import { Controller, Post, Get, Param, Query, UploadedFile, UseInterceptors, Body, Res, StreamableFile, Header } from '@nestjs/common';
 import { FileInterceptor } from '@nestjs/platform-express';
 import { ApiTags, ApiOperation, ApiResponse, ApiConsumes, ApiBearerAuth } from '@nestjs/swagger';
 import { ModelService } from './model.service';
@@ -22,6 +22,28 @@ export class ModelController {
         return this.modelService.videoToText(file);
     }
 
+    @Post('jobs/video-to-text')
+    @ApiConsumes('multipart/form-data')
+    @ApiOperation({ summary: 'Encolar video (señas) a texto; retorna un jobId para consultar el avance' })
+    @ApiResponse({ status: 201, description: 'Job encolado' })
+    @UseInterceptors(FileInterceptor('file'))
+    async videoToTextJob(
+        @UploadedFile() file: Express.Multer.File,
+        @Query('clientId') clientId?: string,
+    ) {
+        return this.modelService.videoToTextJob(file, clientId);
+    }
+
+    @Get('jobs/:id')
+    @ApiOperation({ summary: 'Estado, avance y resultado de un job de video' })
+    @ApiResponse({ status: 200, description: 'Estado del job' })
+    @ApiResponse({ status: 404, description: 'Job no encontrado o expirado' })
+    async getJob(
+        @Param('id') jobId: string
+    ) {
+        return this.modelService.getJob(jobId);
+    }
+
     @Post('video-to-audio')
     @ApiConsumes('multipart/form-data')
     @ApiOperation({ summary: 'Convertir video (señas) a audio' })
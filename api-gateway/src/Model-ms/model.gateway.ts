@@ -45,16 +45,46 @@ export class ModelGateway implements OnGatewayConnection, OnGatewayDisconnect {
 
     @SubscribeMessage('landmarks')
     handleLandmarks(
-        @MessageBody() payload: { data: number[] },
+        @MessageBody() payload: { data: number[] | Buffer; seq?: number },
         @ConnectedSocket() client: Socket,
     ) {
-        if (!payload || !payload.data || payload.data.length !== 226) {
+        if (!payload || !payload.data) {
             // Invalid data ignore
             return;
         }
 
+        // JSON: 226 números | binario: 226 float32 little-endian (904 bytes)
+        const isBinary = Buffer.isBuffer(payload.data);
+        const valid = isBinary
+            ? (payload.data as Buffer).byteLength === 226 * 4
+            : (payload.data as number[]).length === 226;
+        if (!valid) {
+            return;
+        }
+
         // Just forward to Python via ModelService proxy
-        this.modelService.sendLandmarks(client.id, payload.data);
+        this.modelService.sendLandmarks(client.id, payload.data, payload.seq);
+    }
+
+    @SubscribeMessage('landmarks_batch')
+    handleLandmarksBatch(
+        @MessageBody() payload: { data: number[][] | Buffer; seq?: number; details?: boolean },
+        @ConnectedSocket() client: Socket,
+    ) {
+        if (!payload || !payload.data) {
+            return;
+        }
+
+        // K frames: lista de listas de 226 números o K * 904 bytes float32 LE
+        const isBinary = Buffer.isBuffer(payload.data);
+        const valid = isBinary
+            ? (payload.data as Buffer).byteLength > 0 && (payload.data as Buffer).byteLength % (226 * 4) === 0
+            : Array.isArray(payload.data) && payload.data.length > 0 && (payload.data as number[][]).every((f) => f?.length === 226);
+        if (!valid) {
+            return;
+        }
+
+        this.modelService.sendLandmarksBatch(client.id, payload);
     }
 
     @SubscribeMessage('reset')
@@ -1,5 +1,6 @@
-import { Injectable, BadRequestException } from '@nestjs/common';
+import { Injectable, BadRequestException, NotFoundException } from '@nestjs/common';
 import { spawn } from 'child_process';
+import { createHash } from 'crypto';
 import * as fs from 'fs';
 import * as path from 'path';
 import { io, Socket as ClientSocket } from 'socket.io-client';
@@ -24,18 +25,19 @@ export class ModelService {
         try {
             await this.ensureServiceIsRunning();
 
-            const formData = new FormData();
-            const blob = new Blob([file.buffer as any], { type: file.mimetype });
-            formData.append('file', blob, file.originalname);
-
             if (this.logsEnabled) {
-                console.log(`[Gateway] Enviando video completo a ${this.pythonServiceUrl}/predict...`);
+                console.log(`[Gateway] Enviando video completo a ${this.pythonServiceUrl}/predict/stream...`);
             }
 
-            // Enviar video completo al endpoint /predict
-            const response = await fetch(`${this.pythonServiceUrl}/predict`, {
+            // Cuerpo crudo (sin multipart): Python decodifica mientras recibe los bytes
+            const response = await fetch(`${this.pythonServiceUrl}/predict/stream`, {
                 method: 'POST',
-                body: formData,
+                headers: {
+                    'Content-Type': file.mimetype || 'application/octet-stream',
+                    // Pista para la cache de Python (reintentos); Python la verifica contra el cuerpo
+                    'X-Content-SHA256': createHash('sha256').update(file.buffer).digest('hex'),
+                },
+                body: file.buffer as any,
             });
 
             if (!response.ok) {
@@ -46,7 +48,7 @@ export class ModelService {
             const data = await response.json();
 
             // Adaptar respuesta para mantener compatibilidad si es necesario
-            // El endpoint /predict devuelve { success: true, text: "Letra" }
+            // El endpoint /predict/stream devuelve { success: true, text: "Letra", debug: {...} }
             return data;
 
         } catch (error) {
@@ -57,6 +59,65 @@ export class ModelService {
         }
     }
 
+    /**
+     * Igual que videoToText pero asíncrono: Python responde con un job_id de
+     * inmediato. Si `clientId` tiene sesión Socket.IO abierta, Python emite
+     * `job_progress` por esa sesión y se reenvía al frontend.
+     */
+    async videoToTextJob(file?: Express.Multer.File, clientId?: string): Promise<any> {
+        if (!file) {
+            throw new BadRequestException('Por favor sube un archivo de video');
+        }
+
+        try {
+            await this.ensureServiceIsRunning();
+
+            const formData = new FormData();
+            const blob = new Blob([file.buffer as any], { type: file.mimetype });
+            formData.append('file', blob, file.originalname);
+
+            const pythonSocket = clientId ? this.pythonSessions.get(clientId) : undefined;
+            const query = pythonSocket?.id ? `?sid=${encodeURIComponent(pythonSocket.id)}` : '';
+
+            if (this.logsEnabled) {
+                console.log(`[Gateway] Encolando video en ${this.pythonServiceUrl}/jobs/predict...`);
+            }
+
+            const response = await fetch(`${this.pythonServiceUrl}/jobs/predict${query}`, {
+                method: 'POST',
+                body: formData,
+            });
+
+            if (!response.ok) {
+                const errorText = await response.text();
+                throw new Error(`Microservice responded with ${response.status}: ${errorText}`);
+            }
+
+            return await response.json();
+        } catch (error) {
+            if (this.logsEnabled) {
+                console.error('[Gateway] Job Error:', error);
+            }
+            throw new BadRequestException(`Error encolando video: ${error.message || error}`);
+        }
+    }
+
+    async getJob(jobId: string): Promise<any> {
+        const response = await fetch(`${this.pythonServiceUrl}/jobs/${encodeURIComponent(jobId)}`)
+            .catch((error) => {
+                throw new BadRequestException(`Error consultando job: ${error.message || error}`);
+            });
+
+        if (response.status === 404) {
+            throw new NotFoundException('Job no encontrado o expirado');
+        }
+        if (!response.ok) {
+            const errorText = await response.text();
+            throw new BadRequestException(`Microservice responded with ${response.status}: ${errorText}`);
+        }
+        return await response.json();
+    }
+
     async videoToAudio(file?: Express.Multer.File): Promise<any> {
         if (!file) {
             throw new BadRequestException('Por favor sube un archivo de video');
@@ -155,6 +216,16 @@ export class ModelService {
             frontendClient.emit('reset_ack', data);
         });
 
+        // Aviso de backpressure: el servidor descartó frames viejos de esta sesión
+        pythonSocket.on('server_lagging', (data) => {
+            frontendClient.emit('server_lagging', data);
+        });
+
+        // Avance de jobs de video encolados con videoToTextJob(file, clientId)
+        pythonSocket.on('job_progress', (data) => {
+            frontendClient.emit('job_progress', data);
+        });
+
         pythonSocket.on('disconnect', () => {
             if (this.logsEnabled) console.log(`[Gateway] Disconnected from Python for ${clientId}`);
         });
@@ -175,10 +246,18 @@ export class ModelService {
         }
     }
 
-    sendLandmarks(clientId: string, landmarks: number[]) {
+    sendLandmarks(clientId: string, landmarks: number[] | Buffer, seq?: number) {
+        const pythonSocket = this.pythonSessions.get(clientId);
+        if (pythonSocket) {
+            // Buffer se reenvía como adjunto binario de Socket.IO (float32 LE)
+            pythonSocket.emit('landmarks', seq === undefined ? { data: landmarks } : { data: landmarks, seq });
+        }
+    }
+
+    sendLandmarksBatch(clientId: string, payload: { data: number[][] | Buffer; seq?: number; details?: boolean }) {
         const pythonSocket = this.pythonSessions.get(clientId);
         if (pythonSocket) {
-            pythonSocket.emit('landmarks', { data: landmarks });
+            pythonSocket.emit('landmarks_batch', payload);
         }
     }
 